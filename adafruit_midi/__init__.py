@@ -65,9 +65,18 @@ class MIDI:
         defaults to 0 (MIDI Channel 1).
     :param int in_buf_size: Maximum size of input buffer in bytes, default 30.
     :param bool debug: Debug mode, default False.
+    :param bool stats: Count messages, bytes and buffer use in
+        :attr:`stats`, default False.
+    :param trace: A :class:`~adafruit_midi.trace.TraceRing` to record
+        all reads and writes in, default None.
+    :param profiler: A :class:`~adafruit_midi.profiler.Profiler` to time
+        the phases of ``receive`` and ``send``, default None.
+    :param watchdog: An :class:`~adafruit_midi.watchdog.ActiveSensingWatchdog`
+        checked on each ``receive``, default None.
 
     """
 
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
     def __init__(
         self,
         midi_in=None,
@@ -76,7 +85,11 @@ class MIDI:
         in_channel=None,
         out_channel=0,
         in_buf_size=30,
-        debug=False
+        debug=False,
+        stats=False,
+        trace=None,
+        profiler=None,
+        watchdog=None
     ):
         if midi_in is None and midi_out is None:
             raise ValueError("No midi_in or midi_out provided")
@@ -92,6 +105,14 @@ class MIDI:
         self._in_buf_size = in_buf_size
         self._outbuf = bytearray(4)
         self._skipped_bytes = 0
+        self._stats = None
+        if stats:
+            from .stats import MIDIStats  # pylint: disable=import-outside-toplevel
+
+            self._stats = MIDIStats()
+        self._trace = trace
+        self._profiler = profiler
+        self._watchdog = watchdog
 
     @property
     def in_channel(self):
@@ -125,6 +146,18 @@ class MIDI:
             raise RuntimeError("Invalid output channel")
         self._out_channel = channel
 
+    @property
+    def stats(self):
+        """The :class:`~adafruit_midi.stats.MIDIStats` counters or None
+        if statistics were not enabled."""
+        return self._stats
+
+    @property
+    def skipped_bytes(self):
+        """The number of bytes discarded by the parser because they were not
+        part of a complete message."""
+        return self._skipped_bytes
+
     def receive(self):
         """Read messages from MIDI port, store them in internal read buffer, then parse that data
         and return the first MIDI message (event).
@@ -135,23 +168,23 @@ class MIDI:
         ### could check _midi_in is an object OR correct object OR correct interface here?
         # If the buffer here is not full then read as much as we can fit from
         # the input port
+        profiler = self._profiler
+        received = False
         if len(self._in_buf) < self._in_buf_size:
+            if profiler is not None:
+                start = profiler.clock()
             bytes_in = self._midi_in.read(self._in_buf_size - len(self._in_buf))
-            if bytes_in:
-                if self._debug:
-                    print("Receiving: ", [hex(i) for i in bytes_in])
-                self._in_buf.extend(bytes_in)
-                del bytes_in
-
-        (msg, endplusone, skipped) = MIDIMessage.from_message_bytes(
-            self._in_buf, self._in_channel
-        )
-        if endplusone != 0:
-            # This is not particularly efficient as it's copying most of bytearray
-            # and deleting old one
-            self._in_buf = self._in_buf[endplusone:]
+            if profiler is not None:
+                profiler.read.record(profiler.clock() - start)
+            received = bool(bytes_in)
+            self._received(bytes_in)
+            del bytes_in
+        elif self._stats is not None:
+            self._stats.in_buf_full += 1
 
-        self._skipped_bytes += skipped
+        (msg, _) = self._parse()
+        if self._watchdog is not None:
+            self._watchdog.poll(self, msg, received)
 
         # msg could still be None at this point, e.g. in middle of monster SysEx
         return msg
@@ -166,6 +199,8 @@ class MIDI:
         """
         if channel is None:
             channel = self.out_channel
+        if self._profiler is not None:
+            start = self._profiler.clock()
         if isinstance(msg, MIDIMessage):
             msg.channel = channel
             data = msg.__bytes__()  # bytes(object) does not work in uPy
@@ -174,10 +209,70 @@ class MIDI:
             for each_msg in msg:
                 each_msg.channel = channel
                 data.extend(each_msg.__bytes__())
+        if self._profiler is not None:
+            self._profiler.encode.record(self._profiler.clock() - start)
 
         self._send(data, len(data))
 
+    def _received(self, bytes_in):
+        """Add the data read from the input port to the input buffer,
+        ``bytes_in`` is empty or None if nothing was read."""
+        if bytes_in:
+            if self._debug:
+                print("Receiving: ", [hex(i) for i in bytes_in])
+            self._in_buf.extend(bytes_in)
+            if self._trace is not None:
+                self._trace.record(0, bytes_in, len(bytes_in))  # TRACE_IN
+        if self._stats is not None:
+            self._stats.record_read(len(bytes_in) if bytes_in else 0, len(self._in_buf))
+
+    def _parse(self):
+        """Parse the first message in the input buffer and remove the bytes
+        used from it.
+
+        :returns: ``(msg, endplusone)`` from
+            :meth:`~adafruit_midi.midi_message.MIDIMessage.from_message_bytes`.
+        """
+        profiler = self._profiler
+        if profiler is None:
+            (msg, endplusone, skipped) = MIDIMessage.from_message_bytes(
+                self._in_buf, self._in_channel
+            )
+        else:
+            profiler.construct_ns = 0
+            start = profiler.clock()
+            (msg, endplusone, skipped) = MIDIMessage.from_message_bytes(
+                self._in_buf, self._in_channel, profiler=profiler
+            )
+            profiler.parse.record(profiler.clock() - start - profiler.construct_ns)
+        if endplusone != 0:
+            # This is not particularly efficient as it's copying most of bytearray
+            # and deleting old one
+            self._in_buf = self._in_buf[endplusone:]
+        else:
+            # Bytes skipped before a partial message stay in the buffer,
+            # they are counted when the message is complete
+            skipped = 0
+
+        self._skipped_bytes += skipped
+        if self._stats is not None:
+            self._stats.record_message(msg, skipped)
+        return (msg, endplusone)
+
     def _send(self, packet, num):
         if self._debug:
             print("Sending: ", [hex(i) for i in packet[:num]])
+        if self._stats is not None:
+            self._stats.record_write(num)
+        if self._trace is not None:
+            self._trace.record(1, packet, num)  # TRACE_OUT
+        if self._profiler is None:
+            self._write_port(packet, num)
+        else:
+            start = self._profiler.clock()
+            self._write_port(packet, num)
+            self._profiler.write.record(self._profiler.clock() - start)
+
+    def _write_port(self, packet, num):
+        """Write ``num`` bytes of ``packet`` to the output port."""
         self._midi_out.write(packet, num)
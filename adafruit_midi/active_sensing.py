@@ -0,0 +1,56 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.active_sensing`
+================================================================================
+
+Active Sensing MIDI message.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .midi_message import MIDIMessage
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class ActiveSensing(MIDIMessage):
+    """Active Sensing MIDI message.
+
+    Sent at least every 300ms by a device which uses it when there is
+    no other data. If it stops arriving the receiver can assume the link
+    is broken and turn off any sounding notes.
+    """
+
+    _STATUS = 0xFE
+    _STATUSMASK = 0xFF
+    LENGTH = 1
+    __slots__ = ()
+
+
+ActiveSensing.register_message_type()
@@ -0,0 +1,178 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.async_midi`
+================================================================================
+
+An asyncio front end for MIDI using the same parser as :class:`MIDI`.
+This is for CPython, ports are asyncio streams or file descriptors.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import asyncio
+import os
+
+from . import MIDI
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class AsyncMIDI(MIDI):
+    """MIDI helper class for asyncio. ``reader`` or ``writer`` *must* be set
+    or both together.
+
+    :param asyncio.StreamReader reader: The input stream, default None.
+    :param asyncio.StreamWriter writer: The output stream, default None.
+    :param in_channel: The input channel(s), see :class:`MIDI`.
+    :param int out_channel: The wire protocol output channel number (0-15)
+        used by ``send`` if no channel is specified, defaults to 0.
+    :param int in_buf_size: Maximum size of input buffer in bytes, default 256.
+    :param bool debug: Debug mode, default False.
+    :param bool stats: Count messages, bytes and buffer use, default False.
+    :param trace: A :class:`~adafruit_midi.trace.TraceRing` to record
+        all reads and writes in, default None.
+    :param profiler: A :class:`~adafruit_midi.profiler.Profiler` to time
+        parsing, encoding and writing, default None. Reads are not timed
+        as they include waiting for data.
+
+    Messages can be received with ``await midi.receive()`` or
+    ``async for msg in midi``. ``await midi.send(msg)`` waits for the
+    writer's buffer to drain below its high-water mark so a slow port
+    applies backpressure to the sender.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        reader=None,
+        writer=None,
+        *,
+        in_channel=None,
+        out_channel=0,
+        in_buf_size=256,
+        debug=False,
+        stats=False,
+        trace=None,
+        profiler=None
+    ):
+        super().__init__(
+            midi_in=reader,
+            midi_out=writer,
+            in_channel=in_channel,
+            out_channel=out_channel,
+            in_buf_size=in_buf_size,
+            debug=debug,
+            stats=stats,
+            trace=trace,
+            profiler=profiler,
+        )
+        self._eof = False
+
+    @classmethod
+    async def open_fd(cls, fd_in=None, fd_out=None, **kwargs):
+        """Create an :class:`AsyncMIDI` from file descriptors, e.g. for a
+        pipe, a PTY or a ``/dev/snd/midiC*D*`` device. Descriptors are
+        owned by the returned object's streams and closed with them.
+
+        :param int fd_in: The input file descriptor, default None.
+        :param int fd_out: The output file descriptor, default None.
+        """
+        loop = asyncio.get_event_loop()
+        reader = writer = None
+        if fd_in is not None:
+            reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(reader)
+            await loop.connect_read_pipe(lambda: protocol, os.fdopen(fd_in, "rb", 0))
+        if fd_out is not None:
+            transport, protocol = await loop.connect_write_pipe(
+                asyncio.streams.FlowControlMixin, os.fdopen(fd_out, "wb", 0)
+            )
+            writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        return cls(reader, writer, **kwargs)
+
+    # pylint: disable=invalid-overridden-method
+    async def receive(self):
+        """Wait for and return the next MIDI message (event).
+
+        :returns MIDIMessage object: Returns object or None at end of input.
+        """
+        while True:
+            if self._in_buf:
+                (msg, endplusone) = self._parse()
+                if msg is not None:
+                    return msg
+                if endplusone != 0 and self._in_buf:
+                    continue  # messages for other channels were consumed
+
+            if self._eof:
+                return None
+            bytes_in = await self._midi_in.read(
+                max(1, self._in_buf_size - len(self._in_buf))
+            )
+            if not bytes_in:
+                self._eof = True
+            self._received(bytes_in)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self.receive()
+        if msg is None:
+            raise StopAsyncIteration
+        return msg
+
+    # pylint: disable=invalid-overridden-method
+    async def send(self, msg, channel=None):
+        """Sends a MIDI message and waits for the output to drain if its
+        buffer is full.
+
+        :param msg: Either a MIDIMessage object or a sequence (list) of MIDIMessage objects.
+            The channel property will be *updated* as a side-effect of sending message(s).
+        :param int channel: Channel number, if not set the ``out_channel`` will be used.
+        """
+        super().send(msg, channel)
+        await self._midi_out.drain()
+
+    def send_nowait(self, msg, channel=None):
+        """Queues a MIDI message on the writer without waiting,
+        use :meth:`drain` to apply backpressure."""
+        super().send(msg, channel)
+
+    async def drain(self):
+        """Wait until the writer's buffer is below its high-water mark."""
+        await self._midi_out.drain()
+
+    def _write_port(self, packet, num):
+        self._midi_out.write(packet[:num])
+
+    def close(self):
+        """Close the writer, if any."""
+        if self._midi_out is not None:
+            self._midi_out.close()
@@ -0,0 +1,379 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.capture`
+================================================================================
+
+A compact append-only log of all the data read and written by a
+:class:`MIDI` object for later analysis or replay, enabled with
+``MIDI(..., trace=CaptureWriter(stream))``.
+
+Unlike :class:`~adafruit_midi.trace.TraceRing` every byte is kept. Each
+read or write is stored as the raw bytes after two varints, the time in
+microseconds since the previous record and the length and direction.
+Records are grouped into chunks each with a small header giving its
+length, record count and start time, and an index of the chunks is
+appended when the writer is closed. :class:`CaptureReader` memory-maps
+the file and yields the raw records or the messages parsed from them.
+A file which was not closed is read by following the chunk headers.
+This is for CPython.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from bisect import bisect_right
+import mmap
+import struct
+
+from .midi_message import MIDIMessage
+from .ns_time import monotonic_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# Record directions, the same as adafruit_midi.trace
+TRACE_IN = 0
+TRACE_OUT = 1
+
+_VERSION = 1
+
+# File header: magic, version, flags, reserved, base time (ns)
+_FILE_MAGIC = b"MCAP"
+_FILE_HEADER = "<4sBBHQ"
+_FILE_HEADER_SIZE = struct.calcsize(_FILE_HEADER)
+
+# Chunk header: magic, payload length, record count, first time (us from base)
+_CHUNK_MAGIC = b"CHNK"
+_CHUNK_HEADER = "<4sIIQ"
+_CHUNK_HEADER_SIZE = struct.calcsize(_CHUNK_HEADER)
+
+# Index: magic, chunk count then an entry per chunk: offset, records, first time
+_INDEX_MAGIC = b"CIDX"
+_INDEX_HEADER = "<4sI"
+_INDEX_HEADER_SIZE = struct.calcsize(_INDEX_HEADER)
+_INDEX_ENTRY = "<QIQ"
+_INDEX_ENTRY_SIZE = struct.calcsize(_INDEX_ENTRY)
+
+# Footer: index offset, magic
+_FOOTER_MAGIC = b"MEND"
+_FOOTER = "<Q4s"
+_FOOTER_SIZE = struct.calcsize(_FOOTER)
+
+_ALL_CHANNELS = tuple(range(16))
+
+
+def _append_varint(buf, value):
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+class CaptureWriter:
+    """Appends records to a capture file.
+
+    :param stream: A binary stream opened for writing, e.g.
+        ``open("port.mcap", "wb")``, it is not closed by :meth:`close`.
+    :param int chunk_size: The payload size in bytes at which a chunk is
+        written to ``stream``, default 65536.
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    :param int base_ns: The time stored in the header which record times
+        are relative to, defaults to the time the writer is created.
+
+    Timestamps are stored with microsecond resolution, a record with a
+    time earlier than the previous one is stored with the previous time.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, stream, *, chunk_size=65536, clock=None, base_ns=None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._clock = clock if clock is not None else monotonic_ns
+        self.base_ns = base_ns if base_ns is not None else self._clock()
+        self._chunk = bytearray()
+        self._count = 0
+        self._first_us = 0
+        self._last_us = 0
+        self._index = []
+        self._closed = False
+        self.records = 0
+        stream.write(
+            struct.pack(_FILE_HEADER, _FILE_MAGIC, _VERSION, 0, 0, self.base_ns)
+        )
+        self._offset = _FILE_HEADER_SIZE
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record(self, direction, data, length=None, timestamp=None):
+        """Append a record, this has the same arguments as
+        :meth:`TraceRing.record <adafruit_midi.trace.TraceRing.record>`.
+
+        :param int direction: :data:`TRACE_IN` or :data:`TRACE_OUT`.
+        :param data: The data read or written.
+        :param int length: The number of bytes of ``data`` used, default all.
+        :param int timestamp: The time in nanoseconds, default now.
+        """
+        if length is None:
+            length = len(data)
+        if timestamp is None:
+            timestamp = self._clock()
+        now_us = (timestamp - self.base_ns) // 1000
+        buf = self._chunk
+        if self._count == 0:
+            self._first_us = self._last_us = now_us
+        delta = now_us - self._last_us
+        if delta < 0:
+            delta = 0
+        else:
+            self._last_us = now_us
+
+        # The common case of a short gap and a short message is two bytes
+        if delta < 0x80:
+            buf.append(delta)
+        else:
+            _append_varint(buf, delta)
+        value = (length << 1) | direction
+        if value < 0x80:
+            buf.append(value)
+        else:
+            _append_varint(buf, value)
+        buf += data if length == len(data) else data[:length]
+        self._count += 1
+        self.records += 1
+        if len(buf) >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write the current chunk, if any, to the stream."""
+        if not self._count:
+            return
+        payload = self._chunk
+        self._stream.write(
+            struct.pack(
+                _CHUNK_HEADER, _CHUNK_MAGIC, len(payload), self._count, self._first_us
+            )
+        )
+        self._stream.write(payload)
+        self._index.append((self._offset, self._count, self._first_us))
+        self._offset += _CHUNK_HEADER_SIZE + len(payload)
+        self._chunk = bytearray()
+        self._count = 0
+
+    def close(self):
+        """Write the last chunk and the index, no more records can be added."""
+        if self._closed:
+            return
+        self.flush()
+        index = bytearray(struct.pack(_INDEX_HEADER, _INDEX_MAGIC, len(self._index)))
+        for entry in self._index:
+            index += struct.pack(_INDEX_ENTRY, *entry)
+        index += struct.pack(_FOOTER, self._offset, _FOOTER_MAGIC)
+        self._stream.write(index)
+        self._stream.flush()
+        self._closed = True
+
+
+class CaptureReader:
+    """Reads a capture file written by :class:`CaptureWriter`.
+
+    :param source: A filename, which is memory-mapped, or a bytes-like
+        object holding the file contents.
+    """
+
+    def __init__(self, source):
+        self._file = None
+        self._mmap = None
+        if isinstance(source, str):
+            # pylint: disable=consider-using-with
+            self._file = open(source, "rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # an empty file cannot be mapped
+                self._file.close()
+                raise ValueError("Not a MIDI capture") from None
+            self._data = self._mmap
+        else:
+            self._data = source
+
+        data = self._data
+        if len(data) < _FILE_HEADER_SIZE:
+            self.close()
+            raise ValueError("Not a MIDI capture")
+        (magic, version, _, _, self.base_ns) = struct.unpack_from(_FILE_HEADER, data, 0)
+        if magic != _FILE_MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError("Not a MIDI capture")
+        self.complete = True
+        self.chunks = self._read_index()
+        if self.chunks is None:
+            self.complete = False
+            self.chunks = self._scan_chunks()
+        self._first_times = [entry[2] for entry in self.chunks]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return sum(entry[1] for entry in self.chunks)
+
+    def close(self):
+        """Unmap and close the file, if one was opened."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_index(self):
+        data = self._data
+        end = len(data)
+        if end < _FILE_HEADER_SIZE + _INDEX_HEADER_SIZE + _FOOTER_SIZE:
+            return None
+        (index_offset, magic) = struct.unpack_from(_FOOTER, data, end - _FOOTER_SIZE)
+        if magic != _FOOTER_MAGIC or index_offset > end - _FOOTER_SIZE:
+            return None
+        (magic, count) = struct.unpack_from(_INDEX_HEADER, data, index_offset)
+        if (
+            magic != _INDEX_MAGIC
+            or index_offset + _INDEX_HEADER_SIZE + count * _INDEX_ENTRY_SIZE
+            != end - _FOOTER_SIZE
+        ):
+            return None
+        return [
+            struct.unpack_from(
+                _INDEX_ENTRY,
+                data,
+                index_offset + _INDEX_HEADER_SIZE + idx * _INDEX_ENTRY_SIZE,
+            )
+            for idx in range(count)
+        ]
+
+    def _scan_chunks(self):
+        """Rebuild the index from the chunk headers, a truncated final
+        chunk is ignored."""
+        data = self._data
+        end = len(data)
+        offset = _FILE_HEADER_SIZE
+        chunks = []
+        while offset + _CHUNK_HEADER_SIZE <= end:
+            (magic, length, count, first_us) = struct.unpack_from(
+                _CHUNK_HEADER, data, offset
+            )
+            if magic != _CHUNK_MAGIC or offset + _CHUNK_HEADER_SIZE + length > end:
+                break
+            chunks.append((offset, count, first_us))
+            offset += _CHUNK_HEADER_SIZE + length
+        return chunks
+
+    # pylint: disable=too-many-locals
+    def records(self, start_ns=None):
+        """Yield each record as a ``(timestamp_ns, direction, data)`` tuple,
+        ``data`` is a ``bytes``.
+
+        :param int start_ns: Skip records before this time, the chunk index
+            is used to find the first chunk to read, default None.
+        """
+        data = self._data
+        base_ns = self.base_ns
+        first_chunk = 0
+        start_us = None
+        if start_ns is not None:
+            start_us = (start_ns - base_ns) // 1000
+            first_chunk = max(0, bisect_right(self._first_times, start_us) - 1)
+
+        for (offset, count, first_us) in self.chunks[first_chunk:]:
+            (_, length, _, _) = struct.unpack_from(_CHUNK_HEADER, data, offset)
+            start = offset + _CHUNK_HEADER_SIZE
+            # One copy of the chunk is faster to index than the mmap
+            payload = data[start : start + length]
+            now_us = first_us
+            pos = 0
+            for _ in range(count):
+                value = payload[pos]
+                pos += 1
+                if value > 0x7F:
+                    (value, pos) = self._varint(payload, pos, value)
+                now_us += value
+                value = payload[pos]
+                pos += 1
+                if value > 0x7F:
+                    (value, pos) = self._varint(payload, pos, value)
+                end = pos + (value >> 1)
+                if start_us is None or now_us >= start_us:
+                    yield (base_ns + now_us * 1000, value & 1, payload[pos:end])
+                pos = end
+
+    @staticmethod
+    def _varint(payload, pos, value):
+        """Continue decoding a varint whose first byte was ``value``."""
+        result = value & 0x7F
+        shift = 7
+        while True:
+            value = payload[pos]
+            pos += 1
+            result |= (value & 0x7F) << shift
+            if value < 0x80:
+                return (result, pos)
+            shift += 7
+
+    def messages(self, direction=TRACE_IN, *, in_channel=None, start_ns=None):
+        """Yield ``(timestamp_ns, msg)`` for the messages in one direction
+        using the same parser as :meth:`MIDI.receive`, the timestamp is
+        that of the record which completed the message.
+
+        :param int direction: :data:`TRACE_IN` or :data:`TRACE_OUT`.
+        :param in_channel: The channel(s) to return, default all.
+        :param int start_ns: Skip records before this time, default None.
+        """
+        if in_channel is None:
+            in_channel = _ALL_CHANNELS
+        in_buf = bytearray()
+        for (timestamp, record_direction, record_data) in self.records(start_ns):
+            if record_direction != direction:
+                continue
+            in_buf += record_data
+            while in_buf:
+                (msg, endplusone, _) = MIDIMessage.from_message_bytes(
+                    in_buf, in_channel
+                )
+                if endplusone != 0:
+                    del in_buf[:endplusone]
+                if msg is not None:
+                    yield (timestamp, msg)
+                elif endplusone == 0:
+                    break  # partial message, wait for more data
@@ -48,6 +48,7 @@ class ChannelPressure(MIDIMessage):
     _STATUS = 0xD0
     _STATUSMASK = 0xF0
     LENGTH = 2
+    __slots__ = ("pressure",)
 
     def __init__(self, pressure, *, channel=None):
         self.pressure = pressure
@@ -0,0 +1,184 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.clock_follower`
+================================================================================
+
+Tempo and beat phase estimation for an external MIDI clock.
+
+The arrival times of :class:`TimingClock` messages are fitted with a
+least squares line over a sliding window of recent ticks. The sums for the
+regression are updated incrementally as ticks enter and leave the window so
+each tick costs the same regardless of window size and the tempo and beat
+position can be queried at any time without iterating.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+
+from .clock_master import PPQN, CLOCKS_PER_MIDI_BEAT
+from .midi_continue import Continue
+from .ns_time import monotonic_ns
+from .song_position_pointer import SongPositionPointer
+from .start import Start
+from .stop import Stop
+from .timing_clock import TimingClock
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_NS_PER_MINUTE = 60000000000
+
+
+class ClockFollower:
+    """Estimates tempo and song position from received clock messages.
+
+    :param int window: The number of recent ticks used for the tempo
+        estimate, default 48 (two quarter notes). A smaller window follows
+        tempo changes more quickly but is more affected by jitter.
+    :param clock: A function returning monotonic time in nanoseconds used
+        when no timestamp is given, defaults to
+        :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, window=2 * PPQN, *, clock=None):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self._clock = clock if clock is not None else monotonic_ns
+        self._times = [0] * window
+        self._window = window
+        self.playing = False
+        self.reset()
+
+    def reset(self):
+        """Forget all ticks and return the song position to the start."""
+        self._count = 0
+        self._x = -1  # index of most recent tick
+        self._t0 = None  # times are held relative to this
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0
+        self._slope = None  # ns per tick
+        self._intercept = None
+        self._song_base = 0  # song position in ticks when play resumed
+        self._play_x = 0  # tick index at which play resumed
+
+    def feed(self, msg, timestamp=None):
+        """Process a received message, messages other than the clock and
+        transport messages are ignored.
+
+        :param MIDIMessage msg: The received message, may be None.
+        :param int timestamp: The arrival time in nanoseconds, defaults to now.
+        """
+        if isinstance(msg, TimingClock):
+            self._tick(self._clock() if timestamp is None else timestamp)
+        elif isinstance(msg, Start):
+            self._song_base = 0
+            self._play_x = self._x + 1
+            self.playing = True
+        elif isinstance(msg, Continue):
+            self._play_x = self._x + 1
+            self.playing = True
+        elif isinstance(msg, Stop):
+            if self.playing:
+                self._song_base += self._x + 1 - self._play_x
+            self.playing = False
+        elif isinstance(msg, SongPositionPointer):
+            self._song_base = msg.position * CLOCKS_PER_MIDI_BEAT
+            self._play_x = self._x + 1
+
+    def _tick(self, timestamp):
+        if self._t0 is None:
+            self._t0 = timestamp
+        x = self._x + 1
+        y = timestamp - self._t0
+        idx = x % self._window
+        if self._count == self._window:
+            # Remove the oldest tick from the sums
+            old_x = x - self._window
+            old_y = self._times[idx]
+            self._sum_x -= old_x
+            self._sum_y -= old_y
+            self._sum_xx -= old_x * old_x
+            self._sum_xy -= old_x * old_y
+        else:
+            self._count += 1
+        self._times[idx] = y
+        self._sum_x += x
+        self._sum_y += y
+        self._sum_xx += x * x
+        self._sum_xy += x * y
+        self._x = x
+
+        n = self._count
+        if n >= 2:
+            denom = n * self._sum_xx - self._sum_x * self._sum_x
+            self._slope = (n * self._sum_xy - self._sum_x * self._sum_y) / denom
+            self._intercept = (self._sum_y - self._slope * self._sum_x) / n
+
+    @property
+    def ticks(self):
+        """The number of :class:`TimingClock` messages received."""
+        return self._x + 1
+
+    @property
+    def tick_period(self):
+        """The estimated time between ticks in nanoseconds or ``None``."""
+        return self._slope
+
+    @property
+    def bpm(self):
+        """The estimated tempo in quarter notes per minute or ``None``
+        if fewer than two ticks have been received."""
+        if not self._slope:
+            return None
+        return _NS_PER_MINUTE / (self._slope * PPQN)
+
+    def song_position_ticks(self, now=None):
+        """The estimated song position in (fractional) clock ticks.
+        This extrapolates between ticks using the estimated tempo.
+
+        :param int now: The time in nanoseconds, defaults to now.
+        """
+        if not self.playing:
+            return float(self._song_base)
+        if self._slope:
+            if now is None:
+                now = self._clock()
+            x_now = (now - self._t0 - self._intercept) / self._slope
+            # Never run more than one tick ahead of the clock received
+            x_now = min(x_now, self._x + 1)
+        else:
+            x_now = self._x
+        return self._song_base + max(0.0, x_now - self._play_x)
+
+    def beat_position(self, now=None):
+        """The estimated song position in quarter notes (beats), the
+        fractional part is the phase within the current beat.
+
+        :param int now: The time in nanoseconds, defaults to now.
+        """
+        return self.song_position_ticks(now) / PPQN
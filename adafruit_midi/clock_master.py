@@ -0,0 +1,242 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.clock_master`
+================================================================================
+
+A MIDI clock generator which sends :class:`TimingClock` at 24 pulses per
+quarter note along with the :class:`Start`, :class:`Stop`,
+:class:`Continue` and :class:`SongPositionPointer` transport messages.
+
+Clock ticks are scheduled against absolute deadlines computed from an anchor
+time rather than by adding a period to the previous tick, so late ticks
+are caught up with a burst and the error does not accumulate.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import time
+
+from .midi_continue import Continue
+from .ns_time import monotonic_ns
+from .song_position_pointer import SongPositionPointer
+from .start import Start
+from .stop import Stop
+from .timing_clock import TimingClock
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# MIDI clock is always 24 pulses per quarter note
+PPQN = 24
+# A MIDI beat as used by Song Position Pointer is a sixteenth note
+CLOCKS_PER_MIDI_BEAT = PPQN // 4
+
+_NS_PER_MINUTE = 60000000000
+
+
+class JitterStats:
+    """A fixed size record of scheduling lateness in nanoseconds.
+
+    :param int size: The number of most recent samples kept, default 256.
+    """
+
+    def __init__(self, size=256):
+        self._samples = [0] * size
+        self._idx = 0
+        self.count = 0
+        self.max = 0
+
+    def record(self, lateness_ns):
+        """Add a lateness sample in nanoseconds."""
+        self._samples[self._idx] = lateness_ns
+        self._idx = (self._idx + 1) % len(self._samples)
+        self.count += 1
+        if lateness_ns > self.max:
+            self.max = lateness_ns
+
+    def percentiles(self, percents=(50, 90, 99, 100)):
+        """Return a ``dict`` of percentile to lateness in nanoseconds for the
+        samples currently held, values are ``None`` if there are no samples.
+
+        :param percents: The percentiles to calculate, 0-100.
+        """
+        held = sorted(self._samples[: min(self.count, len(self._samples))])
+        result = {}
+        for pct in percents:
+            if held:
+                result[pct] = held[min(len(held) - 1, len(held) * pct // 100)]
+            else:
+                result[pct] = None
+        return result
+
+    def reset(self):
+        """Discard all samples."""
+        self._idx = 0
+        self.count = 0
+        self.max = 0
+
+
+class ClockMaster:
+    """MIDI clock master sending :class:`TimingClock` messages at a tempo.
+
+    :param MIDI midi: The :class:`MIDI` object used for output.
+    :param float bpm: The tempo in quarter notes per minute, default 120.
+    :param int max_catchup: The maximum number of late ticks sent together
+        in one burst, further missed ticks are dropped and counted in
+        ``dropped_ticks``, default 24 (one quarter note).
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    :param int jitter_size: The number of lateness samples kept in
+        ``jitter``, default 256.
+
+    :meth:`poll` must be called frequently, :meth:`wait` can be used between
+    calls to sleep until the next tick is due. Ticks are sent whether the
+    transport is playing or not so that followers can track the tempo.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self, midi, bpm=120.0, *, max_catchup=PPQN, clock=None, jitter_size=256
+    ):
+        self._midi = midi
+        self._clock = clock if clock is not None else monotonic_ns
+        self._ticks_per_minute = None
+        self.bpm = bpm
+        self._max_catchup = max_catchup
+        # Deadlines are _anchor_ns + n * period, _anchor_n is n at the anchor
+        self._anchor_ns = None
+        self._n = 0
+        self._next_ns = None
+        self.playing = False
+        self._song_clocks = 0
+        self.ticks = 0
+        self.dropped_ticks = 0
+        self.jitter = JitterStats(jitter_size)
+        self._tick_bytes = bytes(TimingClock()) * max_catchup
+
+    @property
+    def bpm(self):
+        """The tempo in quarter notes per minute. This can be changed while
+        running, the tick after the change occurs one new period after
+        the previous tick."""
+        return self._ticks_per_minute / PPQN
+
+    @bpm.setter
+    def bpm(self, bpm):
+        if not bpm > 0:
+            raise ValueError("bpm must be positive")
+        if self._ticks_per_minute is not None and self._next_ns is not None:
+            # Re-anchor on the previous tick's deadline with the new tempo
+            self._anchor_ns = self._deadline(self._n - 1)
+            self._n = 1
+            self._ticks_per_minute = bpm * PPQN
+            self._next_ns = self._deadline(1)
+        else:
+            self._ticks_per_minute = bpm * PPQN
+
+    @property
+    def song_position(self):
+        """The current song position in MIDI beats (sixteenth notes)."""
+        return self._song_clocks // CLOCKS_PER_MIDI_BEAT
+
+    @song_position.setter
+    def song_position(self, position):
+        if self.playing:
+            raise RuntimeError("Song position cannot be set while playing")
+        self._midi.send(SongPositionPointer(position))
+        self._song_clocks = position * CLOCKS_PER_MIDI_BEAT
+
+    def _deadline(self, n):
+        return self._anchor_ns + int(n * _NS_PER_MINUTE / self._ticks_per_minute)
+
+    def start(self):
+        """Send :class:`Start` and play from the beginning of the song."""
+        self._midi.send(Start())
+        self._song_clocks = 0
+        self.playing = True
+
+    def stop(self):
+        """Send :class:`Stop`, the song position is retained."""
+        self._midi.send(Stop())
+        self.playing = False
+
+    def resume(self):
+        """Send :class:`Continue` and play from the current song position."""
+        self._midi.send(Continue())
+        self.playing = True
+
+    def time_to_next_tick(self):
+        """The time in nanoseconds until the next tick is due, 0 if overdue."""
+        if self._next_ns is None:
+            return 0
+        return max(0, self._next_ns - self._clock())
+
+    def wait(self, spin_ns=1000000):
+        """Sleep until the next tick is due, busy waiting for the final
+        ``spin_ns`` nanoseconds as sleep is not precise."""
+        remaining = self.time_to_next_tick()
+        if remaining > spin_ns:
+            time.sleep((remaining - spin_ns) / 1e9)
+        while self._next_ns is not None and self._clock() < self._next_ns:
+            pass
+
+    def poll(self):
+        """Send any :class:`TimingClock` messages which are due.
+
+        :returns int: The number of ticks sent.
+        """
+        now = self._clock()
+        if self._next_ns is None:
+            self._anchor_ns = now
+            self._n = 0
+            self._next_ns = now
+        if now < self._next_ns:
+            return 0
+
+        due = 0
+        while self._next_ns <= now and due < self._max_catchup:
+            self.jitter.record(now - self._next_ns)
+            due += 1
+            self._n += 1
+            self._next_ns = self._deadline(self._n)
+
+        if self._next_ns <= now:
+            # Too far behind, re-anchor now rather than sending a huge burst
+            missed = 1 + int(
+                (now - self._next_ns) * self._ticks_per_minute / _NS_PER_MINUTE
+            )
+            self.dropped_ticks += missed
+            self._anchor_ns = self._deadline(self._n + missed)
+            self._n = 0
+            self._next_ns = self._anchor_ns
+
+        self._midi._send(self._tick_bytes, due)  # pylint: disable=protected-access
+        self.ticks += due
+        if self.playing:
+            self._song_clocks += due
+        return due
@@ -50,6 +50,7 @@ class ControlChange(MIDIMessage):
     _STATUS = 0xB0
     _STATUSMASK = 0xF0
     LENGTH = 3
+    __slots__ = ("control", "value")
 
     def __init__(self, control, value, *, channel=None):
         self.control = control
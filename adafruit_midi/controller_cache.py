@@ -0,0 +1,244 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.controller_cache`
+================================================================================
+
+A compact cache of controller state: Control Change values, program,
+pitch bend and channel pressure for each channel. It can suppress sends
+which would not change the receiver's state and resend the whole state as
+a single burst, e.g. when a synthesizer reconnects.
+
+Unknown values are held as 0xFF in ``bytearray`` objects, there is one byte
+per controller per channel.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_CONTROL_CHANGE = 0xB0
+_PROGRAM_CHANGE = 0xC0
+_CHANNEL_PRESSURE = 0xD0
+_PITCH_BEND = 0xE0
+
+_UNKNOWN = 0xFF
+
+# Controls which are actions or depend on other state and must never be
+# suppressed or resent: data entry, data increment/decrement,
+# (N)RPN selection and the channel mode messages
+_VOLATILE_CONTROLS = frozenset(
+    (6, 38, 96, 97, 98, 99, 100, 101) + tuple(range(120, 128))
+)
+_RESET_ALL_CONTROLLERS = 121
+_BANK_SELECT = (0, 32)
+
+# Length of the snapshot produced by ControllerCache.snapshot()
+_SNAPSHOT_LEN = 16 * 128 + 16 + 16 + 32
+
+
+class ControllerCache:
+    """Cache of the controller state for 16 channels.
+
+    Feed this with the messages received and sent, either with
+    :meth:`update` and :meth:`update_bytes` or by using :meth:`receive`
+    and :meth:`send` in place of the :class:`MIDI` methods. :meth:`send`
+    drops messages which would not change the state.
+    """
+
+    def __init__(self):
+        self._cc = bytearray(b"\xff" * (16 * 128))
+        self._program = bytearray(b"\xff" * 16)
+        self._pressure = bytearray(b"\xff" * 16)
+        self._bend = bytearray(b"\xff" * 32)  # LSB, MSB pairs
+        self.suppressed_messages = 0
+        self.suppressed_bytes = 0
+
+    def clear(self):
+        """Set every value to unknown."""
+        self.restore(b"\xff" * _SNAPSHOT_LEN)
+
+    def _update(self, status, data1, data2):
+        """Update from the fields of a message, return True if state changed."""
+        kind = status & 0xF0
+        channel = status & 0x0F
+        if kind == _CONTROL_CHANGE:
+            if data1 in _VOLATILE_CONTROLS:
+                if data1 == _RESET_ALL_CONTROLLERS:
+                    self._cc[channel * 128 : channel * 128 + 128] = b"\xff" * 128
+                    self._pressure[channel] = _UNKNOWN
+                    self._bend[channel * 2 : channel * 2 + 2] = b"\xff\xff"
+                return True
+            idx = channel * 128 + data1
+            if self._cc[idx] == data2:
+                return False
+            self._cc[idx] = data2
+        elif kind == _PROGRAM_CHANGE:
+            if self._program[channel] == data1:
+                return False
+            self._program[channel] = data1
+        elif kind == _CHANNEL_PRESSURE:
+            if self._pressure[channel] == data1:
+                return False
+            self._pressure[channel] = data1
+        elif kind == _PITCH_BEND:
+            idx = channel * 2
+            if self._bend[idx] == data1 and self._bend[idx + 1] == data2:
+                return False
+            self._bend[idx] = data1
+            self._bend[idx + 1] = data2
+        return True
+
+    def update(self, msg):
+        """Update the state from a message, returns True if the message
+        changed the state or is not a controller message.
+        The message must have its channel set."""
+        # pylint: disable=protected-access
+        status = msg._STATUS
+        if status in (_CONTROL_CHANGE, _PROGRAM_CHANGE, _CHANNEL_PRESSURE, _PITCH_BEND):
+            data = msg.__bytes__()
+            return self._update(data[0], data[1], data[2] if len(data) > 2 else 0)
+        return True
+
+    def update_bytes(self, data):
+        """Update the state from raw MIDI bytes made of complete messages."""
+        idx = 0
+        end = len(data)
+        while idx < end:
+            status = data[idx]
+            kind = status & 0xF0
+            if kind in (_PROGRAM_CHANGE, _CHANNEL_PRESSURE) and idx + 1 < end:
+                self._update(status, data[idx + 1], 0)
+                idx += 2
+            elif kind in (_CONTROL_CHANGE, _PITCH_BEND) and idx + 2 < end:
+                self._update(status, data[idx + 1], data[idx + 2])
+                idx += 3
+            else:
+                idx += 1
+
+    def receive(self, midi):
+        """Call ``midi.receive()`` and update the state from the message."""
+        msg = midi.receive()
+        if msg is not None:
+            self.update(msg)
+        return msg
+
+    def send(self, midi, msg, channel=None):
+        """Call ``midi.send()`` with the message(s) which change the state,
+        the others are dropped and counted.
+
+        :returns int: The number of messages sent.
+        """
+        if channel is None:
+            channel = midi.out_channel
+        msgs = (msg,) if hasattr(msg, "_STATUS") else msg
+        to_send = []
+        for each_msg in msgs:
+            each_msg.channel = channel
+            if self.update(each_msg):
+                to_send.append(each_msg)
+            else:
+                self.suppressed_messages += 1
+                self.suppressed_bytes += len(each_msg.__bytes__())
+        if to_send:
+            midi.send(to_send, channel)
+        return len(to_send)
+
+    def control(self, control, channel):
+        """The value of a control or None if unknown."""
+        value = self._cc[channel * 128 + control]
+        return None if value == _UNKNOWN else value
+
+    def program(self, channel):
+        """The program number or None if unknown."""
+        value = self._program[channel]
+        return None if value == _UNKNOWN else value
+
+    def pressure(self, channel):
+        """The channel pressure or None if unknown."""
+        value = self._pressure[channel]
+        return None if value == _UNKNOWN else value
+
+    def pitch_bend(self, channel):
+        """The 14bit pitch bend or None if unknown."""
+        if self._bend[channel * 2] == _UNKNOWN:
+            return None
+        return self._bend[channel * 2 + 1] << 7 | self._bend[channel * 2]
+
+    def snapshot(self):
+        """Return the complete state as an immutable ``bytes``."""
+        return bytes(self._cc + self._program + self._pressure + self._bend)
+
+    def restore(self, snapshot):
+        """Replace the state with one from :meth:`snapshot`."""
+        if len(snapshot) != _SNAPSHOT_LEN:
+            raise ValueError("Bad snapshot length")
+        self._cc[:] = snapshot[0:2048]
+        self._program[:] = snapshot[2048:2064]
+        self._pressure[:] = snapshot[2064:2080]
+        self._bend[:] = snapshot[2080:2112]
+
+    def state_bytes(self):
+        """Encode every known value as a single burst of MIDI bytes. Bank
+        select precedes the program change which precedes the other
+        controllers on each channel."""
+        out = bytearray()
+        values = self._cc
+        for channel in range(16):
+            base = channel * 128
+            status = _CONTROL_CHANGE | channel
+            for control in _BANK_SELECT:
+                if values[base + control] != _UNKNOWN:
+                    out.extend((status, control, values[base + control]))
+            if self._program[channel] != _UNKNOWN:
+                out.extend((_PROGRAM_CHANGE | channel, self._program[channel]))
+            for control in range(128):
+                value = values[base + control]
+                if value != _UNKNOWN and control not in _BANK_SELECT:
+                    out.extend((status, control, value))
+            if self._bend[channel * 2] != _UNKNOWN:
+                out.extend(
+                    (
+                        _PITCH_BEND | channel,
+                        self._bend[channel * 2],
+                        self._bend[channel * 2 + 1],
+                    )
+                )
+            if self._pressure[channel] != _UNKNOWN:
+                out.extend((_CHANNEL_PRESSURE | channel, self._pressure[channel]))
+        return bytes(out)
+
+    def resend(self, midi):
+        """Send the whole known state to ``midi`` in one write.
+
+        :returns int: The number of bytes written.
+        """
+        data = self.state_bytes()
+        if data:
+            midi._send(data, len(data))  # pylint: disable=protected-access
+        return len(data)
@@ -0,0 +1,180 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.controller_coalescer`
+================================================================================
+
+An output stage which limits the rate of continuous controller messages.
+Control Change, Pitch Bend, Channel Pressure and Polyphonic Key Pressure
+are held per channel and controller (or note) with only the latest value
+kept, then written no faster than a maximum rate. All other messages,
+including Note On and Note Off, are written immediately as are the
+controllers whose order or every value matters: Bank Select, the RPN and
+NRPN selection and Data Entry, the switch pedals and the Channel Mode
+messages.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .ns_time import monotonic_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_POLY_PRESSURE = 0xA0
+_CONTROL_CHANGE = 0xB0
+_CHANNEL_PRESSURE = 0xD0
+_PITCH_BEND = 0xE0
+
+# Controllers which are never held, Bank Select must precede a Program
+# Change, parameter selection must precede its Data Entry, switches must
+# not lose a press and Channel Mode messages act on the held controllers
+_IMMEDIATE_CONTROLS = frozenset(
+    (0, 32, 6, 38, 96, 97, 98, 99, 100, 101)
+    + tuple(range(64, 70))
+    + tuple(range(120, 128))
+)
+_RESET_ALL_CONTROLLERS = 121
+
+_NS_PER_S = 1000000000
+
+
+class ControllerCoalescer:
+    """Coalesces continuous controller messages sent to a :class:`MIDI` object.
+
+    :param MIDI midi: The :class:`MIDI` object used for output.
+    :param float max_rate: The maximum number of coalesced messages written
+        per second, default 500 which is about half of a 31250 baud link.
+    :param int burst: The maximum number of coalesced messages written
+        together after an idle period, default 8.
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+
+    :meth:`poll` must be called frequently to write the held messages.
+    Messages are held in a ``dict`` which keeps the oldest first, updating
+    a held value does not change its position.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, midi, *, max_rate=500, burst=8, clock=None):
+        self._midi = midi
+        self._clock = clock if clock is not None else monotonic_ns
+        self._ns_per_msg = int(_NS_PER_S / max_rate)
+        self._burst = burst
+        self._tokens_ns = burst * self._ns_per_msg
+        self._last_ns = None
+        self._pending = {}
+        self.coalesced = 0
+        self.immediate = 0
+        self.written = 0
+
+    @property
+    def pending(self):
+        """The number of messages waiting to be written."""
+        return len(self._pending)
+
+    def send(self, msg, channel=None):
+        """Send a message or sequence of messages, the continuous
+        controllers are held and others written immediately.
+
+        :param msg: Either a MIDIMessage object or a sequence (list) of MIDIMessage objects.
+            The channel property will be *updated* as a side-effect of sending message(s).
+        :param int channel: Channel number, if not set the ``out_channel`` will be used.
+        """
+        if channel is None:
+            channel = self._midi.out_channel
+        msgs = (msg,) if hasattr(msg, "_STATUS") else msg
+        immediate = bytearray()
+        for each_msg in msgs:
+            each_msg.channel = channel
+            data = each_msg.__bytes__()
+            kind = data[0] & 0xF0
+            if kind == _CONTROL_CHANGE and data[1] in _IMMEDIATE_CONTROLS:
+                if data[1] == _RESET_ALL_CONTROLLERS:
+                    self._discard(channel)
+                immediate.extend(data)
+                self.immediate += 1
+                continue
+            if kind in (_CONTROL_CHANGE, _POLY_PRESSURE):
+                key = data[0] << 8 | data[1]
+            elif kind in (_PITCH_BEND, _CHANNEL_PRESSURE):
+                key = data[0] << 8
+            else:
+                immediate.extend(data)
+                self.immediate += 1
+                continue
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = data
+        if immediate:
+            send = self._midi._send  # pylint: disable=protected-access
+            send(immediate, len(immediate))
+
+    def _discard(self, channel):
+        """Discard the held messages for ``channel`` as Reset All
+        Controllers replaces their values."""
+        for key in [key for key in self._pending if (key >> 8) & 0x0F == channel]:
+            del self._pending[key]
+            self.coalesced += 1
+
+    def poll(self):
+        """Write as many held messages as the rate allows.
+
+        :returns int: The number of messages written.
+        """
+        now = self._clock()
+        if self._last_ns is not None:
+            self._tokens_ns = min(
+                self._burst * self._ns_per_msg,
+                self._tokens_ns + now - self._last_ns,
+            )
+        self._last_ns = now
+        if not self._pending:
+            return 0
+        allowed = min(len(self._pending), self._tokens_ns // self._ns_per_msg)
+        if allowed:
+            self._tokens_ns -= allowed * self._ns_per_msg
+            self._write(allowed)
+        return allowed
+
+    def flush(self):
+        """Write every held message immediately, ignoring the rate.
+
+        :returns int: The number of messages written.
+        """
+        count = len(self._pending)
+        if count:
+            self._write(count)
+        return count
+
+    def _write(self, count):
+        out = bytearray()
+        pending = self._pending
+        for key in list(pending)[:count]:
+            out.extend(pending.pop(key))
+        self._midi._send(out, len(out))  # pylint: disable=protected-access
+        self.written += count
@@ -0,0 +1,217 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.fd_port`
+================================================================================
+
+A port for :class:`MIDI` around an operating system file descriptor, e.g.
+a Linux rawmidi device ``/dev/snd/midiC*D*``, a serial TTY, a PTY or a pipe.
+
+The descriptor is non-blocking. Reads fetch everything available, up to
+``read_size`` bytes, with one system call into a buffer allocated once and
+then serve ``read(length)`` from that buffer so the small reads made by
+:meth:`MIDI.receive` do not each cost a system call. Writes retry after
+a partial write, waiting for the descriptor to be writable. The port has
+a ``fileno()`` so :class:`~adafruit_midi.router.Router` can wait on it.
+This is for CPython on Unix-like systems.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import os
+import select
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class FdPort:
+    """A MIDI port using file descriptors.
+
+    :param int fd_in: The file descriptor to read, default None.
+    :param int fd_out: The file descriptor to write, may be the same as
+        ``fd_in``, default None.
+    :param int read_size: The size of the read buffer in bytes, default 4096.
+    :param float write_timeout: The maximum time in seconds a write waits
+        for the descriptor to accept all the data, the rest is then
+        discarded and counted in ``dropped_bytes``, default None to wait
+        indefinitely.
+    :param bool closefd: Close the descriptors in :meth:`close`, default True.
+
+    ``read_calls`` and ``write_calls`` count the system calls made,
+    ``empty_reads`` counts the reads which found no data.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        fd_in=None,
+        fd_out=None,
+        *,
+        read_size=4096,
+        write_timeout=None,
+        closefd=True
+    ):
+        if fd_in is None and fd_out is None:
+            raise ValueError("No fd_in or fd_out provided")
+        if read_size < 1:
+            raise ValueError("read_size must be at least 1")
+        self._fd_in = fd_in
+        self._fd_out = fd_out
+        self._write_timeout = write_timeout
+        self._closefd = closefd
+        self._buf = bytearray(read_size)
+        self._view = memoryview(self._buf)
+        self._pos = 0
+        self._end = 0
+        self.eof = False
+        self.read_calls = 0
+        self.empty_reads = 0
+        self.write_calls = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.dropped_bytes = 0
+        for descriptor in (fd_in, fd_out):
+            if descriptor is not None:
+                os.set_blocking(descriptor, False)
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """Open a device, e.g. ``/dev/snd/midiC1D0`` or ``/dev/ttyUSB0``,
+        for reading and writing.
+
+        :param str path: The device path.
+        :param kwargs: Passed to :class:`FdPort`.
+        """
+        flags = os.O_RDWR | os.O_NONBLOCK | getattr(os, "O_NOCTTY", 0)
+        descriptor = os.open(path, flags)
+        return cls(descriptor, descriptor, **kwargs)
+
+    def fileno(self):
+        """The input file descriptor, or the output one if there is no input."""
+        return self._fd_in if self._fd_in is not None else self._fd_out
+
+    @property
+    def in_waiting(self):
+        """The number of bytes already read from the descriptor and buffered."""
+        return self._end - self._pos
+
+    def _fill(self):
+        """Read what is available into the empty buffer, one system call."""
+        self.read_calls += 1
+        try:
+            count = os.readv(self._fd_in, (self._view,))
+        except (BlockingIOError, InterruptedError):
+            self.empty_reads += 1
+            return 0
+        if count == 0:
+            self.eof = True
+        self.bytes_read += count
+        self._pos = 0
+        self._end = count
+        return count
+
+    def read(self, length):
+        """Read up to ``length`` bytes without waiting.
+
+        :returns bytes: The data, empty if there is none.
+        """
+        pos = self._pos
+        if pos == self._end:
+            if not self._fill():
+                return b""
+            pos = 0
+        end = pos + length
+        if end > self._end:
+            end = self._end
+        self._pos = end
+        return self._view[pos:end].tobytes()
+
+    def readinto(self, buffer):
+        """Read up to ``len(buffer)`` bytes into ``buffer`` without waiting.
+        Buffered data is returned first, otherwise the descriptor is read
+        directly into ``buffer``.
+
+        :returns int: The number of bytes read.
+        """
+        pos = self._pos
+        if pos < self._end:
+            count = min(len(buffer), self._end - pos)
+            buffer[:count] = self._view[pos : pos + count]
+            self._pos = pos + count
+            return count
+        self.read_calls += 1
+        try:
+            count = os.readv(self._fd_in, (buffer,))
+        except (BlockingIOError, InterruptedError):
+            self.empty_reads += 1
+            return 0
+        if count == 0 and len(buffer):
+            self.eof = True
+        self.bytes_read += count
+        return count
+
+    def wait(self, timeout=None):
+        """Wait up to ``timeout`` seconds for data to read, None waits
+        indefinitely.
+
+        :returns bool: True if data may be read without waiting.
+        """
+        if self._pos < self._end:
+            return True
+        (readable, _, _) = select.select((self._fd_in,), (), (), timeout)
+        return bool(readable)
+
+    def write(self, buf, num):
+        """Write ``num`` bytes from ``buf``, retrying after partial writes.
+
+        :returns int: The number of bytes written.
+        """
+        descriptor = self._fd_out
+        data = memoryview(buf)[:num]
+        written = 0
+        while written < num:
+            self.write_calls += 1
+            try:
+                written += os.write(descriptor, data[written:])
+                continue
+            except (BlockingIOError, InterruptedError):
+                pass
+            (_, writable, _) = select.select((), (descriptor,), (), self._write_timeout)
+            if not writable:
+                self.dropped_bytes += num - written
+                break
+        self.bytes_written += written
+        return written
+
+    def close(self):
+        """Close the descriptors if ``closefd`` was True."""
+        if self._closefd:
+            for descriptor in set((self._fd_in, self._fd_out)):
+                if descriptor is not None:
+                    os.close(descriptor)
+        self._fd_in = self._fd_out = None
@@ -0,0 +1,304 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.high_resolution`
+================================================================================
+
+14bit Control Change pairs and Registered/Non-Registered Parameter Number
+(RPN/NRPN) sequences as single high resolution events.
+
+:class:`HighResolutionDecoder` assembles them from received
+:class:`ControlChange` messages and :class:`HighResolutionEncoder`
+encodes them, omitting parameter selection bytes which the receiver
+already has. The per-channel state is held in flat ``bytearray`` objects
+indexed by channel and control number.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .midi_message import MIDIMessage
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_CONTROL_CHANGE = 0xB0
+_UNKNOWN = 0xFF
+
+# Controls used for parameter numbers and data entry
+_DATA_ENTRY_MSB = 6
+_DATA_ENTRY_LSB = 38
+_DATA_INCREMENT = 96
+_DATA_DECREMENT = 97
+_NRPN_LSB = 98
+_NRPN_MSB = 99
+_RPN_LSB = 100
+_RPN_MSB = 101
+
+# Values for the selected parameter kind
+_NONE = 0
+_RPN = 1
+_NRPN = 2
+
+#: The RPN which deselects any parameter
+RPN_NULL = 0x3FFF
+
+
+class ControlChange14(MIDIMessage):
+    """A 14bit Control Change made from an MSB control (0-31) and its LSB
+    control (32-63).
+
+    :param int control: The MSB control number, 0-31.
+    :param int value: The 14bit value, 0-16383.
+    """
+
+    LENGTH = 6
+    __slots__ = ("control", "value")
+
+    def __init__(self, control, value, *, channel=None):
+        self.control = control
+        self.value = value
+        super().__init__(channel=channel)
+        if not 0 <= self.control <= 31 or not 0 <= self.value <= 16383:
+            raise self._EX_VALUEERROR_OOR
+
+    def __bytes__(self):
+        status = _CONTROL_CHANGE | (self.channel & self.CHANNELMASK)
+        return bytes(
+            [
+                status,
+                self.control,
+                self.value >> 7,
+                status,
+                self.control + 32,
+                self.value & 0x7F,
+            ]
+        )
+
+
+class ParameterChange(MIDIMessage):
+    """A change to a Registered (RPN) or Non-Registered (NRPN) Parameter.
+
+    :param int parameter: The 14bit parameter number, 0-16383.
+    :param int value: The 14bit value, 0-16383.
+    :param bool registered: True for an RPN, False for an NRPN, default True.
+    """
+
+    LENGTH = 12
+    __slots__ = ("parameter", "value", "registered")
+
+    def __init__(self, parameter, value, *, registered=True, channel=None):
+        self.parameter = parameter
+        self.value = value
+        self.registered = registered
+        super().__init__(channel=channel)
+        if not 0 <= self.parameter <= 16383 or not 0 <= self.value <= 16383:
+            raise self._EX_VALUEERROR_OOR
+
+    def __bytes__(self):
+        status = _CONTROL_CHANGE | (self.channel & self.CHANNELMASK)
+        msb_control = _RPN_MSB if self.registered else _NRPN_MSB
+        return bytes(
+            [
+                status,
+                msb_control,
+                self.parameter >> 7,
+                status,
+                msb_control - 1,
+                self.parameter & 0x7F,
+                status,
+                _DATA_ENTRY_MSB,
+                self.value >> 7,
+                status,
+                _DATA_ENTRY_LSB,
+                self.value & 0x7F,
+            ]
+        )
+
+
+class HighResolutionDecoder:
+    """Assembles 14bit Control Change and (N)RPN events from received
+    :class:`ControlChange` messages.
+
+    :param bool emit_msb: Produce an event when an MSB arrives as well as
+        when its LSB arrives, the LSB is taken as 0, default True.
+        If False an MSB alone produces no event.
+    """
+
+    def __init__(self, *, emit_msb=True):
+        self._emit_msb = emit_msb
+        # MSB values for controls 0-31 per channel
+        self._msb = bytearray(b"\xff" * (16 * 32))
+        # Selected parameter MSB, LSB per channel, kind and data entry MSB, LSB
+        self._param = bytearray(b"\x7f" * 32)
+        self._kind = bytearray(16)
+        self._data = bytearray(32)
+
+    def feed(self, msg):
+        """Process a message.
+
+        :returns: A :class:`ControlChange14` or :class:`ParameterChange` if
+            the message completes one, None if the message was absorbed as
+            part of one or otherwise the message itself.
+        """
+        # pylint: disable=protected-access,too-many-return-statements,too-many-branches
+        if msg is None or msg._STATUS != _CONTROL_CHANGE:
+            return msg
+        control = msg.control
+        channel = msg.channel
+        value = msg.value
+
+        if control < 32:
+            if control == _DATA_ENTRY_MSB and self._kind[channel]:
+                self._data[channel * 2] = value
+                self._data[channel * 2 + 1] = 0
+                if self._emit_msb:
+                    return self._parameter_change(channel)
+                return None
+            self._msb[channel * 32 + control] = value
+            if self._emit_msb:
+                return ControlChange14(control, value << 7, channel=channel)
+            return None
+
+        if control < 64:
+            if control == _DATA_ENTRY_LSB and self._kind[channel]:
+                self._data[channel * 2 + 1] = value
+                return self._parameter_change(channel)
+            msb = self._msb[channel * 32 + control - 32]
+            if msb == _UNKNOWN:
+                return msg
+            return ControlChange14(control - 32, msb << 7 | value, channel=channel)
+
+        if _NRPN_LSB <= control <= _RPN_MSB:
+            idx = channel * 2
+            if control == _RPN_MSB or control == _NRPN_MSB:
+                self._param[idx] = value
+            else:
+                self._param[idx + 1] = value
+            if control >= _RPN_LSB:
+                kind = _RPN
+                if self._param[idx] == 0x7F and self._param[idx + 1] == 0x7F:
+                    kind = _NONE
+            else:
+                kind = _NRPN
+            self._kind[channel] = kind
+            return None
+
+        if (control in (_DATA_INCREMENT, _DATA_DECREMENT)) and self._kind[channel]:
+            idx = channel * 2
+            data = self._data[idx] << 7 | self._data[idx + 1]
+            if control == _DATA_INCREMENT:
+                data = min(16383, data + 1)
+            else:
+                data = max(0, data - 1)
+            self._data[idx] = data >> 7
+            self._data[idx + 1] = data & 0x7F
+            return self._parameter_change(channel)
+
+        return msg
+
+    def _parameter_change(self, channel):
+        idx = channel * 2
+        return ParameterChange(
+            self._param[idx] << 7 | self._param[idx + 1],
+            self._data[idx] << 7 | self._data[idx + 1],
+            registered=self._kind[channel] == _RPN,
+            channel=channel,
+        )
+
+
+class HighResolutionEncoder:
+    """Encodes :class:`ControlChange14` and :class:`ParameterChange` events
+    with the fewest bytes given what has already been sent.
+
+    Parameter selection is only sent when it differs from the previous
+    selection on the channel and a 14bit Control Change MSB is only sent
+    when it has changed. Use :meth:`reset` if the receiver may have lost
+    this state, e.g. after reconnecting.
+    """
+
+    def __init__(self):
+        self._msb = bytearray(b"\xff" * (16 * 32))
+        self._param = bytearray(b"\xff" * 48)  # kind, MSB, LSB per channel
+        self.suppressed_bytes = 0
+
+    def reset(self):
+        """Forget what has been sent."""
+        self._msb = bytearray(b"\xff" * (16 * 32))
+        self._param = bytearray(b"\xff" * 48)
+
+    def encode(self, event, channel=None):
+        """Return the bytes for an event.
+
+        :param event: A :class:`ControlChange14` or :class:`ParameterChange`.
+        :param int channel: Channel number, if not set the event's channel is used.
+        """
+        if channel is None:
+            channel = event.channel
+        status = _CONTROL_CHANGE | channel
+        value = event.value
+        out = bytearray()
+        if isinstance(event, ControlChange14):
+            idx = channel * 32 + event.control
+            if self._msb[idx] != value >> 7:
+                self._msb[idx] = value >> 7
+                out.extend((status, event.control, value >> 7))
+            else:
+                self.suppressed_bytes += 3
+            out.extend((status, event.control + 32, value & 0x7F))
+            return out
+
+        kind = _RPN if event.registered else _NRPN
+        msb_control = _RPN_MSB if event.registered else _NRPN_MSB
+        idx = channel * 3
+        param_msb = event.parameter >> 7
+        param_lsb = event.parameter & 0x7F
+        if self._param[idx] != kind or self._param[idx + 1] != param_msb:
+            out.extend((status, msb_control, param_msb))
+        else:
+            self.suppressed_bytes += 3
+        if self._param[idx] != kind or self._param[idx + 2] != param_lsb:
+            out.extend((status, msb_control - 1, param_lsb))
+        else:
+            self.suppressed_bytes += 3
+        self._param[idx] = kind
+        self._param[idx + 1] = param_msb
+        self._param[idx + 2] = param_lsb
+        out.extend(
+            (status, _DATA_ENTRY_MSB, value >> 7, status, _DATA_ENTRY_LSB, value & 0x7F)
+        )
+        return out
+
+    def send(self, midi, event, channel=None):
+        """Encode an event and write it to a :class:`MIDI` object.
+
+        :param int channel: Channel number, if not set the ``out_channel`` will be used.
+        """
+        if channel is None:
+            channel = midi.out_channel
+        event.channel = channel
+        data = self.encode(event, channel)
+        midi._send(data, len(data))  # pylint: disable=protected-access
@@ -26,7 +26,9 @@
 An abstract class for objects which represent MIDI messages (events).
 When individual messages are imported they register themselves with
 :func:register_message_type which makes them recognised
-by the parser, :func:from_message_bytes.
+by the parser, :func:from_message_bytes. The module for a standard message
+is also imported automatically the first time its status byte is parsed
+unless :attr:`MIDIMessage.lazy_import` is set to ``False``.
 
 Large messages like :class:SystemExclusive can only be parsed if they fit
 within the input buffer in :class:MIDI.
@@ -46,6 +48,40 @@ __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
 # Semitones     A   B   C   D   E   F   G
 NOTE_OFFSET = [21, 23, 12, 14, 16, 17, 19]
 
+# The length of each message including the status byte indexed by status
+# byte, 0 for data bytes and for SysEx which is variable length
+STATUS_LENGTH = bytes(
+    [0] * 0x80
+    + [3] * 0x40  # Note Off, Note On, Poly Pressure, Control Change
+    + [2] * 0x20  # Program Change, Channel Pressure
+    + [3] * 0x10  # Pitch Bend
+    + [0, 2, 3, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+)
+
+# Modules for the standard messages by status byte, channel voice messages
+# are keyed with the channel bits cleared. Entries are removed when the
+# import is attempted.
+_LAZY_MODULES = {
+    0x80: "note_off",
+    0x90: "note_on",
+    0xA0: "polyphonic_key_pressure",
+    0xB0: "control_change",
+    0xC0: "program_change",
+    0xD0: "channel_pressure",
+    0xE0: "pitch_bend",
+    0xF0: "system_exclusive",
+    0xF1: "mtc_quarter_frame",
+    0xF2: "song_position_pointer",
+    0xF3: "song_select",
+    0xF6: "tune_request",
+    0xF8: "timing_clock",
+    0xFA: "start",
+    0xFB: "midi_continue",
+    0xFC: "stop",
+    0xFE: "active_sensing",
+    0xFF: "system_reset",
+}
+
 
 def channel_filter(channel, channel_spec):
     """
@@ -105,6 +141,10 @@ class MIDIMessage:
     CHANNELMASK = 0x0F
     ENDSTATUS = None
 
+    # Subclasses list their instance attributes in __slots__ to avoid a
+    # per object __dict__, this saves memory when many messages are held
+    __slots__ = ("_channel",)
+
     # Commonly used exceptions to save memory
     _EX_VALUEERROR_OOR = ValueError("Out of range")
 
@@ -112,6 +152,11 @@ class MIDIMessage:
     # order is more specific masks first
     _statusandmask_to_class = []
 
+    lazy_import = True
+    """Import the module for a standard message the first time its status
+    byte is seen if it has not been imported, default True. Set this to
+    ``False`` to parse only the message types explicitly imported."""
+
     def __init__(self, *, channel=None):
         self._channel = channel  # dealing with pylint inadequacy
         self.channel = channel
@@ -126,7 +171,7 @@ class MIDIMessage:
     @channel.setter
     def channel(self, channel):
         if channel is not None and not 0 <= channel <= 15:
-            raise "Channel must be 0-15 or None"
+            raise ValueError("Channel must be 0-15 or None")
         self._channel = channel
 
     @classmethod
@@ -202,6 +247,9 @@ class MIDIMessage:
                     msgendidxplusone = msgstartidx + msgclass.LENGTH
                 break
 
+        if not known_msg and cls._import_message_type(status):
+            return cls._match_message_status(buf, msgstartidx, msgendidxplusone, endidx)
+
         return (
             msgclass,
             status,
@@ -211,15 +259,35 @@ class MIDIMessage:
             msgendidxplusone,
         )
 
+    @classmethod
+    def _import_message_type(cls, status):
+        """Import the module for a standard status byte, the module
+        registers its class. Returns True if an import was done, a module
+        which cannot be imported, e.g. one left out of a small build, leaves
+        its messages unknown."""
+        if not MIDIMessage.lazy_import:
+            return False
+        module = _LAZY_MODULES.pop(status & 0xF0 if status < 0xF0 else status, None)
+        if module is None:
+            return False
+        try:
+            __import__("adafruit_midi." + module)
+        except ImportError:
+            return False
+        return True
+
     # pylint: disable=too-many-locals,too-many-branches
     @classmethod
-    def from_message_bytes(cls, midibytes, channel_in):
+    def from_message_bytes(cls, midibytes, channel_in, *, profiler=None):
         """Create an appropriate object of the correct class for the
         first message found in some MIDI bytes filtered by channel_in.
 
         Returns (messageobject, endplusone, skipped)
         or for no messages, partial messages or messages for other channels
         (None, endplusone, skipped).
+
+        The time taken to create each object is passed to the optional
+        ``profiler``'s ``record_construct``.
         """
         endidx = len(midibytes) - 1
         skipped = 0
@@ -255,7 +323,11 @@ class MIDIMessage:
             channel_match_orna = True
             if complete_message and not bad_termination:
                 try:
+                    if profiler is not None:
+                        construct_start = profiler.clock()
                     msg = msgclass.from_bytes(midibytes[msgstartidx:msgendidxplusone])
+                    if profiler is not None:
+                        profiler.record_construct(profiler.clock() - construct_start)
                     if msg.channel is not None:
                         channel_match_orna = channel_filter(msg.channel, channel_in)
 
@@ -275,10 +347,19 @@ class MIDIMessage:
                     # yet complete - leave bytes in buffer and wait for more
                     break
             else:
-                msg = MIDIUnknownEvent(status)
-                # length cannot be known
-                # next read will skip past leftover data bytes
+                # Unknown messages are skipped using the standard length,
+                # a SysEx or one truncated by a status byte is skipped up
+                # to its first data byte
+                length = STATUS_LENGTH[status]
+                if msgstartidx + length > endidx + 1:
+                    break  # wait for the rest of the message
                 msgendidxplusone = msgstartidx + 1
+                while (
+                    msgendidxplusone < msgstartidx + length
+                    and not midibytes[msgendidxplusone] & 0x80
+                ):
+                    msgendidxplusone += 1
+                msg = MIDIUnknownEvent(status)
                 break
 
         return (msg, msgendidxplusone, skipped)
@@ -312,6 +393,7 @@ class MIDIUnknownEvent(MIDIMessage):
     """
 
     LENGTH = -1
+    __slots__ = ("status",)
 
     def __init__(self, status):
         self.status = status
@@ -330,6 +412,7 @@ class MIDIBadEvent(MIDIMessage):
     """
 
     LENGTH = -1
+    __slots__ = ("data", "exception_text")
 
     def __init__(self, msg_bytes, exception):
         self.data = bytes(msg_bytes)
@@ -0,0 +1,356 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.mtc`
+================================================================================
+
+MIDI Time Code (MTC) decoding and generation.
+
+A running SMPTE time is sent as eight :class:`MtcQuarterFrame` messages,
+each carrying four bits, four per frame so a complete time takes two frames.
+A position is located with a full frame Universal Real Time SysEx. Times are
+``(hours, minutes, seconds, frames)`` tuples and the frame rate is one of
+the rate codes :data:`RATE_24`, :data:`RATE_25`, :data:`RATE_29_97_DROP`
+(30 frames per second drop frame) or :data:`RATE_30`.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+
+from .clock_master import JitterStats
+from .mtc_quarter_frame import MtcQuarterFrame
+from .ns_time import monotonic_ns
+from .system_exclusive import SystemExclusive
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# Frame rate codes as used in MTC
+RATE_24 = 0
+RATE_25 = 1
+RATE_29_97_DROP = 2
+RATE_30 = 3
+
+#: Frames per second for each rate code
+FRAME_RATES = (24, 25, 30000 / 1001, 30)
+
+_NOMINAL_FPS = (24, 25, 30, 30)
+_NS_PER_S = 1000000000
+
+# Drop frame skips frame numbers 0 and 1 at the start of each minute
+# except every tenth minute
+_DF_FRAMES_PER_10_MINUTES = 17982
+_DF_FRAMES_PER_MINUTE = 1798
+
+
+def _frames_per_day(rate):
+    if rate == RATE_29_97_DROP:
+        return 24 * 6 * _DF_FRAMES_PER_10_MINUTES
+    return 24 * 3600 * _NOMINAL_FPS[rate]
+
+
+def timecode_to_frames(timecode, rate):
+    """Convert a time to the number of frames since midnight.
+
+    :param tuple timecode: ``(hours, minutes, seconds, frames)``.
+    :param int rate: The frame rate code.
+    """
+    (hours, minutes, seconds, frames) = timecode
+    fps = _NOMINAL_FPS[rate]
+    total_minutes = hours * 60 + minutes
+    count = (total_minutes * 60 + seconds) * fps + frames
+    if rate == RATE_29_97_DROP:
+        count -= 2 * (total_minutes - total_minutes // 10)
+    return count
+
+
+def frames_to_timecode(count, rate):
+    """Convert a number of frames since midnight to a time, this wraps
+    at 24 hours.
+
+    :param int count: The number of frames.
+    :param int rate: The frame rate code.
+    :returns tuple: ``(hours, minutes, seconds, frames)``.
+    """
+    count %= _frames_per_day(rate)
+    fps = _NOMINAL_FPS[rate]
+    if rate == RATE_29_97_DROP:
+        (tens, rem) = divmod(count, _DF_FRAMES_PER_10_MINUTES)
+        count += 18 * tens
+        if rem > 1:
+            count += 2 * ((rem - 2) // _DF_FRAMES_PER_MINUTE)
+    return (
+        count // (fps * 3600),
+        count // (fps * 60) % 60,
+        count // fps % 60,
+        count % fps,
+    )
+
+
+def full_frame(timecode, rate, device=0x7F):
+    """Return a full frame :class:`SystemExclusive` message which locates
+    receivers to a time.
+
+    :param tuple timecode: ``(hours, minutes, seconds, frames)``.
+    :param int rate: The frame rate code.
+    :param int device: The device id, default 0x7F (all devices).
+    """
+    (hours, minutes, seconds, frames) = timecode
+    return SystemExclusive(
+        [0x7F], [device, 0x01, 0x01, rate << 5 | hours, minutes, seconds, frames]
+    )
+
+
+class MTCDecoder:
+    """Assembles received MTC into times.
+
+    :param clock: A function returning monotonic time in nanoseconds used
+        when no timestamp is given, defaults to
+        :func:`~adafruit_midi.ns_time.monotonic_ns`.
+
+    After eight consecutive quarter frames the time is two frames later than
+    the one they carry and this is allowed for in :attr:`timecode`.
+    ``direction`` is 1 for forwards, -1 for backwards (quarter frames
+    received in reverse order) and 0 if unknown.
+    """
+
+    def __init__(self, *, clock=None):
+        self._clock = clock if clock is not None else monotonic_ns
+        self._nibbles = bytearray(8)
+        self.reset()
+
+    def reset(self):
+        """Forget the time and direction."""
+        self._last = None
+        self._run = 0
+        self.direction = 0
+        self.timecode = None
+        self.rate = None
+        self.updated_ns = None
+
+    def feed(self, msg, timestamp=None):
+        """Process a received message, messages other than quarter frames
+        and full frame SysEx are ignored.
+
+        :param MIDIMessage msg: The received message, may be None.
+        :param int timestamp: The arrival time in nanoseconds, defaults to now.
+        :returns tuple: The new time when one is complete, otherwise None.
+        """
+        if isinstance(msg, MtcQuarterFrame):
+            return self._quarter_frame(msg.message_type, msg.value, timestamp)
+        if (
+            isinstance(msg, SystemExclusive)
+            and msg.manufacturer_id == b"\x7f"
+            and len(msg.data) == 7
+            and msg.data[1] == 0x01
+            and msg.data[2] == 0x01
+        ):
+            data = msg.data
+            # A locate, quarter frames must be assembled again afterwards
+            self._last = None
+            self._run = 0
+            self.direction = 0
+            return self._set_time(
+                (data[3] & 0x1F, data[4], data[5], data[6]),
+                data[3] >> 5 & 0x03,
+                timestamp,
+            )
+        return None
+
+    def _quarter_frame(self, piece, value, timestamp):
+        last = self._last
+        if last is None:
+            direction = 0
+            self._run = 1
+        else:
+            if piece == (last + 1) & 7:
+                direction = 1
+            elif piece == (last - 1) & 7:
+                direction = -1
+            else:
+                direction = 0
+            if direction and (direction == self.direction or self._run == 1):
+                self._run += 1
+            else:
+                self._run = 2 if direction else 1
+        self.direction = direction
+        self._last = piece
+        self._nibbles[piece] = value
+
+        if self._run < 8 or piece != (7 if direction > 0 else 0):
+            return None
+        nib = self._nibbles
+        rate = nib[7] >> 1 & 0x03
+        count = timecode_to_frames(
+            (
+                nib[6] | (nib[7] & 0x01) << 4,
+                nib[4] | (nib[5] & 0x03) << 4,
+                nib[2] | (nib[3] & 0x03) << 4,
+                nib[0] | (nib[1] & 0x01) << 4,
+            ),
+            rate,
+        )
+        return self._set_time(
+            frames_to_timecode(count + 2 * direction, rate), rate, timestamp
+        )
+
+    def _set_time(self, timecode, rate, timestamp):
+        self.timecode = timecode
+        self.rate = rate
+        self.updated_ns = self._clock() if timestamp is None else timestamp
+        return timecode
+
+
+class MTCGenerator:
+    """Sends MTC quarter frames against monotonic deadlines.
+
+    :param MIDI midi: The :class:`MIDI` object used for output.
+    :param int rate: The frame rate code, default :data:`RATE_25`.
+    :param int max_catchup: The maximum number of late quarter frames sent
+        together, further missed quarter frames are skipped and counted in
+        ``dropped``, default 8.
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    :param int jitter_size: The number of lateness samples kept in
+        ``jitter``, default 256.
+
+    :meth:`poll` must be called frequently while running, at least every
+    quarter frame (10ms at 25 frames per second) for a smooth output.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self, midi, rate=RATE_25, *, max_catchup=8, clock=None, jitter_size=256
+    ):
+        if not 0 <= rate <= 3:
+            raise ValueError("rate must be 0-3")
+        self._midi = midi
+        self._rate = rate
+        self._max_catchup = max_catchup
+        self._clock = clock if clock is not None else monotonic_ns
+        # Quarter frame period is 1e9 / (4 * fps) nanoseconds
+        if rate == RATE_29_97_DROP:
+            self._qf_num, self._qf_den = 1001 * _NS_PER_S, 4 * 30000
+        else:
+            self._qf_num, self._qf_den = _NS_PER_S, 4 * _NOMINAL_FPS[rate]
+        self._start_frame = 0
+        self._anchor_ns = None
+        self._n = 0
+        self._next_ns = None
+        self.running = False
+        self.quarter_frames = 0
+        self.dropped = 0
+        self.jitter = JitterStats(jitter_size)
+
+    @property
+    def timecode(self):
+        """The time of the most recent complete frame sent or located."""
+        return frames_to_timecode(self._start_frame + self._n // 4, self._rate)
+
+    def locate(self, timecode, device=0x7F):
+        """Stop and send a full frame message for a new position.
+
+        :param tuple timecode: ``(hours, minutes, seconds, frames)``.
+        """
+        self.running = False
+        self._start_frame = timecode_to_frames(timecode, self._rate)
+        self._n = 0
+        self._midi.send(full_frame(timecode, self._rate, device))
+
+    def start(self):
+        """Start sending quarter frames from the current position at the
+        next :meth:`poll`."""
+        # Sequences must start on piece 0 so round the position down to it
+        self._start_frame += self._n // 8 * 2
+        self._n = 0
+        self._next_ns = None
+        self.running = True
+
+    def stop(self):
+        """Stop sending quarter frames, the position is retained."""
+        if self.running:
+            self._start_frame += self._n // 4
+            self._n = 0
+        self.running = False
+
+    def _deadline(self, n):
+        return self._anchor_ns + n * self._qf_num // self._qf_den
+
+    def time_to_next(self):
+        """The time in nanoseconds until the next quarter frame is due,
+        0 if overdue or not running."""
+        if not self.running or self._next_ns is None:
+            return 0
+        return max(0, self._next_ns - self._clock())
+
+    def _nibble(self, n):
+        piece = n & 7
+        (hours, minutes, seconds, frames) = frames_to_timecode(
+            self._start_frame + (n >> 3) * 2, self._rate
+        )
+        value = (
+            frames,
+            seconds,
+            minutes,
+            hours | self._rate << 5,
+        )[piece >> 1]
+        return piece << 4 | (value >> 4 if piece & 1 else value & 0x0F)
+
+    def poll(self):
+        """Send any quarter frames which are due.
+
+        :returns int: The number of quarter frames sent.
+        """
+        if not self.running:
+            return 0
+        now = self._clock()
+        if self._next_ns is None:
+            self._anchor_ns = now
+            self._next_ns = now
+        if now < self._next_ns:
+            return 0
+
+        packet = bytearray()
+        due = 0
+        while self._next_ns <= now and due < self._max_catchup:
+            self.jitter.record(now - self._next_ns)
+            packet.append(0xF1)
+            packet.append(self._nibble(self._n))
+            due += 1
+            self._n += 1
+            self._next_ns = self._deadline(self._n)
+
+        if self._next_ns <= now:
+            # Too far behind, skip to the next deadline
+            missed = 1 + (now - self._next_ns) * self._qf_den // self._qf_num
+            self.dropped += missed
+            self._n += missed
+            self._next_ns = self._deadline(self._n)
+
+        self._midi._send(packet, len(packet))  # pylint: disable=protected-access
+        self.quarter_frames += due
+        return due
@@ -0,0 +1,72 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.mtc_quarter_frame`
+================================================================================
+
+MIDI Time Code Quarter Frame MIDI message.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .midi_message import MIDIMessage
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class MtcQuarterFrame(MIDIMessage):
+    """MIDI Time Code Quarter Frame MIDI message, one of eight messages
+    which each carry four bits of an SMPTE time.
+
+    :param int message_type: The part of the time carried, 0-7: frames
+        low and high nibble, seconds low and high, minutes low and high,
+        hours low and high (with the frame rate in bits 1-2).
+    :param int value: The four bit value, 0-15.
+    """
+
+    _STATUS = 0xF1
+    _STATUSMASK = 0xFF
+    LENGTH = 2
+    __slots__ = ("message_type", "value")
+
+    def __init__(self, message_type, value):
+        self.message_type = message_type
+        self.value = value
+        super().__init__()
+        if not 0 <= self.message_type <= 7 or not 0 <= self.value <= 15:
+            raise self._EX_VALUEERROR_OOR
+
+    def __bytes__(self):
+        return bytes([self._STATUS, self.message_type << 4 | self.value])
+
+    @classmethod
+    def from_bytes(cls, msg_bytes):
+        return cls(msg_bytes[1] >> 4, msg_bytes[1] & 0x0F)
+
+
+MtcQuarterFrame.register_message_type()
@@ -51,6 +51,7 @@ class NoteOff(MIDIMessage):
     _STATUS = 0x80
     _STATUSMASK = 0xF0
     LENGTH = 3
+    __slots__ = ("note", "velocity")
 
     def __init__(self, note, velocity=0, *, channel=None):
         self.note = note_parser(note)
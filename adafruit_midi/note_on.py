@@ -51,6 +51,7 @@ class NoteOn(MIDIMessage):
     _STATUS = 0x90
     _STATUSMASK = 0xF0
     LENGTH = 3
+    __slots__ = ("note", "velocity")
 
     def __init__(self, note, velocity=127, *, channel=None):
         self.note = note_parser(note)
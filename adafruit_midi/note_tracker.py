@@ -0,0 +1,172 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.note_tracker`
+================================================================================
+
+Tracks which notes are sounding so that stuck notes can be released, e.g.
+after a crash or a change of routing.
+
+The state is 16 channels of 128 bits, one per note, held as an ``int`` per
+channel along with per-channel counts. A Note On with velocity 0 is treated
+as a Note Off.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_NOTE_OFF = 0x80
+_NOTE_ON = 0x90
+
+
+class NoteTracker:
+    """Tracks sounding notes from Note On and Note Off messages.
+
+    Feed this with the messages received and sent, either with
+    :meth:`update` and :meth:`update_bytes` or by using :meth:`receive`
+    and :meth:`send` in place of the :class:`MIDI` methods.
+    """
+
+    def __init__(self):
+        self._notes = [0] * 16
+        self._counts = bytearray(16)
+        self._total = 0
+
+    def clear(self):
+        """Forget all sounding notes."""
+        self._notes = [0] * 16
+        self._counts = bytearray(16)
+        self._total = 0
+
+    def _note_on(self, channel, note):
+        bit = 1 << note
+        if not self._notes[channel] & bit:
+            self._notes[channel] |= bit
+            self._counts[channel] += 1
+            self._total += 1
+
+    def _note_off(self, channel, note):
+        bit = 1 << note
+        if self._notes[channel] & bit:
+            self._notes[channel] &= ~bit
+            self._counts[channel] -= 1
+            self._total -= 1
+
+    def update(self, msg):
+        """Update the state from a message or sequence of messages, anything
+        other than :class:`NoteOn` and :class:`NoteOff` is ignored. Messages
+        must have their channel set, as they do after ``MIDI.send``."""
+        if msg is None:
+            return
+        try:
+            status = msg._STATUS  # pylint: disable=protected-access
+        except AttributeError:
+            for each_msg in msg:
+                self.update(each_msg)
+            return
+        if status == _NOTE_ON and msg.velocity != 0:
+            self._note_on(msg.channel, msg.note)
+        elif status in (_NOTE_ON, _NOTE_OFF):
+            self._note_off(msg.channel, msg.note)
+
+    def update_bytes(self, data):
+        """Update the state from raw MIDI bytes made of complete messages."""
+        idx = 0
+        end = len(data) - 2
+        while idx < end:
+            status = data[idx]
+            kind = status & 0xF0
+            if (
+                kind not in (_NOTE_ON, _NOTE_OFF)
+                or (data[idx + 1] | data[idx + 2]) & 0x80
+            ):
+                # Not a note or one cut short by another status byte
+                idx += 1
+            elif kind == _NOTE_ON and data[idx + 2] != 0:
+                self._note_on(status & 0x0F, data[idx + 1])
+                idx += 3
+            else:
+                self._note_off(status & 0x0F, data[idx + 1])
+                idx += 3
+
+    def receive(self, midi):
+        """Call ``midi.receive()`` and track the message returned."""
+        msg = midi.receive()
+        self.update(msg)
+        return msg
+
+    def send(self, midi, msg, channel=None):
+        """Call ``midi.send()`` and track the message(s) sent."""
+        midi.send(msg, channel)
+        self.update(msg)
+
+    def is_sounding(self, note, channel):
+        """Return True if the note is sounding on the (0-15) channel."""
+        return bool(self._notes[channel] >> note & 1)
+
+    def count(self, channel=None):
+        """The number of sounding notes on a channel or all channels."""
+        if channel is None:
+            return self._total
+        return self._counts[channel]
+
+    def panic_bytes(self, *, running_status=False):
+        """Return the encoded Note Off messages for every sounding note.
+
+        :param bool running_status: Send each channel's status byte once,
+            this is a third smaller but the receiver must support
+            running status, default False.
+        """
+        out = bytearray()
+        for channel in range(16):
+            bits = self._notes[channel]
+            status = _NOTE_OFF | channel
+            if running_status and bits:
+                out.append(status)
+            while bits:
+                low_bit = bits & -bits
+                if not running_status:
+                    out.append(status)
+                out.append(low_bit.bit_length() - 1)
+                out.append(0)
+                bits ^= low_bit
+        return bytes(out)
+
+    def panic(self, midi, *, running_status=False):
+        """Release every sounding note with a single write to ``midi``
+        and clear the state.
+
+        :returns int: The number of notes released.
+        """
+        released = self._total
+        data = self.panic_bytes(running_status=running_status)
+        if data:
+            midi._send(data, len(data))  # pylint: disable=protected-access
+        self.clear()
+        return released
@@ -0,0 +1,59 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.ns_time`
+================================================================================
+
+Nanosecond clocks used as the default ``clock`` by the classes in this
+library. ``time.monotonic_ns`` and ``time.perf_counter_ns`` are used where
+they exist, CircuitPython and CPython 3.7 or later, otherwise the float
+clocks are scaled to nanoseconds.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import time
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+def _monotonic_ns_float():
+    return int(time.monotonic() * 1000000000)
+
+
+def _perf_counter_ns_float():
+    return int(time.perf_counter() * 1000000000)
+
+
+# Monotonic time in nanoseconds for scheduling and timestamps
+monotonic_ns = getattr(time, "monotonic_ns", None) or _monotonic_ns_float
+
+# The highest resolution clock in nanoseconds for timing short durations
+perf_counter_ns = getattr(time, "perf_counter_ns", None) or (
+    _perf_counter_ns_float if hasattr(time, "perf_counter") else monotonic_ns
+)
@@ -0,0 +1,192 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.output_shaper`
+================================================================================
+
+Limits the output of a :class:`MIDI` object to the bandwidth of the link
+with a token bucket, queuing messages in priority classes so that timing
+critical messages are sent first. A 31250 baud DIN MIDI link carries
+3125 bytes per second, writing faster than that fills buffers and adds
+latency to every message.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+
+from .midi_message import STATUS_LENGTH
+from .ns_time import monotonic_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+#: Priority classes, lower values are sent first
+REALTIME = 0
+NOTE = 1
+CONTROLLER = 2
+SYSEX = 3
+
+_CLASS_NAMES = ("realtime", "note", "controller", "sysex")
+
+_NS_PER_S = 1000000000
+
+
+def _priority(status):
+    if status >= 0xF8:
+        return REALTIME
+    if status < 0xA0:
+        return NOTE
+    if status < 0xF0:
+        return CONTROLLER
+    return SYSEX
+
+
+class _ClassQueue:
+    """A FIFO of (enqueue time, bytes) with statistics for one class."""
+
+    def __init__(self):
+        self.items = []
+        self.max_depth = 0
+        self.sent = 0
+        self.wait_total_ns = 0
+        self.wait_max_ns = 0
+
+
+class OutputShaper:
+    """Token bucket shaping of a :class:`MIDI` object's output.
+
+    :param MIDI midi: The :class:`MIDI` object, its ``_send`` is replaced
+        so messages from ``midi.send()`` are queued by the shaper.
+    :param int rate: The link bandwidth in bytes per second, default 3125.
+    :param int burst: The bucket size in bytes, the most which can be
+        written at once after an idle period, default 32 (about 10ms).
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+
+    :meth:`poll` must be called frequently to write the queued messages.
+    Real-time messages are sent before notes, then controllers and other
+    channel messages, then SysEx and System Common. A message larger
+    than ``burst`` is sent when the bucket is full.
+    """
+
+    def __init__(self, midi, *, rate=3125, burst=32, clock=None):
+        self._midi = midi
+        self._clock = clock if clock is not None else monotonic_ns
+        self._ns_per_byte = _NS_PER_S // rate
+        self._burst_ns = burst * self._ns_per_byte
+        self._tokens_ns = self._burst_ns
+        self._last_ns = None
+        self._queues = tuple(_ClassQueue() for _ in _CLASS_NAMES)
+        self._write = midi._send  # pylint: disable=protected-access
+        midi._send = self._enqueue  # pylint: disable=protected-access
+
+    def remove(self):
+        """Restore the :class:`MIDI` object's own ``_send``, any queued
+        messages are discarded."""
+        self._midi._send = self._write  # pylint: disable=protected-access
+        for queue in self._queues:
+            queue.items = []
+
+    @property
+    def queued(self):
+        """The total number of queued messages."""
+        return sum(len(queue.items) for queue in self._queues)
+
+    def _enqueue(self, packet, num):
+        now = self._clock()
+        idx = 0
+        while idx < num:
+            status = packet[idx]
+            if status >= 0xF0:
+                length = STATUS_LENGTH[status]
+                if length == 0:
+                    length = num - idx
+                    for end in range(idx + 1, num):
+                        if packet[end] == 0xF7:
+                            length = end + 1 - idx
+                            break
+            elif status >= 0x80:
+                length = STATUS_LENGTH[status]
+            else:
+                length = 1  # stray data byte
+            queue = self._queues[_priority(status)]
+            queue.items.append((now, bytes(packet[idx : idx + length])))
+            if len(queue.items) > queue.max_depth:
+                queue.max_depth = len(queue.items)
+            idx += length
+
+    def poll(self):
+        """Write as many queued messages as the bandwidth allows.
+
+        :returns int: The number of bytes written.
+        """
+        now = self._clock()
+        if self._last_ns is not None:
+            self._tokens_ns = min(self._burst_ns, self._tokens_ns + now - self._last_ns)
+        self._last_ns = now
+
+        out = bytearray()
+        for queue in self._queues:
+            items = queue.items
+            taken = 0
+            for (queued_ns, data) in items:
+                cost = len(data) * self._ns_per_byte
+                if cost > self._tokens_ns and not (
+                    cost > self._burst_ns and self._tokens_ns == self._burst_ns
+                ):
+                    break
+                self._tokens_ns -= cost
+                out.extend(data)
+                wait = now - queued_ns
+                queue.wait_total_ns += wait
+                if wait > queue.wait_max_ns:
+                    queue.wait_max_ns = wait
+                taken += 1
+            if taken:
+                del items[:taken]
+                queue.sent += taken
+            if items:
+                break  # lower priorities wait behind this class
+
+        if out:
+            self._write(out, len(out))
+        return len(out)
+
+    def stats(self):
+        """Return a ``dict`` of statistics for each priority class:
+        current and maximum queue depth, messages sent and the mean and
+        maximum wait in nanoseconds."""
+        result = {}
+        for name, queue in zip(_CLASS_NAMES, self._queues):
+            result[name] = {
+                "depth": len(queue.items),
+                "max_depth": queue.max_depth,
+                "sent": queue.sent,
+                "wait_mean_ns": queue.wait_total_ns // queue.sent if queue.sent else 0,
+                "wait_max_ns": queue.wait_max_ns,
+            }
+        return result
@@ -49,6 +49,7 @@ class PitchBend(MIDIMessage):
     _STATUS = 0xE0
     _STATUSMASK = 0xF0
     LENGTH = 3
+    __slots__ = ("pitch_bend",)
 
     def __init__(self, pitch_bend, *, channel=None):
         self.pitch_bend = pitch_bend
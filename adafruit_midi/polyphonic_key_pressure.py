@@ -50,6 +50,7 @@ class PolyphonicKeyPressure(MIDIMessage):
     _STATUS = 0xA0
     _STATUSMASK = 0xF0
     LENGTH = 3
+    __slots__ = ("note", "pressure")
 
     def __init__(self, note, pressure, *, channel=None):
         self.note = note_parser(note)
@@ -0,0 +1,191 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.profiler`
+================================================================================
+
+Timing of the phases of :meth:`MIDI.receive` and :meth:`MIDI.send`,
+enabled with ``MIDI(..., profiler=Profiler())``.
+
+The phases are:
+
+  * ``read`` - the call to ``midi_in.read``.
+  * ``parse`` - finding the message in the input buffer, this excludes
+    object construction.
+  * ``construct`` - creating the message object from its bytes.
+  * ``encode`` - converting the message object(s) to bytes in ``send``.
+  * ``write`` - the call to ``midi_out.write``.
+
+Each duration is added to a histogram with power of two buckets so recording
+is a few integer operations with nothing allocated and memory use does
+not grow with the number of samples.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .ns_time import perf_counter_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+PHASES = ("read", "parse", "construct", "encode", "write")
+
+
+class LogHistogram:
+    """A histogram of non-negative integers with power of two buckets,
+    bucket ``n`` counts values from ``2 ** (n - 1)`` to ``2 ** n - 1`` and
+    bucket 0 counts zero. Values beyond the last bucket are counted in it.
+
+    :param int buckets: The number of buckets, default 40 which covers
+        nanosecond durations up to about 9 minutes.
+    """
+
+    def __init__(self, buckets=40):
+        self._buckets = [0] * buckets
+        self._last = buckets - 1
+        self.reset()
+
+    def reset(self):
+        """Discard all samples."""
+        counts = self._buckets
+        for idx in range(len(counts)):
+            counts[idx] = 0
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        """Add a sample, negative values are counted as zero."""
+        if value < 0:
+            value = 0
+        idx = value.bit_length()
+        self._buckets[idx if idx < self._last else self._last] += 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    @property
+    def buckets(self):
+        """A copy of the bucket counts."""
+        return list(self._buckets)
+
+    @property
+    def mean(self):
+        """The mean of the samples or None if there are none."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """An upper bound for a percentile of the samples from the bucket
+        it falls in, limited by the largest sample, or None if there are none.
+
+        :param float percent: The percentile, 0-100.
+        """
+        if not self.count:
+            return None
+        target = self.count * percent / 100
+        cumulative = 0
+        for idx, bucket_count in enumerate(self._buckets):
+            cumulative += bucket_count
+            if cumulative >= target and cumulative:
+                if idx == self._last:
+                    break  # the last bucket has no upper bound
+                return min((1 << idx) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        """Return a ``dict`` of count, total, min, mean, p50, p90, p99
+        and max."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class Profiler:
+    """A :class:`LogHistogram` of nanosecond durations for each phase,
+    available as the attributes named in :data:`PHASES`.
+
+    :param clock: A function returning time in nanoseconds, defaults to
+        :data:`~adafruit_midi.ns_time.perf_counter_ns`.
+    """
+
+    def __init__(self, *, clock=None):
+        self.clock = clock if clock is not None else perf_counter_ns
+        self.read = LogHistogram()
+        self.parse = LogHistogram()
+        self.construct = LogHistogram()
+        self.encode = LogHistogram()
+        self.write = LogHistogram()
+        # Construction time within the current parse, see MIDI.receive
+        self.construct_ns = 0
+
+    def record_construct(self, duration):
+        """Record the time taken to create a message object, this is
+        called by the parser."""
+        self.construct.record(duration)
+        self.construct_ns += duration
+
+    def reset(self):
+        """Discard all samples."""
+        for phase in PHASES:
+            getattr(self, phase).reset()
+
+    def summary(self):
+        """Return a ``dict`` of phase name to :meth:`LogHistogram.summary`."""
+        return {phase: getattr(self, phase).summary() for phase in PHASES}
+
+    def format_summary(self):
+        """Return the summary as lines of text with times in microseconds."""
+        lines = [
+            "%-10s %8s %10s %10s %10s %10s"
+            % ("phase", "count", "mean", "p50", "p99", "max")
+        ]
+        for phase, values in self.summary().items():
+            if not values["count"]:
+                continue
+            lines.append(
+                "%-10s %8d %10.2f %10.2f %10.2f %10.2f"
+                % (
+                    phase,
+                    values["count"],
+                    values["mean"] / 1000,
+                    values["p50"] / 1000,
+                    values["p99"] / 1000,
+                    values["max"] / 1000,
+                )
+            )
+        return lines
@@ -48,6 +48,7 @@ class ProgramChange(MIDIMessage):
     _STATUS = 0xC0
     _STATUSMASK = 0xF0
     LENGTH = 2
+    __slots__ = ("patch",)
 
     def __init__(self, patch, *, channel=None):
         self.patch = patch
@@ -0,0 +1,201 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.reader_thread`
+================================================================================
+
+A background thread which drains a :class:`MIDI` object's input port,
+parses the data and passes the messages to the consuming thread through a
+bounded single producer, single consumer queue. This stops the operating
+system's buffer for the port overflowing when the consumer is busy.
+This is for CPython.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import threading
+import time
+
+from .midi_message import MIDIMessage
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class SPSCQueue:
+    """A bounded ring queue for exactly one producer and one consumer thread.
+
+    :param int capacity: The maximum number of items held.
+
+    No lock is used, the producer only ever assigns ``_tail`` and the
+    consumer only ever assigns ``_head``. Each thread reads the other's
+    index as a single atomic load and the item is stored before the index
+    which publishes it is advanced.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        # One slot is always left empty to distinguish full from empty
+        self._size = capacity + 1
+        self._items = [None] * self._size
+        self._head = 0
+        self._tail = 0
+        self.overflows = 0
+        self.high_water = 0
+
+    def __len__(self):
+        return (self._tail - self._head) % self._size
+
+    def put(self, item):
+        """Add an item, called only from the producer thread.
+
+        :returns bool: False if the queue was full and the item was dropped.
+        """
+        tail = self._tail
+        next_tail = (tail + 1) % self._size
+        if next_tail == self._head:
+            self.overflows += 1
+            return False
+        self._items[tail] = item
+        self._tail = next_tail
+        depth = (next_tail - self._head) % self._size
+        if depth > self.high_water:
+            self.high_water = depth
+        return True
+
+    def get(self):
+        """Remove and return the oldest item, called only from the consumer
+        thread.
+
+        :returns: The item or None if the queue is empty.
+        """
+        head = self._head
+        if head == self._tail:
+            return None
+        item = self._items[head]
+        self._items[head] = None
+        self._head = (head + 1) % self._size
+        return item
+
+
+class ReaderThread:
+    """Reads and parses the input of a :class:`MIDI` object on a
+    background thread.
+
+    :param MIDI midi: The :class:`MIDI` object, its ``midi_in`` port and
+        ``in_channel`` are used. Its ``receive`` must not be used while
+        the thread is running.
+    :param int queue_size: The maximum number of messages waiting for the
+        consumer, further messages are dropped and counted, default 1024.
+    :param int read_size: The maximum number of bytes requested from
+        ``midi_in`` per read, default 1024.
+    :param float idle_sleep: Time in seconds to sleep after a read returns
+        no data, only relevant for non-blocking ports, default 0.001.
+
+    The ``midi_in`` port should block until some data is available (or a
+    timeout) and then return what it has rather than waiting for all of
+    ``read_size`` bytes, e.g. ``serial.Serial`` with a ``timeout``.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, midi, *, queue_size=1024, read_size=1024, idle_sleep=0.001):
+        self._midi = midi
+        self._read_size = read_size
+        self._idle_sleep = idle_sleep
+        self._in_buf = bytearray()
+        self.queue = SPSCQueue(queue_size)
+        self.bytes_read = 0
+        self.reads = 0
+        self.messages = 0
+        self.skipped_bytes = 0
+        self._running = False
+        self._thread = None
+
+    @property
+    def overflows(self):
+        """The number of messages dropped because the queue was full."""
+        return self.queue.overflows
+
+    @property
+    def high_water(self):
+        """The largest number of messages that have been waiting in the queue."""
+        return self.queue.high_water
+
+    def start(self):
+        """Start the reader thread."""
+        if self._thread is not None:
+            raise RuntimeError("Reader thread already started")
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="MIDIReader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Ask the reader thread to finish and wait for it, the thread can
+        only notice this between reads of ``midi_in``."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def receive(self):
+        """Return the next message read by the thread, non-blocking.
+
+        :returns MIDIMessage object: Returns object or None for nothing.
+        """
+        return self.queue.get()
+
+    def _run(self):
+        # pylint: disable=protected-access
+        midi_in = self._midi._midi_in
+        in_buf = self._in_buf
+        put = self.queue.put
+        while self._running:
+            bytes_in = midi_in.read(self._read_size)
+            if not bytes_in:
+                if self._idle_sleep:
+                    time.sleep(self._idle_sleep)
+                continue
+            self.reads += 1
+            self.bytes_read += len(bytes_in)
+            in_buf.extend(bytes_in)
+
+            # Parse every complete message now in the buffer
+            while in_buf:
+                (msg, endplusone, skipped) = MIDIMessage.from_message_bytes(
+                    in_buf, self._midi._in_channel
+                )
+                if endplusone != 0:
+                    del in_buf[:endplusone]
+                    self.skipped_bytes += skipped
+                if msg is not None:
+                    self.messages += 1
+                    put(msg)
+                elif endplusone == 0:
+                    break  # partial message, wait for more data
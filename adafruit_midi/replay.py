@@ -0,0 +1,201 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.replay`
+================================================================================
+
+Replays the records of a capture file from :mod:`adafruit_midi.capture`
+to a :class:`MIDI` object's output port with the original timing, at a
+multiple of it or as fast as possible, for load testing.
+
+Records are read from the capture as they are needed so a capture of any
+size can be replayed. Each record is written with one write to the port,
+keeping the original read sizes, when its deadline is reached. Deadlines
+are computed from an anchor time and the record's time in the capture,
+in the same way as :class:`~adafruit_midi.clock_master.ClockMaster`, so a
+late write does not delay the ones after it.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import time
+
+from .capture import TRACE_IN
+from .clock_master import JitterStats
+from .ns_time import monotonic_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class Replay:
+    """Replays a capture to a :class:`MIDI` object's output.
+
+    :param CaptureReader reader: The capture to replay.
+    :param MIDI midi: The :class:`MIDI` object used for output.
+    :param float speed: The replay speed, 2.0 is twice as fast as the
+        capture, None writes as fast as possible, default 1.0.
+    :param int direction: The records to replay, ``TRACE_IN`` (what the
+        port received) or ``TRACE_OUT``, default ``TRACE_IN``.
+    :param int start_ns: The capture time to start from, default None.
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    :param int jitter_size: The number of lateness samples kept in
+        ``jitter``, default 256.
+
+    Either call :meth:`run` or call :meth:`poll` frequently, :meth:`wait`
+    can be used between calls to sleep until the next record is due.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        reader,
+        midi,
+        *,
+        speed=1.0,
+        direction=TRACE_IN,
+        start_ns=None,
+        clock=None,
+        jitter_size=256
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be greater than 0 or None")
+        self._midi = midi
+        self._speed = speed
+        self._direction = direction
+        self._clock = clock if clock is not None else monotonic_ns
+        self._records = reader.records(start_ns)
+        self._next = None
+        self._first_ns = None
+        self._anchor_ns = None
+        self._next_ns = None
+        self.jitter = JitterStats(jitter_size)
+        self.records = 0
+        self.bytes = 0
+        self.started_ns = None
+        self.finished_ns = None
+        self._fetch()
+
+    @property
+    def finished(self):
+        """True when every record has been written."""
+        return self._next is None
+
+    def _fetch(self):
+        """Read ahead to the next record in the replayed direction."""
+        direction = self._direction
+        for record in self._records:
+            if record[1] == direction:
+                self._next = record
+                break
+        else:
+            self._next = None
+            self._next_ns = None
+            return
+        if self._anchor_ns is not None:
+            self._next_ns = self._deadline(record[0])
+
+    def _deadline(self, timestamp):
+        if self._speed is None:
+            return self._anchor_ns
+        return self._anchor_ns + int((timestamp - self._first_ns) / self._speed)
+
+    def time_to_next(self):
+        """The time in nanoseconds until the next record is due, 0 if
+        overdue or not started."""
+        if self._next_ns is None:
+            return 0
+        return max(0, self._next_ns - self._clock())
+
+    def wait(self, spin_ns=1000000):
+        """Sleep until the next record is due, busy waiting for the final
+        ``spin_ns`` nanoseconds as sleep is not precise."""
+        remaining = self.time_to_next()
+        if remaining > spin_ns:
+            time.sleep((remaining - spin_ns) / 1e9)
+        while self._next_ns is not None and self._clock() < self._next_ns:
+            pass
+
+    def poll(self):
+        """Write any records which are due, the first call starts the replay.
+
+        :returns int: The number of records written.
+        """
+        if self._next is None:
+            return 0
+        now = self._clock()
+        if self._anchor_ns is None:
+            self._anchor_ns = self.started_ns = now
+            self._first_ns = self._next[0]
+            self._next_ns = now
+        if now < self._next_ns:
+            return 0
+
+        count = 0
+        send = self._midi._send  # pylint: disable=protected-access
+        timed = self._speed is not None
+        while self._next is not None and self._next_ns <= now:
+            data = self._next[2]
+            if timed:
+                self.jitter.record(now - self._next_ns)
+            send(data, len(data))
+            self.bytes += len(data)
+            count += 1
+            self._fetch()
+        self.records += count
+        if self._next is None:
+            self.finished_ns = self._clock()
+        return count
+
+    def run(self, spin_ns=1000000):
+        """Replay every remaining record, returning the :meth:`report`."""
+        while self._next is not None:
+            if self._speed is not None:
+                self.wait(spin_ns)
+            self.poll()
+        return self.report()
+
+    def report(self):
+        """Return a ``dict`` of the records and bytes written, the elapsed
+        time in seconds, the rates per second and the lateness percentiles
+        in nanoseconds of the most recent writes, lateness is not recorded
+        when replaying as fast as possible."""
+        if self.started_ns is None:
+            elapsed = 0.0
+        else:
+            end = self.finished_ns if self.finished_ns is not None else self._clock()
+            elapsed = (end - self.started_ns) / 1e9
+        return {
+            "records": self.records,
+            "bytes": self.bytes,
+            "elapsed": elapsed,
+            "records_per_second": self.records / elapsed if elapsed else 0.0,
+            "bytes_per_second": self.bytes / elapsed if elapsed else 0.0,
+            "lateness_ns": self.jitter.percentiles(),
+            "max_lateness_ns": self.jitter.max,
+        }
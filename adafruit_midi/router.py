@@ -0,0 +1,251 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.router`
+================================================================================
+
+Routes messages from many :class:`MIDI` inputs to many :class:`MIDI`
+outputs with per-route channel and message type filters.
+
+Each input's data is parsed once and the raw bytes of each message are
+forwarded by looking up the status byte in a routing table compiled from
+the routes, there is no per-route filtering at run time. Inputs with a
+``fileno()`` are waited on with :mod:`selectors`, any others are polled.
+This is for CPython.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import selectors
+
+from .midi_message import MIDIMessage, MIDIBadEvent, MIDIUnknownEvent, channel_filter
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_ALL_CHANNELS = tuple(range(16))
+
+
+class _Input:
+    """Per input state."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, midi):
+        self.midi = midi
+        self.in_buf = bytearray()
+        # 256 entries indexed by status byte, each a tuple of _Output
+        self.table = None
+        # The port buffers data itself and reports it in in_waiting, e.g.
+        # FdPort, this data is not seen by the selector
+        port_type = type(midi._midi_in)  # pylint: disable=protected-access
+        self.buffered = isinstance(getattr(port_type, "in_waiting", None), property)
+
+
+class _Output:
+    """Per output state, data is accumulated and written once per pump."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, midi):
+        self.midi = midi
+        self.out_buf = bytearray()
+
+
+class Router:
+    """A MIDI message router.
+
+    :param int read_size: The maximum number of bytes read from an input
+        per :meth:`pump`, default 1024.
+    """
+
+    def __init__(self, *, read_size=1024):
+        self._read_size = read_size
+        self._inputs = {}
+        self._outputs = {}
+        self._routes = []
+        self._polled = []
+        self._selector = None
+        self._compiled = False
+        self.messages_in = 0
+        self.messages_out = 0
+        self.dropped = 0
+
+    # pylint: disable=too-many-arguments
+    def add_route(self, midi_in, midi_out, *, channels=None, types=None):
+        """Add a route from one :class:`MIDI` input to one output.
+
+        :param MIDI midi_in: The source, its ``midi_in`` port is read.
+        :param MIDI midi_out: The destination, its ``midi_out`` port is written.
+        :param channels: The channel(s) to forward as an ``int`` or ``tuple``
+            of ``int``, default all. Messages without a channel are not
+            affected by this.
+        :param types: A sequence of message classes to forward,
+            e.g. ``(NoteOn, NoteOff)``, default all.
+        """
+        if channels is None:
+            channels = _ALL_CHANNELS
+        self._routes.append((midi_in, midi_out, channels, types))
+        if midi_in not in self._inputs:
+            self._inputs[midi_in] = _Input(midi_in)
+        if midi_out not in self._outputs:
+            self._outputs[midi_out] = _Output(midi_out)
+        self._compiled = False
+
+    def remove_routes(self, midi_in=None, midi_out=None):
+        """Remove all routes matching the given input and/or output."""
+        self._routes = [
+            route
+            for route in self._routes
+            if not (
+                (midi_in is None or route[0] is midi_in)
+                and (midi_out is None or route[1] is midi_out)
+            )
+        ]
+        used_in = set(route[0] for route in self._routes)
+        used_out = set(route[1] for route in self._routes)
+        self._inputs = {m: s for m, s in self._inputs.items() if m in used_in}
+        self._outputs = {m: s for m, s in self._outputs.items() if m in used_out}
+        self._compiled = False
+
+    @staticmethod
+    def _route_matches(status, channels, types):
+        if types is not None:
+            for msg_type in types:
+                # pylint: disable=protected-access
+                if status & msg_type._STATUSMASK == msg_type._STATUS:
+                    break
+            else:
+                return False
+        if status < 0xF0:
+            return channel_filter(status & 0x0F, channels)
+        return True
+
+    def compile(self):
+        """Build the routing tables and the selector, this is called
+        automatically by :meth:`pump` after routes change."""
+        if self._selector is not None:
+            self._selector.close()
+        self._selector = selectors.DefaultSelector()
+        self._polled = []
+
+        for midi_in, state in self._inputs.items():
+            routes = [r for r in self._routes if r[0] is midi_in]
+            table = [()] * 256
+            for status in range(0x80, 0x100):
+                outs = []
+                for _, midi_out, channels, types in routes:
+                    out_state = self._outputs[midi_out]
+                    if out_state not in outs and self._route_matches(
+                        status, channels, types
+                    ):
+                        outs.append(out_state)
+                table[status] = tuple(outs)
+            state.table = table
+
+            port = midi_in._midi_in  # pylint: disable=protected-access
+            try:
+                port.fileno()
+                self._selector.register(port, selectors.EVENT_READ, state)
+            except (AttributeError, OSError, TypeError, ValueError):
+                self._polled.append(state)
+        self._compiled = True
+
+    def pump(self, timeout=0):
+        """Wait up to ``timeout`` seconds for input, then read each ready
+        input once and forward its complete messages. ``None`` waits
+        indefinitely. There is no wait if any inputs do not have a
+        ``fileno()`` as those must be polled.
+
+        :returns int: The number of messages read.
+        """
+        if not self._compiled:
+            self.compile()
+        if self._polled:
+            ready = [key.data for key, _ in self._selector.select(0)] + self._polled
+        elif self._selector.get_map():
+            ready = [key.data for key, _ in self._selector.select(timeout)]
+        else:
+            return 0
+
+        count = 0
+        for state in ready:
+            count += self._read_input(state)
+
+        if count:
+            for out_state in self._outputs.values():
+                if out_state.out_buf:
+                    data = out_state.out_buf
+                    # pylint: disable=protected-access
+                    out_state.midi._send(data, len(data))
+                    out_state.out_buf = bytearray()
+        return count
+
+    def _read_input(self, state):
+        port = state.midi._midi_in  # pylint: disable=protected-access
+        count = 0
+        while True:
+            bytes_in = port.read(self._read_size)
+            if not bytes_in:
+                break
+            count += self._parse_input(state, bytes_in)
+            # Data already taken from the file descriptor by the port
+            # would otherwise wait until more arrives
+            if not state.buffered or not port.in_waiting:
+                break
+        self.messages_in += count
+        return count
+
+    def _parse_input(self, state, bytes_in):
+        in_buf = state.in_buf
+        in_buf.extend(bytes_in)
+        table = state.table
+        count = 0
+        while in_buf:
+            (msg, endplusone, skipped) = MIDIMessage.from_message_bytes(
+                in_buf, _ALL_CHANNELS
+            )
+            if msg is not None:
+                count += 1
+                if isinstance(msg, (MIDIUnknownEvent, MIDIBadEvent)):
+                    self.dropped += 1
+                else:
+                    outs = table[in_buf[skipped]]
+                    for out_state in outs:
+                        out_state.out_buf.extend(in_buf[skipped:endplusone])
+                    self.messages_out += len(outs)
+            if endplusone == 0:
+                break  # partial message, wait for more data
+            del in_buf[:endplusone]
+        return count
+
+    def close(self):
+        """Release the selector."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        self._compiled = False
@@ -0,0 +1,69 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.song_position_pointer`
+================================================================================
+
+Song Position Pointer MIDI message.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .midi_message import MIDIMessage
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+
+class SongPositionPointer(MIDIMessage):
+    """Song Position Pointer MIDI message.
+
+    :param int position: A 14bit unsigned int representing the number of
+        MIDI beats (sixteenth notes, six timing clocks) since the start of
+        the song, 0-16383.
+    """
+
+    _STATUS = 0xF2
+    _STATUSMASK = 0xFF
+    LENGTH = 3
+    __slots__ = ("position",)
+
+    def __init__(self, position):
+        self.position = position
+        super().__init__()
+        if not 0 <= self.position <= 16383:
+            raise self._EX_VALUEERROR_OOR
+
+    def __bytes__(self):
+        return bytes([self._STATUS, self.position & 0x7F, (self.position >> 7) & 0x7F])
+
+    @classmethod
+    def from_bytes(cls, msg_bytes):
+        return cls(msg_bytes[2] << 7 | msg_bytes[1])
+
+
+SongPositionPointer.register_message_type()
@@ -46,6 +46,7 @@ class Start(MIDIMessage):
     _STATUS = 0xFA
     _STATUSMASK = 0xFF
     LENGTH = 1
+    __slots__ = ()
 
 
 Start.register_message_type()
@@ -0,0 +1,185 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.stats`
+================================================================================
+
+Parser and port statistics for a :class:`MIDI` object, enabled with
+``MIDI(..., stats=True)`` and read from ``midi.stats``.
+
+All counters are preallocated integers, updating them costs a few
+additions per read, message or write and nothing is allocated. When
+statistics are not enabled ``MIDI`` only tests for ``None``.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .midi_message import MIDIBadEvent
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# Names for the per type message counts, the channel voice messages are
+# indexed by (status >> 4) - 8 and the system messages by 7 + (status & 0x0F)
+_TYPE_NAMES = (
+    "note_off",
+    "note_on",
+    "polyphonic_key_pressure",
+    "control_change",
+    "program_change",
+    "channel_pressure",
+    "pitch_bend",
+    "system_exclusive",
+    "mtc_quarter_frame",
+    "song_position_pointer",
+    "song_select",
+    "undefined_f4",
+    "undefined_f5",
+    "tune_request",
+    "end_of_exclusive",
+    "timing_clock",
+    "undefined_f9",
+    "start",
+    "continue",
+    "stop",
+    "undefined_fd",
+    "active_sensing",
+    "system_reset",
+)
+
+
+class MIDIStats:
+    """Counters for the input and output of a :class:`MIDI` object.
+
+    Input:
+
+      * ``reads`` - calls to ``midi_in.read``.
+      * ``empty_reads`` - reads which returned no data.
+      * ``bytes_read`` - total bytes returned by ``midi_in.read``.
+      * ``max_read`` - the largest number of bytes returned by one read.
+      * ``in_buf_high_water`` - the most bytes held in the input buffer.
+      * ``in_buf_full`` - calls to ``receive`` which could not read
+        because the input buffer was full.
+      * ``messages`` - messages returned by the parser, for any channel
+        in ``in_channel``, including bad and unknown events.
+      * ``bad_events`` - :class:`MIDIBadEvent` messages.
+      * ``unknown_events`` - :class:`MIDIUnknownEvent` messages.
+      * ``skipped_bytes`` - bytes discarded by the parser.
+
+    Output:
+
+      * ``writes`` - calls to ``midi_out.write``.
+      * ``bytes_written`` - total bytes written.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self):
+        self._type_counts = [0] * len(_TYPE_NAMES)
+        self.reset()
+
+    def reset(self):
+        """Set all counters to zero."""
+        self.reads = 0
+        self.empty_reads = 0
+        self.bytes_read = 0
+        self.max_read = 0
+        self.in_buf_high_water = 0
+        self.in_buf_full = 0
+        self.messages = 0
+        self.bad_events = 0
+        self.unknown_events = 0
+        self.skipped_bytes = 0
+        self.writes = 0
+        self.bytes_written = 0
+        counts = self._type_counts
+        for idx in range(len(counts)):
+            counts[idx] = 0
+
+    def record_read(self, length, buffered):
+        """Count one ``midi_in.read`` which returned ``length`` bytes
+        leaving ``buffered`` bytes in the input buffer."""
+        self.reads += 1
+        if length:
+            self.bytes_read += length
+            if length > self.max_read:
+                self.max_read = length
+        else:
+            self.empty_reads += 1
+        if buffered > self.in_buf_high_water:
+            self.in_buf_high_water = buffered
+
+    def record_message(self, msg, skipped):
+        """Count one result of the parser, ``msg`` may be None."""
+        self.skipped_bytes += skipped
+        if msg is None:
+            return
+        self.messages += 1
+        status = msg._STATUS  # pylint: disable=protected-access
+        if status is None:
+            if isinstance(msg, MIDIBadEvent):
+                self.bad_events += 1
+            else:
+                self.unknown_events += 1
+        elif status < 0xF0:
+            self._type_counts[(status >> 4) - 8] += 1
+        else:
+            self._type_counts[7 + (status & 0x0F)] += 1
+
+    def record_write(self, length):
+        """Count one ``midi_out.write`` of ``length`` bytes."""
+        self.writes += 1
+        self.bytes_written += length
+
+    def message_count(self, status):
+        """The number of messages received for a status byte, the channel
+        is ignored, e.g. ``message_count(NoteOn._STATUS)``."""
+        if status < 0xF0:
+            return self._type_counts[(status >> 4) - 8]
+        return self._type_counts[7 + (status & 0x0F)]
+
+    def snapshot(self):
+        """Return a ``dict`` of the counters, the per type counts are
+        in a ``dict`` under ``"types"`` with only non-zero counts present."""
+        return {
+            "reads": self.reads,
+            "empty_reads": self.empty_reads,
+            "bytes_read": self.bytes_read,
+            "max_read": self.max_read,
+            "in_buf_high_water": self.in_buf_high_water,
+            "in_buf_full": self.in_buf_full,
+            "messages": self.messages,
+            "bad_events": self.bad_events,
+            "unknown_events": self.unknown_events,
+            "skipped_bytes": self.skipped_bytes,
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "types": {
+                name: count
+                for name, count in zip(_TYPE_NAMES, self._type_counts)
+                if count
+            },
+        }
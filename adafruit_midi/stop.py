@@ -46,6 +46,7 @@ class Stop(MIDIMessage):
     _STATUS = 0xFC
     _STATUSMASK = 0xFF
     LENGTH = 1
+    __slots__ = ()
 
 
 Stop.register_message_type()
@@ -52,6 +52,7 @@ class SystemExclusive(MIDIMessage):
     _STATUS = 0xF0
     _STATUSMASK = 0xFF
     LENGTH = -1
+    __slots__ = ("manufacturer_id", "data")
     ENDSTATUS = 0xF7
 
     def __init__(self, manufacturer_id, data):
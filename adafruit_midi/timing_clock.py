@@ -51,6 +51,7 @@ class TimingClock(MIDIMessage):
     _STATUS = 0xF8
     _STATUSMASK = 0xFF
     LENGTH = 1
+    __slots__ = ()
 
 
 TimingClock.register_message_type()
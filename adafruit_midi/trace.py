@@ -0,0 +1,205 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.trace`
+================================================================================
+
+A low overhead trace of the data read and written by a :class:`MIDI`
+object, enabled with ``MIDI(..., trace=TraceRing())``.
+
+Each read and write is stored as a fixed size record of timestamp,
+direction, length and the first few bytes in a ring buffer allocated once
+when the :class:`TraceRing` is created, the oldest records are overwritten.
+Nothing is formatted while tracing, :meth:`TraceRing.save` writes the
+records to a file and :func:`read_trace` and :func:`format_trace` turn
+them into text later, possibly on another computer.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import struct
+
+from .ns_time import monotonic_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# Record directions
+TRACE_IN = 0
+TRACE_OUT = 1
+
+_DIRECTION_NAMES = ("IN", "OUT")
+
+# Saved record header: timestamp (ns), direction, length
+_RECORD = "<QBH"
+_RECORD_SIZE = struct.calcsize(_RECORD)
+
+# File header: magic, capture length, record count
+_FILE_MAGIC = b"MTRC"
+_FILE_HEADER = "<4sBI"
+_FILE_HEADER_SIZE = struct.calcsize(_FILE_HEADER)
+
+
+class TraceRing:
+    """A ring buffer of read and write records.
+
+    :param int size: The number of records kept, default 256.
+    :param int capture: The number of leading bytes of data stored in each
+        record, 0-255, default 4.
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, size=256, *, capture=4, clock=None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if not 0 <= capture <= 255:
+            raise ValueError("capture must be 0-255")
+        self._clock = clock if clock is not None else monotonic_ns
+        self._size = size
+        self._capture = capture
+        # Parallel arrays are faster to update than packing a struct
+        self._times = [0] * size
+        self._lengths = [0] * size
+        self._directions = bytearray(size)
+        self._data = bytearray(size * capture)
+        self._next = 0
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self._size)
+
+    def clear(self):
+        """Discard all records."""
+        self._next = 0
+        self.total = 0
+
+    def record(self, direction, data, length):
+        """Add a record, the oldest is overwritten when the ring is full.
+
+        :param int direction: :data:`TRACE_IN` or :data:`TRACE_OUT`.
+        :param data: The data read or written.
+        :param int length: The number of bytes of ``data`` used.
+        """
+        idx = self._next
+        self._times[idx] = self._clock()
+        self._lengths[idx] = length
+        self._directions[idx] = direction
+        capture = self._capture
+        if length < capture:
+            capture = length
+        offset = idx * self._capture
+        self._data[offset : offset + capture] = data[:capture]
+        idx += 1
+        self._next = idx if idx < self._size else 0
+        self.total += 1
+
+    def records(self):
+        """Return the records oldest first as a list of
+        ``(timestamp_ns, direction, length, first_bytes)`` tuples."""
+        count = len(self)
+        first = (self._next - count) % self._size
+        capture = self._capture
+        result = []
+        for pos in range(count):
+            idx = (first + pos) % self._size
+            length = self._lengths[idx]
+            offset = idx * capture
+            result.append(
+                (
+                    self._times[idx],
+                    self._directions[idx],
+                    length,
+                    bytes(self._data[offset : offset + min(length, capture)]),
+                )
+            )
+        return result
+
+    def save(self, stream):
+        """Write the records oldest first to a binary stream for
+        :func:`read_trace`."""
+        capture = self._capture
+        stream.write(struct.pack(_FILE_HEADER, _FILE_MAGIC, capture, len(self)))
+        record = bytearray(_RECORD_SIZE + capture)
+        for (timestamp, direction, length, first_bytes) in self.records():
+            struct.pack_into(
+                _RECORD, record, 0, timestamp, direction, min(length, 0xFFFF)
+            )
+            record[_RECORD_SIZE:] = first_bytes + bytes(capture - len(first_bytes))
+            stream.write(record)
+
+
+def _unpack_records(data, capture):
+    rec_size = _RECORD_SIZE + capture
+    for offset in range(0, len(data) - rec_size + 1, rec_size):
+        (timestamp, direction, length) = struct.unpack_from(_RECORD, data, offset)
+        start = offset + _RECORD_SIZE
+        yield (
+            timestamp,
+            direction,
+            length,
+            bytes(data[start : start + min(length, capture)]),
+        )
+
+
+def read_trace(stream):
+    """Read records saved by :meth:`TraceRing.save`.
+
+    :returns: A list of ``(timestamp_ns, direction, length, first_bytes)``.
+    """
+    header = stream.read(_FILE_HEADER_SIZE)
+    (magic, capture, count) = struct.unpack(_FILE_HEADER, header)
+    if magic != _FILE_MAGIC:
+        raise ValueError("Not a MIDI trace")
+    data = stream.read(count * (_RECORD_SIZE + capture))
+    return list(_unpack_records(data, capture))
+
+
+def format_trace(records):
+    """Format records as lines of text with times in seconds relative
+    to the first record, e.g. ``"    0.001234 IN    3 90 3c 40"``.
+    A ``+`` follows the data if only the first bytes were captured.
+
+    :returns: A list of ``str``.
+    """
+    lines = []
+    start = None
+    for (timestamp, direction, length, first_bytes) in records:
+        if start is None:
+            start = timestamp
+        lines.append(
+            "%12.6f %-3s %5d %s%s"
+            % (
+                (timestamp - start) / 1e9,
+                _DIRECTION_NAMES[direction],
+                length,
+                " ".join("%02x" % b for b in first_bytes),
+                "+" if length > len(first_bytes) else "",
+            )
+        )
+    return lines
@@ -0,0 +1,324 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.transform`
+================================================================================
+
+A pipeline of message transformations (transpose, channel remapping,
+velocity curves and control number remapping) applied to raw MIDI bytes.
+
+The stages are composed ahead of time into a 256 entry table mapping each
+status byte to its new status byte and, for each channel voice status, a
+128 entry lookup table for each data byte. Processing a message is then a
+few indexing operations with no message objects created.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .midi_message import STATUS_LENGTH
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# A data byte value in a lookup table which indicates the message is dropped
+DROP = 0xFF
+
+_NOTE_OFF = 0x80
+_NOTE_ON = 0x90
+_POLY_PRESSURE = 0xA0
+_CONTROL_CHANGE = 0xB0
+
+
+_ALL_CHANNELS = tuple(range(16))
+
+
+def _channel_set(channels):
+    if channels is None:
+        return _ALL_CHANNELS
+    if isinstance(channels, int):
+        return (channels,)
+    return tuple(channels)
+
+
+def _sysex_end(data, idx, end):
+    """The index of the byte ending the SysEx which starts at ``idx``, an
+    End of Exclusive or any other status byte except real-time messages
+    which may be interleaved, or -1 if it has not been received."""
+    idx += 1
+    while idx < end:
+        value = data[idx]
+        if value & 0x80 and value < 0xF8:
+            return idx
+        idx += 1
+    return -1
+
+
+def _value_table(mapping):
+    """Convert a callable or sequence into a 128 entry list of data values."""
+    if callable(mapping):
+        return [mapping(value) for value in range(128)]
+    table = list(mapping)
+    if len(table) != 128:
+        raise ValueError("Table must have 128 entries")
+    return table
+
+
+class Transform:
+    """The parent class for pipeline stages.
+
+    Subclasses implement ``tables(status)`` which returns a tuple of
+    ``(new_status, data1_table, data2_table)`` for a channel voice status
+    byte where a table is a 128 entry sequence or None for no change.
+    A data table entry of :data:`DROP` removes the message.
+
+    This is an *abstract* class.
+    """
+
+    def tables(self, status):
+        """Return the new status and data byte tables for a status byte."""
+        return (status, None, None)
+
+
+class Transpose(Transform):
+    """Transpose Note On, Note Off and Polyphonic Key Pressure messages.
+    Notes which would be outside 0-127 are dropped.
+
+    :param int semitones: The number of semitones to add, may be negative.
+    :param channels: The channel(s) to transpose, default all.
+    """
+
+    def __init__(self, semitones, *, channels=None):
+        self._channels = _channel_set(channels)
+        self._table = [
+            n + semitones if 0 <= n + semitones <= 127 else DROP for n in range(128)
+        ]
+
+    def tables(self, status):
+        if (
+            status & 0xF0 in (_NOTE_OFF, _NOTE_ON, _POLY_PRESSURE)
+            and status & 0x0F in self._channels
+        ):
+            return (status, self._table, None)
+        return (status, None, None)
+
+
+class ChannelRemap(Transform):
+    """Move channel voice messages to a different channel.
+
+    :param dict mapping: A ``dict`` of wire protocol channel (0-15) to
+        new channel, unlisted channels are unchanged.
+    """
+
+    def __init__(self, mapping):
+        self._map = list(range(16))
+        for from_channel, to_channel in mapping.items():
+            if not 0 <= from_channel <= 15 or not 0 <= to_channel <= 15:
+                raise ValueError("Channel must be 0-15")
+            self._map[from_channel] = to_channel
+
+    def tables(self, status):
+        return ((status & 0xF0) | self._map[status & 0x0F], None, None)
+
+
+class VelocityCurve(Transform):
+    """Change the velocity of Note On messages with a curve.
+    A velocity of 0 (Note Off) is never changed and other velocities
+    are limited to 1-127 so a Note On cannot become a Note Off.
+
+    :param curve: A function of velocity returning the new velocity or a
+        128 entry sequence of new velocities.
+    :param channels: The channel(s) to apply the curve to, default all.
+    :param bool note_off: Also apply the curve to Note Off velocity,
+        default False.
+    """
+
+    def __init__(self, curve, *, channels=None, note_off=False):
+        self._channels = _channel_set(channels)
+        table = [min(127, max(1, int(v))) for v in _value_table(curve)]
+        table[0] = 0
+        self._table = table
+        self._note_off = note_off
+
+    def tables(self, status):
+        if status & 0x0F in self._channels:
+            if status & 0xF0 == _NOTE_ON or (
+                self._note_off and status & 0xF0 == _NOTE_OFF
+            ):
+                return (status, None, self._table)
+        return (status, None, None)
+
+
+class ControlRemap(Transform):
+    """Change the control number of Control Change messages.
+
+    :param dict mapping: A ``dict`` of control number to new control
+        number or None to drop, unlisted controls are unchanged.
+    :param channels: The channel(s) to remap, default all.
+    """
+
+    def __init__(self, mapping, *, channels=None):
+        self._channels = _channel_set(channels)
+        table = list(range(128))
+        for control, new_control in mapping.items():
+            if not 0 <= control <= 127 or not (
+                new_control is None or 0 <= new_control <= 127
+            ):
+                raise ValueError("Control number must be 0-127")
+            table[control] = DROP if new_control is None else new_control
+        self._table = table
+
+    def tables(self, status):
+        if status & 0xF0 == _CONTROL_CHANGE and status & 0x0F in self._channels:
+            return (status, self._table, None)
+        return (status, None, None)
+
+
+class Pipeline:
+    """A sequence of :class:`Transform` stages compiled to lookup tables.
+
+    :param Transform stages: The stages applied in order.
+
+    A pipeline processes a single stream, incomplete messages at the end of
+    the data given to :meth:`process` are held until the next call.
+    """
+
+    def __init__(self, *stages):
+        self._stages = stages
+        self._status_map = bytes(range(256))
+        self._data1 = [None] * 256
+        self._data2 = [None] * 256
+        self._pending = bytearray()
+        self.compile()
+
+    def compile(self):
+        """Compose the stages into the lookup tables."""
+        identity = list(range(128))
+        status_map = bytearray(range(256))
+        data1 = [None] * 256
+        data2 = [None] * 256
+        for status in range(0x80, 0xF0):
+            new_status = status
+            table1 = identity
+            table2 = identity
+            for stage in self._stages:
+                (new_status, stage1, stage2) = stage.tables(new_status)
+                if stage1 is not None:
+                    table1 = [DROP if v == DROP else stage1[v] for v in table1]
+                if stage2 is not None:
+                    table2 = [DROP if v == DROP else stage2[v] for v in table2]
+            status_map[status] = new_status
+            if table1 != identity:
+                data1[status] = bytes(table1)
+            if table2 != identity:
+                data2[status] = bytes(table2)
+        self._status_map = bytes(status_map)
+        self._data1 = data1
+        self._data2 = data2
+
+    # pylint: disable=too-many-branches,too-many-statements
+    def process(self, data):
+        """Transform raw MIDI bytes.
+
+        :param data: The MIDI bytes, e.g. from a port's ``read``.
+        :returns bytearray: The transformed bytes for complete messages.
+        """
+        if self._pending:
+            data = self._pending + data
+            self._pending = bytearray()
+        status_map = self._status_map
+        data1 = self._data1
+        data2 = self._data2
+        out = bytearray()
+        idx = 0
+        end = len(data)
+        while idx < end:
+            status = data[idx]
+            if status < 0x80:
+                idx += 1  # stray data byte
+                continue
+            if status >= 0xF0:
+                length = STATUS_LENGTH[status]
+                if length == 0:
+                    eox = _sysex_end(data, idx, end)
+                    if eox < 0:
+                        break
+                    # An unterminated SysEx is passed on as it is and
+                    # the status byte which ended it is processed next
+                    length = eox - idx + (data[eox] == 0xF7)
+                if idx + length > end:
+                    break
+                out.extend(data[idx : idx + length])
+                idx += length
+                continue
+
+            length = STATUS_LENGTH[status]
+            if idx + length > end:
+                break
+            value1 = data[idx + 1]
+            if value1 & 0x80 or (length == 3 and data[idx + 2] & 0x80):
+                idx += 1  # truncated message, resume at the next status
+                continue
+            table = data1[status]
+            if table is not None:
+                value1 = table[value1]
+                if value1 == DROP:
+                    idx += length
+                    continue
+            if length == 2:
+                out.append(status_map[status])
+                out.append(value1)
+            else:
+                value2 = data[idx + 2]
+                table = data2[status]
+                if table is not None:
+                    value2 = table[value2]
+                    if value2 == DROP:
+                        idx += length
+                        continue
+                out.append(status_map[status])
+                out.append(value1)
+                out.append(value2)
+            idx += length
+
+        if idx < end:
+            self._pending = bytearray(data[idx:])
+        return out
+
+    def forward(self, midi_in, midi_out, read_size=256):
+        """Read from one :class:`MIDI` object's input port, transform the
+        data and write it to another's output port.
+
+        :returns int: The number of bytes written.
+        """
+        # pylint: disable=protected-access
+        bytes_in = midi_in._midi_in.read(read_size)
+        if not bytes_in:
+            return 0
+        out = self.process(bytes_in)
+        if out:
+            midi_out._send(out, len(out))
+        return len(out)
@@ -0,0 +1,227 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.virtual_port`
+================================================================================
+
+In-memory ports for connecting :class:`MIDI` objects without hardware,
+e.g. between components of one program or for testing.
+
+A :class:`VirtualPort` is a bounded ring buffer with the ``read`` and
+``write`` methods of a ``usb_midi`` port, what is written can be read
+back so one port can be both the ``midi_out`` of one :class:`MIDI` object
+and the ``midi_in`` of another, or of the same one for a loopback.
+:func:`virtual_port_pair` returns two ports for a bidirectional link.
+
+The ring buffer is allocated once and is safe without a lock for one
+thread writing and one thread reading, in the same way as
+:class:`~adafruit_midi.reader_thread.SPSCQueue`.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+import time
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+# Overflow policies for a write which does not fit
+OVERFLOW_DROP = 0
+OVERFLOW_BLOCK = 1
+OVERFLOW_ERROR = 2
+
+
+class VirtualPort:
+    """A MIDI port backed by a ring buffer.
+
+    :param int capacity: The maximum number of bytes held, default 1024.
+    :param int overflow: What a write which does not fit does,
+        :data:`OVERFLOW_DROP` discards the whole write and counts it in
+        ``overflows``, :data:`OVERFLOW_BLOCK` waits for the reader to make
+        space and :data:`OVERFLOW_ERROR` raises :class:`RuntimeError`,
+        default :data:`OVERFLOW_DROP`.
+    :param float timeout: The maximum time in seconds a blocked write
+        waits, the rest of the data is then discarded and counted in
+        ``dropped_bytes``, default None to wait indefinitely.
+    :param float poll_interval: The time in seconds a blocked write sleeps
+        between checks for space, default 0.0005.
+
+    Writes are never split by :data:`OVERFLOW_DROP` or
+    :data:`OVERFLOW_ERROR` so whole messages are kept or lost together,
+    a blocked write larger than the capacity is written as space is made.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        capacity=1024,
+        *,
+        overflow=OVERFLOW_DROP,
+        timeout=None,
+        poll_interval=0.0005
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK, OVERFLOW_ERROR):
+            raise ValueError("Unknown overflow policy")
+        # One byte is always left empty to distinguish full from empty
+        self._size = capacity + 1
+        self._buf = bytearray(self._size)
+        self._view = memoryview(self._buf)
+        self._head = 0
+        self._tail = 0
+        self._overflow = overflow
+        self._timeout = timeout
+        self._poll_interval = poll_interval
+        self.overflows = 0
+        self.dropped_bytes = 0
+        self.high_water = 0
+
+    @property
+    def capacity(self):
+        """The maximum number of bytes held."""
+        return self._size - 1
+
+    @property
+    def in_waiting(self):
+        """The number of bytes waiting to be read."""
+        return (self._tail - self._head) % self._size
+
+    def _space(self):
+        return (self._head - self._tail - 1) % self._size
+
+    def _put(self, data, start, length):
+        """Copy ``length`` bytes of ``data`` from ``start``, called only
+        from the writer and only with that much space free."""
+        buf = self._buf
+        size = self._size
+        tail = self._tail
+        first = size - tail
+        if length <= first:
+            buf[tail : tail + length] = data[start : start + length]
+        else:
+            buf[tail:] = data[start : start + first]
+            buf[: length - first] = data[start + first : start + length]
+        # Publish the data to the reader only after it is copied
+        self._tail = (tail + length) % size
+        depth = (self._tail - self._head) % size
+        if depth > self.high_water:
+            self.high_water = depth
+
+    def write(self, buf, num):
+        """Write ``num`` bytes from ``buf``, called from one thread only.
+
+        :returns int: The number of bytes written.
+        """
+        if num <= self._space():
+            self._put(buf, 0, num)
+            return num
+        if self._overflow == OVERFLOW_DROP:
+            self.overflows += 1
+            self.dropped_bytes += num
+            return 0
+        if self._overflow == OVERFLOW_ERROR:
+            self.overflows += 1
+            raise RuntimeError("Virtual port full")
+
+        data = memoryview(buf)
+        written = 0
+        deadline = None
+        if self._timeout is not None:
+            deadline = time.monotonic() + self._timeout
+        while written < num:
+            space = self._space()
+            if space:
+                length = min(space, num - written)
+                self._put(data, written, length)
+                written += length
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                self.overflows += 1
+                self.dropped_bytes += num - written
+                break
+            time.sleep(self._poll_interval)
+        return written
+
+    def read(self, length):
+        """Read up to ``length`` bytes without waiting, called from one
+        thread only.
+
+        :returns bytes: The data, empty if there is none.
+        """
+        view = self._view
+        size = self._size
+        head = self._head
+        count = min(length, (self._tail - head) % size)
+        if count <= 0:
+            return b""
+        end = head + count
+        if end <= size:
+            data = bytes(view[head:end])
+        else:
+            data = bytes(view[head:]) + bytes(view[: end - size])
+        self._head = end % size
+        return data
+
+    def readinto(self, buffer):
+        """Read up to ``len(buffer)`` bytes into ``buffer`` without
+        waiting, called from one thread only.
+
+        :returns int: The number of bytes read.
+        """
+        view = self._view
+        size = self._size
+        head = self._head
+        count = min(len(buffer), (self._tail - head) % size)
+        if count <= 0:
+            return 0
+        end = head + count
+        if end <= size:
+            buffer[:count] = view[head:end]
+        else:
+            first = size - head
+            buffer[:first] = view[head:]
+            buffer[first:count] = view[: end - size]
+        self._head = end % size
+        return count
+
+    def reset_input_buffer(self):
+        """Discard all data waiting to be read, called from the reader."""
+        self._head = self._tail
+
+
+def virtual_port_pair(capacity=1024, **kwargs):
+    """Return two :class:`VirtualPort` objects for a bidirectional link,
+    one for each direction. For :class:`MIDI` objects ``a`` and ``b`` use
+    ``MIDI(midi_in=port_ab, midi_out=port_ba)`` for ``b`` and
+    ``MIDI(midi_in=port_ba, midi_out=port_ab)`` for ``a``.
+
+    :param int capacity: The capacity of each port in bytes, default 1024.
+    :param kwargs: Passed to :class:`VirtualPort`.
+    :returns: ``(port_ab, port_ba)``
+    """
+    return (VirtualPort(capacity, **kwargs), VirtualPort(capacity, **kwargs))
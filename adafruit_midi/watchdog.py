@@ -0,0 +1,127 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+`adafruit_midi.watchdog`
+================================================================================
+
+An Active Sensing watchdog for a :class:`MIDI` link, enabled with
+``MIDI(..., watchdog=ActiveSensingWatchdog())``.
+
+Once an :class:`ActiveSensing` message has been received the sender is
+expected to send something at least every 300ms, if nothing arrives for
+longer the link is assumed to be broken, e.g. an unplugged cable, and
+sounding notes should be turned off. The watchdog also sends
+:class:`ActiveSensing` so the other end can do the same.
+
+There is no thread or timer, the times are checked by :meth:`MIDI.receive`
+which is normally called continuously. An output only :class:`MIDI` object
+must call :meth:`ActiveSensingWatchdog.poll` instead.
+
+
+* Author(s): Kevin J. Walters
+
+Implementation Notes
+--------------------
+
+"""
+
+from .ns_time import monotonic_ns
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MIDI.git"
+
+_ACTIVE_SENSING = 0xFE
+_ACTIVE_SENSING_BYTES = bytes([_ACTIVE_SENSING])
+
+
+class ActiveSensingWatchdog:
+    """Monitors and sends Active Sensing.
+
+    :param float timeout: The time in seconds without any received data
+        after which the link is considered lost, default 0.3 (the MIDI
+        specification's value). Monitoring starts when the first Active
+        Sensing message is received and stops after a timeout until
+        another arrives.
+    :param float send_interval: The time in seconds between sent Active
+        Sensing messages or None to not send them, default 0.25 to stay
+        safely inside the 300ms limit.
+    :param on_timeout: A function called with the :class:`MIDI` object when
+        the link is lost, default None.
+    :param NoteTracker note_tracker: A :class:`~adafruit_midi.note_tracker.NoteTracker`
+        whose sounding notes are released with Note Offs on timeout if the
+        :class:`MIDI` object has an output, default None.
+    :param clock: A function returning monotonic time in nanoseconds,
+        defaults to :func:`~adafruit_midi.ns_time.monotonic_ns`.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        *,
+        timeout=0.3,
+        send_interval=0.25,
+        on_timeout=None,
+        note_tracker=None,
+        clock=None
+    ):
+        self._clock = clock if clock is not None else monotonic_ns
+        self._timeout_ns = int(timeout * 1e9)
+        self._interval_ns = None if send_interval is None else int(send_interval * 1e9)
+        self._on_timeout = on_timeout
+        self._note_tracker = note_tracker
+        self._last_rx_ns = None
+        self._next_tx_ns = None
+        self.armed = False
+        self.timeouts = 0
+        self.sent = 0
+
+    def poll(self, midi, msg=None, received=False):
+        """Check the times, send Active Sensing if due and handle a timeout.
+        This is called by :meth:`MIDI.receive`.
+
+        :param MIDI midi: The :class:`MIDI` object.
+        :param MIDIMessage msg: The message received, if any.
+        :param bool received: True if any data was read.
+        """
+        # pylint: disable=protected-access
+        now = self._clock()
+        if received or msg is not None:
+            self._last_rx_ns = now
+            if not self.armed and msg is not None:
+                status = msg._STATUS
+                if status is None:
+                    status = getattr(msg, "status", None)
+                if status == _ACTIVE_SENSING:
+                    self.armed = True
+        elif self.armed and now - self._last_rx_ns > self._timeout_ns:
+            self.armed = False
+            self.timeouts += 1
+            if self._note_tracker is not None and midi._midi_out is not None:
+                self._note_tracker.panic(midi)
+            if self._on_timeout is not None:
+                self._on_timeout(midi)
+
+        if self._interval_ns is not None and midi._midi_out is not None:
+            if self._next_tx_ns is None or now >= self._next_tx_ns:
+                midi._send(_ACTIVE_SENSING_BYTES, 1)
+                self.sent += 1
+                self._next_tx_ns = now + self._interval_ns
@@ -0,0 +1,126 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Compare a polling :meth:`MIDI.receive` loop with :class:`AsyncMIDI` reading
+from a pipe. A producer thread writes bursts of messages with gaps between
+them as a real port would. Wall time, CPU time and the mean latency from
+write to receive are reported for each method.
+
+Usage: python benchmarks/bench_async_midi.py [messages]
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+import adafruit_midi
+from adafruit_midi.async_midi import AsyncMIDI
+from adafruit_midi.note_on import NoteOn
+
+BURST = 16
+GAP_S = 0.001
+POLL_SLEEP_S = 0.0005
+
+
+def producer(fd_out, count, sent_times):
+    burst = bytes(NoteOn(60, 100, channel=0)) * BURST
+    for _ in range(count // BURST):
+        sent_times.append(time.perf_counter())
+        os.write(fd_out, burst)
+        time.sleep(GAP_S)
+
+
+class NonBlockingPipeIn:
+    def __init__(self, fd):
+        os.set_blocking(fd, False)
+        self._fd = fd
+
+    def read(self, length):
+        try:
+            return os.read(self._fd, length)
+        except BlockingIOError:
+            return b""
+
+
+def consume_polling(fd_in, count, recv_times):
+    midi = adafruit_midi.MIDI(midi_in=NonBlockingPipeIn(fd_in), in_buf_size=256)
+    received = 0
+    while received < count:
+        msg = midi.receive()
+        if msg is None:
+            time.sleep(POLL_SLEEP_S)
+            continue
+        if received % BURST == 0:
+            recv_times.append(time.perf_counter())
+        received += 1
+
+
+def consume_async(fd_in, count, recv_times):
+    async def body():
+        midi = await AsyncMIDI.open_fd(fd_in)
+        received = 0
+        async for _ in midi:
+            if received % BURST == 0:
+                recv_times.append(time.perf_counter())
+            received += 1
+            if received == count:
+                break
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(body())
+    loop.close()
+
+
+def run(name, consumer, count):
+    fd_in, fd_out = os.pipe()
+    sent_times = []
+    recv_times = []
+    thread = threading.Thread(target=producer, args=(fd_out, count, sent_times))
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    thread.start()
+    consumer(fd_in, count, recv_times)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    thread.join()
+    os.close(fd_out)
+    latency = sum(r - s for s, r in zip(sent_times, recv_times)) / len(recv_times)
+    print(
+        "{:8s} {:8d} msgs {:7.3f}s wall {:7.3f}s cpu {:8.1f}us mean latency".format(
+            name, count, wall, cpu, latency * 1e6
+        )
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+    run("polling", consume_polling, count)
+    run("asyncio", consume_async, count)
+
+
+if __name__ == "__main__":
+    main()
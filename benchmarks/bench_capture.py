@@ -0,0 +1,166 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Write and read throughput of :mod:`adafruit_midi.capture` for a large
+capture file, and for comparison the size of the same records pickled as
+message objects. Use ``--size 1024`` or more for a GB scale file.
+
+Reported:
+
+  * write rate in MB/s and records/s through :meth:`CaptureWriter.record`.
+  * raw record read rate from the memory-mapped file.
+  * parsed message read rate through :meth:`CaptureReader.messages`.
+  * bytes per record on disk.
+
+Usage: python benchmarks/bench_capture.py [--size MB] [--dir DIR] [--keep]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+from adafruit_midi.capture import CaptureReader, CaptureWriter, TRACE_IN, TRACE_OUT
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.midi_message import MIDIMessage
+from adafruit_midi.note_off import NoteOff
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.timing_clock import TimingClock
+
+_ALL_CHANNELS = tuple(range(16))
+
+
+def make_records(count):
+    """A mix of single message reads and writes of typical sizes with
+    gaps of 0-5ms."""
+    random.seed(47)
+    pool = []
+    for _ in range(count):
+        channel = random.randint(0, 15)
+        kind = random.random()
+        if kind < 0.35:
+            msg = NoteOn(
+                random.randint(20, 100), random.randint(1, 127), channel=channel
+            )
+        elif kind < 0.7:
+            msg = NoteOff(random.randint(20, 100), 0, channel=channel)
+        elif kind < 0.9:
+            msg = ControlChange(
+                random.randint(0, 127), random.randint(0, 127), channel=channel
+            )
+        else:
+            msg = TimingClock()
+        pool.append(
+            (
+                random.randint(0, 5000000),
+                TRACE_OUT if random.random() < 0.3 else TRACE_IN,
+                bytes(msg),
+            )
+        )
+    return pool
+
+
+def pickled_size(records):
+    """Bytes per record when storing parsed messages with pickle."""
+    objects = []
+    for (timestamp, direction, data) in records:
+        (msg, _, _) = MIDIMessage.from_message_bytes(bytearray(data), _ALL_CHANNELS)
+        objects.append((timestamp, direction, msg))
+    return len(pickle.dumps(objects)) / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=64, help="file size in MB")
+    parser.add_argument("--dir", default=None, help="directory for the file")
+    parser.add_argument("--keep", action="store_true", help="keep the file")
+    args = parser.parse_args()
+
+    pool = make_records(4096)
+    target = args.size * 1000000
+    (handle, filename) = tempfile.mkstemp(suffix=".mcap", dir=args.dir)
+    os.close(handle)
+    try:
+        start = time.perf_counter()
+        timestamp = 0
+        count = 0
+        with open(filename, "wb") as stream:
+            writer = CaptureWriter(stream, base_ns=0)
+            record = writer.record
+            while True:
+                for (gap, direction, data) in pool:
+                    timestamp += gap
+                    record(direction, data, len(data), timestamp)
+                count += len(pool)
+                if stream.tell() >= target:
+                    break
+            writer.close()
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(filename)
+        print("file {:.1f} MB, {} records".format(size / 1e6, count))
+        print("bytes per record      {:8.2f}".format(size / count))
+        print("pickled per record    {:8.2f}".format(pickled_size(pool)))
+        print(
+            "write {:8.1f} MB/s {:10.0f} records/s".format(
+                size / elapsed / 1e6, count / elapsed
+            )
+        )
+
+        with CaptureReader(filename) as reader:
+            start = time.perf_counter()
+            read = 0
+            for _ in reader.records():
+                read += 1
+            elapsed = time.perf_counter() - start
+            print(
+                "raw   {:8.1f} MB/s {:10.0f} records/s".format(
+                    size / elapsed / 1e6, read / elapsed
+                )
+            )
+
+            start = time.perf_counter()
+            read = 0
+            for _ in reader.messages(TRACE_IN):
+                read += 1
+            for _ in reader.messages(TRACE_OUT):
+                read += 1
+            elapsed = time.perf_counter() - start
+            print(
+                "parse {:8.1f} MB/s {:10.0f} msgs/s".format(
+                    size / elapsed / 1e6, read / elapsed
+                )
+            )
+    finally:
+        if args.keep:
+            print("kept", filename)
+        else:
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
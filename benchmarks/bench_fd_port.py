@@ -0,0 +1,117 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Read system calls per message and throughput of :meth:`MIDI.receive`
+from a pipe using :class:`adafruit_midi.fd_port.FdPort` and, for
+comparison, a simple wrapper which calls ``os.read`` for each ``read``.
+
+Messages are written to the pipe in batches which are then received until
+:meth:`MIDI.receive` returns None, so each batch costs at least one read
+which finds no data.
+
+Usage: python benchmarks/bench_fd_port.py [--messages N] [--batch N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+import adafruit_midi
+from adafruit_midi.fd_port import FdPort
+from adafruit_midi.note_on import NoteOn
+
+
+class OsReadPort:
+    """A port which makes one ``os.read`` system call per ``read``."""
+
+    def __init__(self, fd):
+        os.set_blocking(fd, False)
+        self._fd = fd
+        self.read_calls = 0
+        self.empty_reads = 0
+
+    def read(self, length):
+        self.read_calls += 1
+        try:
+            return os.read(self._fd, length)
+        except BlockingIOError:
+            self.empty_reads += 1
+            return b""
+
+
+def run(name, make_port, count, batch, in_buf_size):
+    (fd_read, fd_write) = os.pipe()
+    port = make_port(fd_read)
+    midi = adafruit_midi.MIDI(midi_in=port, in_buf_size=in_buf_size)
+    data = b"".join(
+        bytes(NoteOn(36 + idx % 48, 100, channel=0)) for idx in range(batch)
+    )
+    receive = midi.receive
+    received = 0
+    start = time.perf_counter()
+    for _ in range(count // batch):
+        os.write(fd_write, data)
+        while receive() is not None:
+            received += 1
+    elapsed = time.perf_counter() - start
+    os.close(fd_read)
+    os.close(fd_write)
+    print(
+        "{:28s} {:10.0f} msgs/s {:8.3f} reads/msg {:8.3f} with data/msg".format(
+            name,
+            received / elapsed,
+            port.read_calls / received,
+            (port.read_calls - port.empty_reads) / received,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    # A batch must fit in the pipe as the same thread writes and reads
+    batch = min(args.batch, 16000)
+    for in_buf_size in (30, 256):
+        run(
+            "os.read in_buf_size={}".format(in_buf_size),
+            OsReadPort,
+            args.messages,
+            batch,
+            in_buf_size,
+        )
+        run(
+            "FdPort in_buf_size={}".format(in_buf_size),
+            lambda fd: FdPort(fd, closefd=False),
+            args.messages,
+            batch,
+            in_buf_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
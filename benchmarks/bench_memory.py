@@ -0,0 +1,310 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Memory and import cost of the library on CPython, the equivalent of
+``examples/midi_memorycheck.py`` which needs ``gc.mem_free()`` on a board.
+
+Reported:
+
+  * bytes allocated by importing each module, measured with ``tracemalloc``
+    in its own interpreter after ``adafruit_midi`` itself so the cost
+    includes the module's dependencies, the ``adafruit_midi`` row includes
+    :mod:`adafruit_midi.midi_message`. The total imports every module in
+    one interpreter as shared dependencies are counted once.
+  * import time for each module from ``python -X importtime`` in the same
+    interpreter, Python 3.7 or later.
+  * bytes per :class:`MIDI` instance.
+  * bytes retained per received message object of each type.
+  * peak bytes allocated while receiving or sending one message.
+
+Usage: python benchmarks/bench_memory.py [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_PACKAGE = os.path.join(_ROOT, "adafruit_midi")
+
+# Every message module, those of examples/midi_memorycheck.py first,
+# any other modules follow
+_MESSAGE_MODULES = (
+    "channel_pressure",
+    "control_change",
+    "note_off",
+    "note_on",
+    "pitch_bend",
+    "polyphonic_key_pressure",
+    "program_change",
+    "start",
+    "stop",
+    "system_exclusive",
+    "timing_clock",
+    "active_sensing",
+    "midi_continue",
+    "mtc_quarter_frame",
+    "song_position_pointer",
+    "song_select",
+    "system_reset",
+    "tune_request",
+)
+# Imported by adafruit_midi so measured as part of it
+_PACKAGE_MODULES = ("midi_message",)
+
+_INSTANCES = 1000
+
+
+def module_names():
+    others = sorted(
+        name[:-3]
+        for name in os.listdir(_PACKAGE)
+        if name.endswith(".py")
+        and name != "__init__.py"
+        and name[:-3] not in _MESSAGE_MODULES + _PACKAGE_MODULES
+    )
+    return ["adafruit_midi"] + [
+        "adafruit_midi." + name for name in _MESSAGE_MODULES + tuple(others)
+    ]
+
+
+def _child_import(names):
+    """The bytes allocated by importing ``names`` after ``adafruit_midi``,
+    or None if one fails to import, e.g. a module needing a newer Python."""
+    # pylint: disable=import-outside-toplevel
+    import gc
+    import tracemalloc
+
+    tracemalloc.start()
+    if names != ["adafruit_midi"]:
+        import adafruit_midi  # pylint: disable=unused-import
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    for name in names:
+        try:
+            __import__(name)
+        except (ImportError, AttributeError):
+            if len(names) == 1:
+                return None
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before
+
+
+class _Port:
+    """A minimal loopback port."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def read(self, length):
+        chunk = bytes(self.data[:length])
+        del self.data[:length]
+        return chunk
+
+    def write(self, buffer, length):
+        self.data.extend(buffer[:length])
+
+
+def _peak(func):
+    """The peak bytes allocated while calling func."""
+    # pylint: disable=import-outside-toplevel
+    import tracemalloc
+
+    tracemalloc.stop()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def _child_objects():
+    # pylint: disable=import-outside-toplevel,too-many-locals
+    import gc
+    import tracemalloc
+
+    for name in module_names():
+        try:
+            __import__(name)
+        except (ImportError, AttributeError):
+            pass
+    import adafruit_midi
+    from adafruit_midi.channel_pressure import ChannelPressure
+    from adafruit_midi.control_change import ControlChange
+    from adafruit_midi.note_off import NoteOff
+    from adafruit_midi.note_on import NoteOn
+    from adafruit_midi.pitch_bend import PitchBend
+    from adafruit_midi.program_change import ProgramChange
+    from adafruit_midi.system_exclusive import SystemExclusive
+    from adafruit_midi.timing_clock import TimingClock
+
+    results = {}
+
+    def per_object(key, factory):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [factory() for _ in range(_INSTANCES)]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        # Remove the list itself, one pointer per entry
+        results[key] = round(size / len(kept)) - 8
+        del kept
+
+    port = _Port()
+    per_object("MIDI instance", lambda: adafruit_midi.MIDI(midi_in=port, midi_out=port))
+
+    samples = (
+        ("NoteOn", NoteOn(60, 100, channel=0)),
+        ("NoteOff", NoteOff(60, 0, channel=0)),
+        ("ControlChange", ControlChange(1, 64, channel=0)),
+        ("PitchBend", PitchBend(8192, channel=0)),
+        ("ProgramChange", ProgramChange(1, channel=0)),
+        ("ChannelPressure", ChannelPressure(64, channel=0)),
+        ("TimingClock", TimingClock()),
+        ("SystemExclusive 16", SystemExclusive([0x7D], bytes(range(12)))),
+    )
+    all_channels = tuple(range(16))
+    for (name, msg) in samples:
+        data = bytes(msg)
+        per_object(
+            "received " + name,
+            lambda d=data: adafruit_midi.MIDIMessage.from_message_bytes(
+                d, all_channels
+            )[0],
+        )
+
+    midi = adafruit_midi.MIDI(midi_in=port, midi_out=port, in_channel=None)
+    note = NoteOn(60, 100)
+    midi.send(note)
+    midi.receive()
+    results["peak send NoteOn"] = _peak(lambda: midi.send(note))
+    results["peak receive NoteOn"] = _peak(midi.receive)
+    chord = [NoteOn(60, 100), NoteOn(64, 100), NoteOn(67, 100)]
+    results["peak send list of 3"] = _peak(lambda: midi.send(chord))
+    return results
+
+
+def _import_time(stderr, module):
+    """The (self, cumulative) microseconds for ``module`` from the output
+    of ``python -X importtime``, or None if it is not there."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if fields[2].strip() == module:
+            try:
+                return (int(fields[0]), int(fields[1]))
+            except ValueError:
+                return None
+    return None
+
+
+def _run_child(mode, *names, importtime=False):
+    """Run this script in a new interpreter, returns the decoded JSON it
+    prints and its standard error."""
+    options = ["-X", "importtime"] if importtime else []
+    proc = subprocess.run(
+        [sys.executable]
+        + options
+        + [os.path.abspath(__file__), "--child", mode]
+        + list(names),
+        cwd=_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return (json.loads(proc.stdout), proc.stderr)
+
+
+def import_costs():
+    """Import each module in its own interpreter, returns a ``dict`` of
+    module to bytes, a ``dict`` of module to (self, cumulative) import
+    microseconds or None if not supported and the bytes for every module
+    imported together."""
+    importtime = sys.version_info >= (3, 7)
+    sizes = {}
+    times = {} if importtime else None
+    for name in module_names():
+        (sizes[name], stderr) = _run_child("import", name, importtime=importtime)
+        if importtime:
+            times[name] = _import_time(stderr, name)
+    (total, _) = _run_child("import", *module_names())
+    return (sizes, times, total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="adafruit_midi memory use")
+    parser.add_argument("--json", help="also write the results to a JSON file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("names", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, _ROOT)
+        if args.child == "import":
+            print(json.dumps(_child_import(args.names)))
+        else:
+            print(json.dumps(_child_objects()))
+        return
+
+    (imports, times, total) = import_costs()
+    (objects, _) = _run_child("objects")
+
+    print(
+        "{:44s} {:>8s} {:>10s} {:>10s}".format("module", "bytes", "self us", "cumul us")
+    )
+    for name, size in imports.items():
+        (self_us, cumulative_us) = (times or {}).get(name) or (None, None)
+        print(
+            "{:44s} {:>8} {:>10} {:>10}".format(
+                name,
+                "failed" if size is None else size,
+                "-" if self_us is None else self_us,
+                "-" if cumulative_us is None else cumulative_us,
+            )
+        )
+    print("{:44s} {:8d}".format("total", total))
+    print()
+    for name, size in objects.items():
+        print("{:44s} {:8d}".format(name, size))
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(
+                {
+                    "imports": imports,
+                    "import_times": times,
+                    "import_total": total,
+                    "objects": objects,
+                },
+                json_file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Throughput of :meth:`MIDI.receive` for a range of streams, :meth:`MIDI.send`
+for single messages and lists and send then receive over a loopback, using
+the mocked ports from ``tests/test_MIDI_unittests.py``. The mocks' own cost
+is included but is the same from run to run so comparisons are fair.
+
+Each benchmark is run several times and the best rate is reported.
+Results can be saved as a JSON baseline and later runs compared with it,
+the exit status is 1 if any benchmark is slower than the baseline by more
+than the threshold.
+
+Usage: python benchmarks/bench_midi.py [--messages N] [--repeat N]
+       [--save FILE] [--compare FILE] [--threshold PERCENT] [--only NAME]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+)
+
+# pylint: disable=wrong-import-position,import-error
+from test_MIDI_unittests import MIDI_mocked_both_loopback, MIDI_mocked_receive
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_off import NoteOff
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.pitch_bend import PitchBend
+from adafruit_midi.system_exclusive import SystemExclusive
+from adafruit_midi.timing_clock import TimingClock
+from adafruit_midi.virtual_port import VirtualPort
+
+_ALL_CHANNELS = tuple(range(16))
+
+# Messages per mocked port, the mock copies its remaining data on each read
+_BATCH = 500
+
+
+def _note_stream(count):
+    out = []
+    for idx in range(count // 2):
+        note = 36 + idx % 48
+        out.append(bytes(NoteOn(note, 1 + idx % 127, channel=idx % 16)))
+        out.append(bytes(NoteOff(note, 0, channel=idx % 16)))
+    return out
+
+
+def _cc_stream(count):
+    return [
+        bytes(ControlChange(1 + idx % 8, idx % 128, channel=idx % 4))
+        for idx in range(count)
+    ]
+
+
+def _clock_stream(count):
+    return [bytes(TimingClock())] * count
+
+
+def _sysex_stream(count, size):
+    data = bytes(idx % 128 for idx in range(size - 3))
+    return [bytes(SystemExclusive([0x7D], data))] * count
+
+
+def _noise_stream(count):
+    # Notes with runs of stray data bytes between them as from line noise
+    out = []
+    for msg in _note_stream(count):
+        out.append(bytes(random.randint(0, 127) for _ in range(random.randint(0, 3))))
+        out.append(msg)
+    return out[1::2], out
+
+
+def _mixed_stream(count):
+    # Mostly notes and controllers with clock, pitch bend and some SysEx
+    out = []
+    sysex = bytes(SystemExclusive([0x7D], bytes(range(16))))
+    for idx in range(count):
+        kind = random.random()
+        channel = random.randint(0, 15)
+        if kind < 0.35:
+            msg = bytes(NoteOn(random.randint(36, 96), 100, channel=channel))
+        elif kind < 0.6:
+            msg = bytes(NoteOff(random.randint(36, 96), 0, channel=channel))
+        elif kind < 0.8:
+            msg = bytes(
+                ControlChange(random.randint(0, 127), idx % 128, channel=channel)
+            )
+        elif kind < 0.9:
+            msg = bytes(TimingClock())
+        elif kind < 0.98:
+            msg = bytes(PitchBend(random.randint(0, 16383), channel=channel))
+        else:
+            msg = sysex
+        out.append(msg)
+    return out
+
+
+def receive_streams(count):
+    """Return (name, list of message bytes, raw data per message, in_buf_size,
+    read_size)."""
+    random.seed(40)
+    # A SysEx split across reads is discarded by the parser so the large
+    # SysEx stream is read a whole number of messages at a time
+    streams = [
+        ("receive notes", _note_stream(count), None, 30, 64),
+        ("receive cc storm", _cc_stream(count), None, 30, 64),
+        ("receive clock", _clock_stream(count), None, 30, 64),
+        ("receive sysex 8", _sysex_stream(count, 8), None, 30, 64),
+        ("receive sysex 24", _sysex_stream(count, 24), None, 30, 64),
+        ("receive sysex 256", _sysex_stream(count // 8, 256), None, 512, 512),
+        ("receive mixed", _mixed_stream(count), None, 30, 64),
+    ]
+    (messages, raw) = _noise_stream(count)
+    streams.append(("receive noise", messages, raw, 30, 64))
+    return streams
+
+
+def bench_receive(messages, raw, in_buf_size, read_size):
+    """Receive all the messages in batches, returns (messages, seconds)."""
+    if raw is None:
+        raw = messages
+    per_msg = len(raw) // len(messages)
+    batches = []
+    for idx in range(0, len(raw), _BATCH * per_msg):
+        data = b"".join(raw[idx : idx + _BATCH * per_msg])
+        batches.append((data, len(data) // read_size + 1))
+    received = 0
+    elapsed = 0.0
+    for (data, reads) in batches:
+        midi = MIDI_mocked_receive(0, data, [read_size] * reads)
+        midi.in_channel = None  # all channels
+        midi._in_buf_size = in_buf_size  # pylint: disable=protected-access
+        receive = midi.receive
+        start = time.perf_counter()
+        idle = 0
+        while idle < 2:
+            if receive() is None:
+                idle += 1
+            else:
+                idle = 0
+                received += 1
+        elapsed += time.perf_counter() - start
+    return (received, elapsed)
+
+
+def _send_midi(count):
+    # Large enough for every message so none are dropped
+    return adafruit_midi.MIDI(midi_out=VirtualPort(count * 4), out_channel=0)
+
+
+def bench_send_single(count):
+    midi = _send_midi(count)
+    msgs = [NoteOn(36 + idx % 48, 100) for idx in range(count)]
+    send = midi.send
+    start = time.perf_counter()
+    for msg in msgs:
+        send(msg)
+    return (count, time.perf_counter() - start)
+
+
+def bench_send_list(count):
+    midi = _send_midi(count)
+    chord = [NoteOn(60, 100), NoteOn(64, 100), NoteOn(67, 100), ControlChange(1, 2)]
+    send = midi.send
+    start = time.perf_counter()
+    for idx in range(count // len(chord)):
+        send(chord, idx % 16)
+    return (count // len(chord) * len(chord), time.perf_counter() - start)
+
+
+def bench_loopback(count):
+    midi = MIDI_mocked_both_loopback(_ALL_CHANNELS, 0)
+    msgs = [NoteOn(36 + idx % 48, 100) for idx in range(count)]
+    send = midi.send
+    receive = midi.receive
+    received = 0
+    start = time.perf_counter()
+    for msg in msgs:
+        send(msg)
+        if receive() is not None:
+            received += 1
+    return (received, time.perf_counter() - start)
+
+
+def run(count, repeat, only=None):
+    """Run the benchmarks, returns a ``dict`` of name to messages/s."""
+    benchmarks = []
+    for (name, messages, raw, in_buf_size, read_size) in receive_streams(count):
+        benchmarks.append(
+            (
+                name,
+                lambda m=messages, r=raw, b=in_buf_size, s=read_size: bench_receive(
+                    m, r, b, s
+                ),
+            )
+        )
+    benchmarks.append(("send single", lambda: bench_send_single(count)))
+    benchmarks.append(("send list", lambda: bench_send_list(count)))
+    benchmarks.append(("loopback", lambda: bench_loopback(count)))
+
+    results = {}
+    for name, func in benchmarks:
+        if only and only not in name:
+            continue
+        best = 0.0
+        for _ in range(repeat):
+            (done, elapsed) = func()
+            best = max(best, done / elapsed)
+        results[name] = best
+        print("{:20s} {:10.0f} msgs/s".format(name, best))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each result against the baseline, returns the number of
+    regressions larger than ``threshold`` percent."""
+    regressions = 0
+    print()
+    print("{:20s} {:>10s} {:>10s} {:>8s}".format("", "baseline", "now", "change"))
+    for name, rate in results.items():
+        base = baseline["results"].get(name)
+        if not base:
+            print("{:20s} {:>10s} {:10.0f}".format(name, "-", rate))
+            continue
+        change = (rate - base) * 100 / base
+        flag = ""
+        if change < -threshold:
+            flag = " REGRESSION"
+            regressions += 1
+        print(
+            "{:20s} {:10.0f} {:10.0f} {:+7.1f}%{}".format(
+                name, base, rate, change, flag
+            )
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="adafruit_midi benchmarks")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="save results as a JSON baseline")
+    parser.add_argument("--compare", help="compare with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=15.0)
+    parser.add_argument("--only", help="run benchmarks containing this text")
+    args = parser.parse_args()
+
+    results = run(args.messages, args.repeat, args.only)
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(
+                {
+                    "python": platform.python_implementation()
+                    + " "
+                    + platform.python_version(),
+                    "machine": platform.machine(),
+                    "messages": args.messages,
+                    "results": results,
+                },
+                baseline_file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
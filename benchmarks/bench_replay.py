@@ -0,0 +1,96 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Timing accuracy and throughput of :class:`adafruit_midi.replay.Replay`
+writing to a port which discards the data, at the original speed, at
+higher speeds and as fast as possible. A capture file can be given to
+replay instead of the generated one second of 1ms spaced messages.
+
+Usage: python benchmarks/bench_replay.py [--capture FILE] [--speeds 1,10,...]
+"""
+
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+import adafruit_midi
+from adafruit_midi.capture import CaptureReader, CaptureWriter, TRACE_IN
+from adafruit_midi.replay import Replay
+
+
+class NullPort:
+    """An output port which discards everything."""
+
+    def write(self, buf, length):
+        pass
+
+
+def generated_capture():
+    stream = io.BytesIO()
+    writer = CaptureWriter(stream, base_ns=0)
+    for idx in range(1000):
+        writer.record(TRACE_IN, b"\x90\x3c\x40", 3, idx * 1000000)
+    writer.close()
+    return CaptureReader(stream.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--capture", default=None, help="a capture file")
+    parser.add_argument(
+        "--speeds", default="1,10,100,max", help="comma separated, max for fastest"
+    )
+    args = parser.parse_args()
+
+    print(
+        "{:>6s} {:>10s} {:>12s} {:>10s} {:>10s} {:>10s}".format(
+            "speed", "records", "records/s", "p50 us", "p99 us", "max us"
+        )
+    )
+    for speed_text in args.speeds.split(","):
+        speed = None if speed_text == "max" else float(speed_text)
+        if args.capture is None:
+            reader = generated_capture()
+        else:
+            reader = CaptureReader(args.capture)
+        midi = adafruit_midi.MIDI(midi_out=NullPort())
+        report = Replay(reader, midi, speed=speed).run()
+        reader.close()
+        lateness = report["lateness_ns"]
+        print(
+            "{:>6s} {:10d} {:12.0f} {:>10s} {:>10s} {:10.1f}".format(
+                speed_text,
+                report["records"],
+                report["records_per_second"],
+                "-" if lateness[50] is None else "{:.1f}".format(lateness[50] / 1e3),
+                "-" if lateness[99] is None else "{:.1f}".format(lateness[99] / 1e3),
+                report["max_lateness_ns"] / 1e3,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
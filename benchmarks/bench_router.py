@@ -0,0 +1,130 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Throughput and latency of :class:`Router` with 16 pipe inputs and 16
+outputs. Every input is routed to every output with a per-output channel
+filter, 256 routes in total.
+
+Usage: python benchmarks/bench_router.py [messages_per_input]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+import adafruit_midi
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.router import Router
+
+PORTS = 16
+
+
+class PipeIn:
+    def __init__(self, fd):
+        os.set_blocking(fd, False)
+        self._fd = fd
+
+    def fileno(self):
+        return self._fd
+
+    def read(self, length):
+        try:
+            return os.read(self._fd, length)
+        except BlockingIOError:
+            return b""
+
+
+class CountingOut:
+    def __init__(self):
+        self.bytes = 0
+        self.last_write = 0.0
+
+    def write(self, buf, length):
+        self.bytes += length
+        self.last_write = time.perf_counter()
+
+
+def main():
+    per_input = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(16)
+    pipes = [os.pipe() for _ in range(PORTS)]
+    inputs = [adafruit_midi.MIDI(midi_in=PipeIn(fd_in)) for fd_in, _ in pipes]
+    out_ports = [CountingOut() for _ in range(PORTS)]
+    outputs = [adafruit_midi.MIDI(midi_out=port) for port in out_ports]
+    router = Router(read_size=4096)
+    for midi_in in inputs:
+        for channel, midi_out in enumerate(outputs):
+            router.add_route(midi_in, midi_out, channels=channel)
+    router.compile()
+
+    # Throughput, written in chunks which fit in a pipe buffer
+    chunk = 1000
+    data = [
+        b"".join(
+            bytes(NoteOn(random.randint(0, 127), 64, channel=random.randint(0, 15)))
+            for _ in range(chunk)
+        )
+        for _ in range(PORTS)
+    ]
+    total = 0
+    elapsed = 0.0
+    for _ in range(per_input // chunk):
+        for (_, fd_out), chunk_data in zip(pipes, data):
+            os.write(fd_out, chunk_data)
+        start = time.perf_counter()
+        routed = 0
+        while routed < chunk * PORTS:
+            routed += router.pump(None)
+        elapsed += time.perf_counter() - start
+        total += routed
+    print(
+        "throughput {:d}x{:d}: {:d} msgs in {:.3f}s, {:.0f} msgs/s".format(
+            PORTS, PORTS, total, elapsed, total / elapsed
+        )
+    )
+
+    # Latency of a single message from write to output
+    latencies = []
+    for _ in range(2000):
+        idx = random.randrange(PORTS)
+        channel = random.randrange(PORTS)
+        start = time.perf_counter()
+        os.write(pipes[idx][1], bytes(NoteOn(60, 64, channel=channel)))
+        router.pump(None)
+        latencies.append(out_ports[channel].last_write - start)
+    latencies.sort()
+    print(
+        "latency: p50 {:.1f}us p99 {:.1f}us max {:.1f}us".format(
+            latencies[len(latencies) // 2] * 1e6,
+            latencies[len(latencies) * 99 // 100] * 1e6,
+            latencies[-1] * 1e6,
+        )
+    )
+    router.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Throughput of each :mod:`adafruit_midi.transform` stage, a composed
+pipeline and, for comparison, the same transposition done by parsing to
+message objects and constructing new :class:`NoteOn` objects.
+
+Usage: python benchmarks/bench_transform.py [messages]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.midi_message import MIDIMessage
+from adafruit_midi.note_off import NoteOff
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.transform import (
+    ChannelRemap,
+    ControlRemap,
+    Pipeline,
+    Transpose,
+    VelocityCurve,
+)
+
+_ALL_CHANNELS = tuple(range(16))
+
+
+def make_stream(count):
+    random.seed(31)
+    out = bytearray()
+    for _ in range(count):
+        channel = random.randint(0, 15)
+        kind = random.random()
+        if kind < 0.4:
+            msg = NoteOn(random.randint(20, 100), random.randint(1, 127))
+        elif kind < 0.8:
+            msg = NoteOff(random.randint(20, 100), 0)
+        else:
+            msg = ControlChange(random.randint(0, 127), random.randint(0, 127))
+        msg.channel = channel
+        out.extend(bytes(msg))
+    return bytes(out)
+
+
+def object_transpose(data, semitones):
+    out = bytearray()
+    buf = bytearray(data)
+    while buf:
+        (msg, endplusone, _) = MIDIMessage.from_message_bytes(buf, _ALL_CHANNELS)
+        del buf[:endplusone]
+        if msg is None:
+            break
+        if isinstance(msg, NoteOn):
+            msg = NoteOn(msg.note + semitones, msg.velocity, channel=msg.channel)
+        elif isinstance(msg, NoteOff):
+            msg = NoteOff(msg.note + semitones, msg.velocity, channel=msg.channel)
+        out.extend(bytes(msg))
+    return out
+
+
+def timed(name, func, data, count):
+    start = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - start
+    print("{:24s} {:10.0f} msgs/s".format(name, count / elapsed))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = make_stream(count)
+    stages = [
+        ("empty", Pipeline()),
+        ("transpose", Pipeline(Transpose(5))),
+        ("channel remap", Pipeline(ChannelRemap({c: 15 - c for c in range(16)}))),
+        ("velocity curve", Pipeline(VelocityCurve(lambda v: v * v // 127))),
+        ("control remap", Pipeline(ControlRemap({1: 2, 7: 11, 64: None}))),
+        (
+            "all four composed",
+            Pipeline(
+                Transpose(5),
+                ChannelRemap({c: 15 - c for c in range(16)}),
+                VelocityCurve(lambda v: v * v // 127),
+                ControlRemap({1: 2, 7: 11, 64: None}),
+            ),
+        ),
+    ]
+    for name, pipeline in stages:
+        timed(name, pipeline.process, data, count)
+    timed("objects: transpose", lambda d: object_transpose(d, 5), data, count)
+
+
+if __name__ == "__main__":
+    main()
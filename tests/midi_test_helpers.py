@@ -0,0 +1,65 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Test doubles shared by the unit tests."""
+
+from unittest.mock import Mock
+
+
+class FakeClock:
+    """A nanosecond clock for injecting into the timed classes, it returns
+    ``now`` which a test can set directly, after adding ``step`` to it on
+    every call."""
+
+    def __init__(self, now=0, step=0):
+        self.now = now
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def collecting_port(written):
+    """A mocked output port which stores what is written in ``written``,
+    a ``bytearray`` is extended and a ``list`` has the bytes of each write
+    appended."""
+    port = Mock()
+    if isinstance(written, list):
+        port.write = lambda buf, n: written.append(bytes(buf[:n]))
+    else:
+        port.write = lambda buf, n: written.extend(buf[:n])
+    return port
+
+
+def feeding_port(data):
+    """A mocked input port whose reads take bytes from the start of the
+    ``bytearray`` ``data``, which a test can extend at any time."""
+
+    def read(length):
+        chunk = bytes(data[:length])
+        del data[:length]
+        return chunk
+
+    port = Mock()
+    port.read = read
+    return port
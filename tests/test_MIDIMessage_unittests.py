@@ -51,6 +51,12 @@ from adafruit_midi.start import Start
 from adafruit_midi.stop import Stop
 from adafruit_midi.system_exclusive import SystemExclusive
 from adafruit_midi.timing_clock import TimingClock
+from adafruit_midi.active_sensing import ActiveSensing
+from adafruit_midi.midi_message import STATUS_LENGTH
+from adafruit_midi.mtc_quarter_frame import MtcQuarterFrame
+from adafruit_midi.song_select import SongSelect
+from adafruit_midi.system_reset import SystemReset
+from adafruit_midi.tune_request import TuneRequest
 
 
 class Test_MIDIMessage_from_message_byte_tests(unittest.TestCase):
@@ -425,5 +431,162 @@ class Test_MIDIMessage_NoteOff_constructor(unittest.TestCase):
             NoteOff("CC4", 0x7F)
 
 
+class Test_MIDIMessage_layout(unittest.TestCase):
+    def test_no_instance_dict(self):
+        msgs = [
+            ChannelPressure(1),
+            ControlChange(1, 2),
+            NoteOff(60),
+            NoteOn(60),
+            PitchBend(8192),
+            PolyphonicKeyPressure(60, 1),
+            ProgramChange(1),
+            Start(),
+            Stop(),
+            SystemExclusive([0x7D], [1]),
+            TimingClock(),
+            adafruit_midi.midi_message.MIDIUnknownEvent(0xF4),
+            adafruit_midi.midi_message.MIDIBadEvent(b"\x90", ValueError()),
+        ]
+        for msg in msgs:
+            self.assertFalse(hasattr(msg, "__dict__"), type(msg).__name__)
+        with self.assertRaises(AttributeError):
+            msgs[3].pitch = 1
+
+    def test_channel(self):
+        msg = NoteOn(60, channel=3)
+        msg.channel = 15
+        self.assertEqual(msg.channel, 15)
+        with self.assertRaises(ValueError):
+            msg.channel = 16
+        with self.assertRaises(ValueError):
+            NoteOn(60, channel=-1)
+
+
+class Test_MIDIMessage_lazy_import(unittest.TestCase):
+    # The test process has imported every message type so this is
+    # checked in a new interpreter
+    CODE = """
+import sys
+from adafruit_midi.midi_message import MIDIMessage
+MIDIMessage.lazy_import = %s
+buf = bytes([0x93, 60, 100, 0xFA, 0xF4])
+while buf:
+    (msg, end, _) = MIDIMessage.from_message_bytes(buf, tuple(range(16)))
+    print(type(msg).__name__, msg.channel)
+    buf = buf[end:]
+print("adafruit_midi.note_on" in sys.modules, "adafruit_midi.note_off" in sys.modules)
+"""
+
+    UNKNOWN_CODE = """
+from adafruit_midi.midi_message import MIDIMessage
+MIDIMessage.lazy_import = %s
+for data in (b"\\x93\\x3c\\x40\\x01", b"\\xf2\\x01\\x02", b"\\x93\\x3c\\xf8", b"\\xc1", b"\\xf4\\x01"):
+    (msg, end, skipped) = MIDIMessage.from_message_bytes(data, tuple(range(16)))
+    print(type(msg).__name__, end, skipped)
+"""
+
+    MISSING_CODE = """
+import sys
+from adafruit_midi.midi_message import MIDIMessage
+MIDIMessage.lazy_import = %s
+sys.modules["adafruit_midi.note_on"] = None  # as if left out of the build
+for data in (b"\\x93\\x3c\\x40", b"\\x93\\x3c\\x40", b"\\x83\\x3c\\x40"):
+    (msg, end, skipped) = MIDIMessage.from_message_bytes(data, tuple(range(16)))
+    print(type(msg).__name__, end, skipped)
+"""
+
+    def run_code(self, lazy, code=None):
+        import subprocess  # pylint: disable=import-outside-toplevel
+
+        return subprocess.run(
+            [sys.executable, "-c", (code or self.CODE) % lazy],
+            cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stdout.splitlines()
+
+    def test_lazy(self):
+        self.assertEqual(
+            self.run_code(True),
+            ["NoteOn 3", "Start None", "MIDIUnknownEvent None", "True False"],
+        )
+
+    def test_not_lazy(self):
+        self.assertEqual(
+            self.run_code(False),
+            [
+                "MIDIUnknownEvent None",
+                "MIDIUnknownEvent None",
+                "MIDIUnknownEvent None",
+                "False False",
+            ],
+        )
+
+    def test_unknown_length(self):
+        # Unknown messages are skipped by their standard length
+        self.assertEqual(
+            self.run_code(False, self.UNKNOWN_CODE),
+            [
+                "MIDIUnknownEvent 3 0",
+                "MIDIUnknownEvent 3 0",
+                "MIDIUnknownEvent 2 0",
+                "NoneType 0 0",
+                "MIDIUnknownEvent 1 0",
+            ],
+        )
+
+    def test_missing_module(self):
+        # A module which cannot be imported leaves its messages unknown
+        self.assertEqual(
+            self.run_code(True, self.MISSING_CODE),
+            ["MIDIUnknownEvent 3 0", "MIDIUnknownEvent 3 0", "NoteOff 3 0"],
+        )
+
+
+class Test_MIDIMessage_system(unittest.TestCase):
+    def test_status_length(self):
+        self.assertEqual(STATUS_LENGTH[0x7F], 0)
+        self.assertEqual(STATUS_LENGTH[0x80], 3)
+        self.assertEqual(STATUS_LENGTH[0xBF], 3)
+        self.assertEqual(STATUS_LENGTH[0xC5], 2)
+        self.assertEqual(STATUS_LENGTH[0xDF], 2)
+        self.assertEqual(STATUS_LENGTH[0xE0], 3)
+        self.assertEqual(STATUS_LENGTH[0xF0], 0)
+        self.assertEqual(
+            [STATUS_LENGTH[status] for status in (0xF1, 0xF2, 0xF3, 0xF6, 0xFE)],
+            [2, 3, 2, 1, 1],
+        )
+
+    def test_round_trip(self):
+        msgs = (
+            (MtcQuarterFrame(5, 0xA), b"\xf1\x5a"),
+            (SongSelect(17), b"\xf3\x11"),
+            (TuneRequest(), b"\xf6"),
+            (ActiveSensing(), b"\xfe"),
+            (SystemReset(), b"\xff"),
+        )
+        for (msg, data) in msgs:
+            self.assertEqual(bytes(msg), data)
+            (parsed, end, skipped) = adafruit_midi.MIDIMessage.from_message_bytes(
+                data, 0
+            )
+            self.assertIsInstance(parsed, type(msg))
+            self.assertIsNone(parsed.channel)
+            self.assertEqual(end, len(data))
+            self.assertEqual(skipped, 0)
+        parsed = adafruit_midi.MIDIMessage.from_message_bytes(b"\xf1\x7f", 0)[0]
+        self.assertEqual((parsed.message_type, parsed.value), (7, 15))
+
+    def test_range(self):
+        with self.assertRaises(ValueError):
+            SongSelect(128)
+        with self.assertRaises(ValueError):
+            MtcQuarterFrame(8, 0)
+        with self.assertRaises(ValueError):
+            MtcQuarterFrame(0, 16)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=verbose)
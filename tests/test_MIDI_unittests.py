@@ -44,6 +44,7 @@ from adafruit_midi.note_on import NoteOn
 from adafruit_midi.pitch_bend import PitchBend
 from adafruit_midi.polyphonic_key_pressure import PolyphonicKeyPressure
 from adafruit_midi.program_change import ProgramChange
+from adafruit_midi.song_select import SongSelect
 from adafruit_midi.start import Start
 from adafruit_midi.stop import Stop
 from adafruit_midi.system_exclusive import SystemExclusive
@@ -190,14 +191,19 @@ class Test_MIDI(unittest.TestCase):
         c = 0
         # From an M-Audio AXIOM controller
         raw_data = bytes(
-            [0b11110011, 0x10]  # Song Select (not yet implemented)
+            [0b11110011, 0x10]  # Song Select
             + [0b11110011, 0x20]
-            + [0b11110100]
-            + [0b11110101]
+            + [0b11110100]  # undefined
+            + [0b11110101]  # undefined
         ) + bytes(NoteOn("C5", 0x7F, channel=c))
         m = MIDI_mocked_receive(c, raw_data, [2, 2, 1, 1, 3])
 
-        for unused in range(4):  # pylint: disable=unused-variable
+        for song in (0x10, 0x20):
+            msg = m.receive()
+            self.assertIsInstance(msg, SongSelect)
+            self.assertEqual(msg.song, song)
+
+        for unused in range(2):  # pylint: disable=unused-variable
             msg = m.receive()
             self.assertIsInstance(msg, adafruit_midi.midi_message.MIDIUnknownEvent)
             self.assertIsNone(msg.channel)
@@ -0,0 +1,105 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import asyncio
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from adafruit_midi.async_midi import AsyncMIDI
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_off import NoteOff
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.system_exclusive import SystemExclusive
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class Test_AsyncMIDI(unittest.TestCase):
+    def test_receive_and_iterate(self):
+        async def body():
+            reader = asyncio.StreamReader()
+            midi = AsyncMIDI(reader, in_channel=2)
+            reader.feed_data(bytes(NoteOn(60, channel=2)) + b"\x91\x40")
+            msg = await midi.receive()
+            self.assertIsInstance(msg, NoteOn)
+            self.assertEqual(msg.note, 60)
+            # rest of a message for another channel and a split SysEx
+            reader.feed_data(b"\x7f" + bytes(ControlChange(1, 2, channel=2))[:2])
+            reader.feed_data(b"\x03" + bytes(SystemExclusive([0x7D], [1, 2])))
+            reader.feed_eof()
+            received = [m async for m in midi]
+            self.assertEqual(len(received), 2)
+            self.assertIsInstance(received[0], ControlChange)
+            self.assertEqual(received[0].value, 3)
+            self.assertEqual(received[1].data, b"\x01\x02")
+            self.assertIsNone(await midi.receive())
+
+        run(body())
+
+    def test_skipped_before_partial_message(self):
+        class ChunkReader:
+            def __init__(self, chunks):
+                self.chunks = list(chunks)
+
+            async def read(self, length):
+                return self.chunks.pop(0) if self.chunks else b""
+
+        async def body():
+            reader = ChunkReader([b"\x01\x02\x90", b"\x3c", b"\x40"])
+            midi = AsyncMIDI(reader)
+            msg = await midi.receive()
+            self.assertIsInstance(msg, NoteOn)
+            self.assertEqual(midi.skipped_bytes, 2)
+
+        run(body())
+
+    def test_pipe_loopback(self):
+        async def body():
+            fd_in, fd_out = os.pipe()
+            midi = await AsyncMIDI.open_fd(fd_in, fd_out, out_channel=5)
+            await midi.send([NoteOn(61, 100), NoteOff(61, 0)])
+            midi.send_nowait(NoteOn(62, 101), channel=6)
+            await midi.drain()
+            msgs = [await midi.receive() for _ in range(3)]
+            self.assertEqual([m.note for m in msgs], [61, 61, 62])
+            self.assertEqual([m.channel for m in msgs], [5, 5, 6])
+            midi.close()
+
+        run(body())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,156 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import io
+import os
+import tempfile
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.capture import CaptureReader, CaptureWriter, TRACE_IN, TRACE_OUT
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.system_exclusive import SystemExclusive
+from midi_test_helpers import FakeClock
+
+
+RECORDS = [
+    (1000, TRACE_IN, b"\x90\x3c\x40"),
+    (2000, TRACE_OUT, b"\xb0\x07"),
+    (3000, TRACE_IN, b"\x64"),
+    (3000, TRACE_OUT, b"\x7f"),
+    (500000000, TRACE_IN, b"\xf0\x7d" + bytes(range(100)) + b"\xf7"),
+    (500001000, TRACE_IN, b""),
+]
+
+
+class Test_Capture(unittest.TestCase):
+    def write(self, records, chunk_size=65536, close=True):
+        stream = io.BytesIO()
+        writer = CaptureWriter(stream, chunk_size=chunk_size, base_ns=0)
+        for (timestamp, direction, data) in records:
+            writer.record(direction, data, len(data), timestamp)
+        if close:
+            writer.close()
+        else:
+            writer.flush()
+        return stream.getvalue()
+
+    def test_round_trip(self):
+        for chunk_size in (1, 4, 65536):
+            data = self.write(RECORDS, chunk_size)
+            reader = CaptureReader(data)
+            self.assertTrue(reader.complete)
+            self.assertEqual(len(reader), len(RECORDS))
+            self.assertEqual(list(reader.records()), RECORDS)
+
+    def test_size(self):
+        # Two bytes of overhead per record for short gaps and messages
+        records = [(idx * 100000, TRACE_IN, b"\x90\x3c\x40") for idx in range(1000)]
+        data = self.write(records)
+        self.assertLess(len(data), 1000 * 5 + 100)
+
+    def test_unclosed(self):
+        data = self.write(RECORDS, chunk_size=4, close=False)
+        reader = CaptureReader(data)
+        self.assertFalse(reader.complete)
+        self.assertEqual(list(reader.records()), RECORDS)
+        # A truncated last chunk is ignored
+        reader = CaptureReader(data[:-1])
+        self.assertEqual(list(reader.records()), RECORDS[:-1])
+
+    def test_not_capture(self):
+        with self.assertRaises(ValueError):
+            CaptureReader(b"MTRC" + bytes(20))
+        with self.assertRaises(ValueError):
+            CaptureReader(b"")
+
+    def test_start_ns(self):
+        records = [(idx * 1000000, TRACE_IN, b"\xf8") for idx in range(100)]
+        reader = CaptureReader(self.write(records, chunk_size=16))
+        self.assertGreater(len(reader.chunks), 5)
+        self.assertEqual(list(reader.records(start_ns=42500000)), records[43:])
+
+    def test_messages(self):
+        reader = CaptureReader(self.write(RECORDS))
+        messages = list(reader.messages())
+        self.assertEqual([m[0] for m in messages], [1000, 500000000])
+        self.assertIsInstance(messages[0][1], NoteOn)
+        self.assertIsInstance(messages[1][1], SystemExclusive)
+        self.assertEqual(messages[1][1].data, bytes(range(100)))
+        # The output Control Change is split across two records
+        messages = list(reader.messages(TRACE_OUT))
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0][0], 3000)
+        self.assertEqual(messages[0][1].control, 7)
+        self.assertEqual(messages[0][1].value, 127)
+        self.assertEqual(list(reader.messages(TRACE_OUT, in_channel=1)), [])
+
+    def test_midi_file(self):
+        in_data = bytearray(b"\x90\x3c\x40")
+        out_data = bytearray()
+
+        def read(length):
+            chunk = bytes(in_data[:length])
+            del in_data[:length]
+            return chunk
+
+        def write(buffer, length):
+            out_data.extend(buffer[:length])
+
+        (handle, filename) = tempfile.mkstemp(suffix=".mcap")
+        os.close(handle)
+        try:
+            with open(filename, "wb") as stream:
+                capture = CaptureWriter(stream, clock=FakeClock(step=1000))
+                midi = adafruit_midi.MIDI(
+                    midi_in=Mock(read=read),
+                    midi_out=Mock(write=write),
+                    trace=capture,
+                )
+                self.assertIsInstance(midi.receive(), NoteOn)
+                midi.send(ControlChange(7, 100))
+                capture.close()
+            with CaptureReader(filename) as reader:
+                records = list(reader.records())
+                self.assertEqual(
+                    records,
+                    [
+                        (2000, TRACE_IN, b"\x90\x3c\x40"),
+                        (3000, TRACE_OUT, b"\xb0\x07\x64"),
+                    ],
+                )
+        finally:
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
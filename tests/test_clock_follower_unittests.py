@@ -0,0 +1,103 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from adafruit_midi.clock_follower import ClockFollower
+from adafruit_midi.midi_continue import Continue
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.song_position_pointer import SongPositionPointer
+from adafruit_midi.start import Start
+from adafruit_midi.stop import Stop
+from adafruit_midi.timing_clock import TimingClock
+
+
+def period_ns(bpm):
+    return 60000000000 / (bpm * 24)
+
+
+class Test_ClockFollower(unittest.TestCase):
+    def test_steady_tempo(self):
+        cf = ClockFollower()
+        self.assertIsNone(cf.bpm)
+        cf.feed(Start(), 0)
+        for i in range(96):
+            cf.feed(TimingClock(), int(i * period_ns(120)))
+        self.assertAlmostEqual(cf.bpm, 120.0, places=3)
+        self.assertEqual(cf.ticks, 96)
+        # Half way between tick 95 and 96 is beat 95.5 / 24
+        now = int(95.5 * period_ns(120))
+        self.assertAlmostEqual(cf.beat_position(now), 95.5 / 24, places=4)
+
+    def test_jitter_and_tempo_change(self):
+        cf = ClockFollower(window=24)
+        t = 0.0
+        for i in range(200):
+            cf.feed(TimingClock(), int(t) + (i % 3 - 1) * 200000)
+            t += period_ns(100)
+        self.assertAlmostEqual(cf.bpm, 100.0, delta=0.5)
+        for i in range(24):
+            t += period_ns(140)
+            cf.feed(TimingClock(), int(t))
+        # Window now only holds ticks at the new tempo
+        self.assertAlmostEqual(cf.bpm, 140.0, places=3)
+
+    def test_transport(self):
+        cf = ClockFollower()
+        tick = 0
+
+        def ticks(count):
+            nonlocal tick
+            for _ in range(count):
+                cf.feed(TimingClock(), int(tick * period_ns(120)))
+                tick += 1
+
+        ticks(10)
+        self.assertEqual(cf.beat_position(), 0.0)
+        cf.feed(Start())
+        ticks(12)
+        cf.feed(Stop())
+        self.assertEqual(cf.song_position_ticks(), 12.0)
+        ticks(10)
+        cf.feed(NoteOn(60))
+        self.assertEqual(cf.song_position_ticks(), 12.0)
+        cf.feed(Continue())
+        ticks(6)
+        self.assertAlmostEqual(
+            cf.song_position_ticks(int((tick - 1) * period_ns(120))), 17.0
+        )
+        cf.feed(Stop())
+        cf.feed(SongPositionPointer(4))
+        self.assertEqual(cf.beat_position(), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,124 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock, call
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.clock_master import ClockMaster, JitterStats
+from midi_test_helpers import FakeClock
+
+# 120bpm is 48 ticks per second
+TICK_NS = 1000000000 // 48
+
+
+class Test_ClockMaster(unittest.TestCase):
+    def setUp(self):
+        self.port = Mock()
+        self.midi = adafruit_midi.MIDI(midi_out=self.port)
+        self.clock = FakeClock(1000)
+
+    def written(self):
+        return b"".join(c[1][0][: c[1][1]] for c in self.port.write.mock_calls)
+
+    def test_no_drift(self):
+        cm = ClockMaster(self.midi, 120, clock=self.clock)
+        self.assertEqual(cm.poll(), 1)  # first tick is immediate
+        # Poll slightly late every time, deadlines must not slip
+        for _ in range(480):
+            self.clock.now += TICK_NS + 7
+            cm.poll()
+        self.assertEqual(cm.ticks, 481)
+        self.clock.now = 1000 + 10 * 1000000000 - 1
+        self.assertEqual(cm.poll(), 0)
+        self.clock.now += 1
+        self.assertEqual(cm.poll(), 0)
+        self.assertEqual(cm.ticks, 481)
+
+    def test_catchup_burst(self):
+        cm = ClockMaster(self.midi, 120, clock=self.clock)
+        cm.poll()
+        self.clock.now += 3 * TICK_NS + 5
+        self.assertEqual(cm.poll(), 3)
+        self.assertEqual(self.port.write.mock_calls[-1], call(b"\xf8" * 24, 3))
+        self.assertEqual(cm.dropped_ticks, 0)
+        self.assertAlmostEqual(cm.jitter.max, 2 * TICK_NS + 5, delta=2)
+
+    def test_dropped_ticks(self):
+        cm = ClockMaster(self.midi, 120, max_catchup=4, clock=self.clock)
+        cm.poll()
+        self.clock.now += 10 * TICK_NS + 5
+        self.assertEqual(cm.poll(), 4)
+        self.assertEqual(cm.dropped_ticks, 6)
+        self.assertEqual(cm.poll(), 0)
+
+    def test_tempo_change(self):
+        cm = ClockMaster(self.midi, 120, clock=self.clock)
+        cm.poll()
+        cm.bpm = 60
+        self.clock.now += TICK_NS
+        self.assertEqual(cm.poll(), 0)
+        self.clock.now += TICK_NS
+        self.assertEqual(cm.poll(), 1)
+        self.assertAlmostEqual(cm.time_to_next_tick(), 2 * TICK_NS, delta=2)
+
+    def test_transport(self):
+        cm = ClockMaster(self.midi, 120, clock=self.clock)
+        cm.start()
+        for _ in range(12):
+            cm.poll()
+            self.clock.now += TICK_NS + 1
+        self.assertEqual(cm.song_position, 2)
+        with self.assertRaises(RuntimeError):
+            cm.song_position = 0
+        cm.stop()
+        cm.poll()
+        self.assertEqual(cm.song_position, 2)
+        cm.song_position = 0x100
+        cm.resume()
+        self.assertEqual(
+            self.written(), b"\xfa" + b"\xf8" * 12 + b"\xfc\xf8\xf2\x00\x02\xfb"
+        )
+
+
+class Test_JitterStats(unittest.TestCase):
+    def test_percentiles(self):
+        js = JitterStats(100)
+        self.assertEqual(js.percentiles((50,)), {50: None})
+        for i in range(200):
+            js.record(i)
+        pcts = js.percentiles((0, 50, 99, 100))
+        self.assertEqual(pcts, {0: 100, 50: 150, 99: 199, 100: 199})
+        self.assertEqual(js.max, 199)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
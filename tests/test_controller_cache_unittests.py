@@ -0,0 +1,100 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.channel_pressure import ChannelPressure
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.controller_cache import ControllerCache
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.pitch_bend import PitchBend
+from adafruit_midi.program_change import ProgramChange
+from midi_test_helpers import collecting_port
+
+
+class Test_ControllerCache(unittest.TestCase):
+    def setUp(self):
+        self.written = bytearray()
+        self.midi = adafruit_midi.MIDI(
+            midi_out=collecting_port(self.written), out_channel=1
+        )
+
+    def test_redundant_sends_suppressed(self):
+        cache = ControllerCache()
+        self.assertEqual(cache.send(self.midi, ControlChange(7, 100)), 1)
+        self.assertEqual(cache.send(self.midi, ControlChange(7, 100)), 0)
+        sent = cache.send(
+            self.midi,
+            [
+                ControlChange(7, 100),
+                ControlChange(7, 101),
+                PitchBend(8192),
+                PitchBend(8192),
+                NoteOn(60),
+                NoteOn(60),
+                ControlChange(121, 0),
+                ControlChange(121, 0),
+            ],
+        )
+        self.assertEqual(sent, 6)
+        self.assertEqual(cache.suppressed_messages, 3)
+        self.assertEqual(cache.suppressed_bytes, 9)
+        self.assertIsNone(cache.control(7, 1))
+        self.assertEqual(cache.send(self.midi, ControlChange(7, 101)), 1)
+        self.assertEqual(cache.send(self.midi, ControlChange(7, 101), channel=2), 1)
+
+    def test_snapshot_restore_and_burst(self):
+        cache = ControllerCache()
+        cache.update(ControlChange(10, 64, channel=0))
+        cache.update(ProgramChange(5, channel=0))
+        cache.update(ChannelPressure(9, channel=0))
+        cache.update_bytes(b"\xb0\x00\x01\xe0\x00\x40\xb3\x20\x02\xf8")
+        self.assertEqual(cache.pitch_bend(0), 8192)
+        self.assertEqual(cache.program(0), 5)
+        self.assertEqual(cache.pressure(0), 9)
+        snap = cache.snapshot()
+        cache.clear()
+        self.assertIsNone(cache.control(10, 0))
+        self.assertEqual(cache.resend(self.midi), 0)
+        cache.restore(snap)
+        self.assertEqual(cache.control(10, 0), 64)
+        self.assertEqual(cache.resend(self.midi), 16)
+        self.assertEqual(
+            self.written,
+            b"\xb0\x00\x01\xc0\x05\xb0\x0a\x40\xe0\x00\x40\xd0\x09\xb3\x20\x02",
+        )
+        with self.assertRaises(ValueError):
+            cache.restore(b"\x00")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,117 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.channel_pressure import ChannelPressure
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.controller_coalescer import ControllerCoalescer
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.pitch_bend import PitchBend
+from adafruit_midi.program_change import ProgramChange
+from adafruit_midi.polyphonic_key_pressure import PolyphonicKeyPressure
+from midi_test_helpers import FakeClock, collecting_port
+
+
+class Test_ControllerCoalescer(unittest.TestCase):
+    def setUp(self):
+        self.writes = []
+        self.midi = adafruit_midi.MIDI(midi_out=collecting_port(self.writes))
+        self.clock = FakeClock()
+
+    def test_latest_value_kept_and_notes_immediate(self):
+        co = ControllerCoalescer(self.midi, max_rate=100, burst=2, clock=self.clock)
+        for value in range(100):
+            co.send(ControlChange(1, value))
+            co.send(PitchBend(value * 100))
+        co.send([PolyphonicKeyPressure(60, 5), ChannelPressure(3), NoteOn(60)])
+        self.assertEqual(self.writes, [b"\x90\x3c\x7f"])
+        self.assertEqual(co.pending, 4)
+        self.assertEqual(co.coalesced, 198)
+
+        # Burst allowance of two then one per 10ms
+        self.assertEqual(co.poll(), 2)
+        self.assertEqual(self.writes[1], b"\xb0\x01\x63\xe0\x2c\x4d")
+        self.assertEqual(co.poll(), 0)
+        self.clock.now += 9999999
+        self.assertEqual(co.poll(), 0)
+        self.clock.now += 1
+        self.assertEqual(co.poll(), 1)
+        self.assertEqual(self.writes[2], b"\xa0\x3c\x05")
+        self.assertEqual(co.flush(), 1)
+        self.assertEqual(self.writes[3], b"\xd0\x03")
+        self.assertEqual(co.written, 4)
+
+    def test_rate_limit(self):
+        co = ControllerCoalescer(self.midi, max_rate=1000, burst=1, clock=self.clock)
+        sent = 0
+        for step in range(10000):
+            co.send(ControlChange(step % 4 + 1, step % 128), channel=step % 2)
+            self.clock.now += 100000  # 0.1ms
+            sent += co.poll()
+        # One second at up to 1000 messages per second
+        self.assertEqual(sent, 1000)
+
+    def test_discrete_controllers_immediate(self):
+        co = ControllerCoalescer(self.midi, max_rate=100, burst=1, clock=self.clock)
+        # Bank Select must reach the receiver before the Program Change
+        co.send([ControlChange(0, 1), ControlChange(32, 2), ProgramChange(5)])
+        # RPN 0 (pitch bend sensitivity) then its Data Entry
+        co.send([ControlChange(101, 0), ControlChange(100, 0)])
+        co.send([ControlChange(6, 12), ControlChange(38, 0)])
+        # Sustain on then off must not collapse
+        co.send([ControlChange(64, 127), ControlChange(64, 0)])
+        co.send(ControlChange(123, 0))
+        self.assertEqual(co.pending, 0)
+        self.assertEqual(co.coalesced, 0)
+        self.assertEqual(co.immediate, 10)
+        self.assertEqual(
+            b"".join(self.writes),
+            b"\xb0\x00\x01\xb0\x20\x02\xc0\x05"
+            b"\xb0\x65\x00\xb0\x64\x00\xb0\x06\x0c\xb0\x26\x00"
+            b"\xb0\x40\x7f\xb0\x40\x00\xb0\x7b\x00",
+        )
+
+    def test_reset_all_controllers_discards_held(self):
+        co = ControllerCoalescer(self.midi, max_rate=100, burst=1, clock=self.clock)
+        co.send(ControlChange(7, 100), channel=0)
+        co.send(PitchBend(1000), channel=0)
+        co.send(ControlChange(7, 90), channel=1)
+        co.send(ControlChange(121, 0), channel=0)
+        self.assertEqual(self.writes, [b"\xb0\x79\x00"])
+        self.assertEqual(co.pending, 1)
+        self.assertEqual(co.flush(), 1)
+        self.assertEqual(self.writes[1], b"\xb1\x07\x5a")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
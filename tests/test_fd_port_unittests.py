@@ -0,0 +1,178 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+import threading
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.fd_port import FdPort
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.router import Router
+from adafruit_midi.system_exclusive import SystemExclusive
+from midi_test_helpers import collecting_port
+
+
+@unittest.skipUnless(hasattr(os, "readv"), "needs os.readv")
+class Test_FdPort_pipe(unittest.TestCase):
+    def setUp(self):
+        (fd_read, fd_write) = os.pipe()
+        self.port_in = FdPort(fd_read)
+        self.port_out = FdPort(fd_out=fd_write)
+
+    def tearDown(self):
+        self.port_in.close()
+        self.port_out.close()
+
+    def test_buffered_reads(self):
+        self.assertEqual(self.port_in.read(3), b"")
+        self.assertEqual(self.port_out.write(b"\x90\x3c\x40\x80\x3c\x00\xff", 6), 6)
+        self.assertTrue(self.port_in.wait(0))
+        self.assertEqual(self.port_in.read(2), b"\x90\x3c")
+        self.assertEqual(self.port_in.in_waiting, 4)
+        buffer = bytearray(3)
+        self.assertEqual(self.port_in.readinto(buffer), 3)
+        self.assertEqual(buffer, b"\x40\x80\x3c")
+        self.assertEqual(self.port_in.read(10), b"\x00")
+        # One system call after the empty read fetched all six bytes
+        self.assertEqual(self.port_in.read_calls, 2)
+        self.assertEqual(self.port_in.empty_reads, 1)
+        self.assertEqual(self.port_in.read(10), b"")
+        self.assertFalse(self.port_in.wait(0))
+        self.assertFalse(self.port_in.eof)
+
+    def test_readinto_direct(self):
+        self.port_out.write(b"\xf8\xf8\xf8", 3)
+        buffer = bytearray(8)
+        self.assertEqual(self.port_in.readinto(buffer), 3)
+        self.assertEqual(buffer[:3], b"\xf8\xf8\xf8")
+        self.assertEqual(self.port_in.readinto(buffer), 0)
+
+    def test_eof(self):
+        self.port_out.close()
+        self.assertEqual(self.port_in.read(3), b"")
+        self.assertTrue(self.port_in.eof)
+
+    def test_partial_writes(self):
+        # Larger than a pipe's buffer so writes are partial until read
+        data = bytes(i & 0x7F for i in range(300000))
+        received = bytearray()
+
+        def reader():
+            buffer = bytearray(1000)
+            while len(received) < len(data):
+                self.port_in.wait(1)
+                count = self.port_in.readinto(buffer)
+                received.extend(buffer[:count])
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        self.assertEqual(self.port_out.write(data, len(data)), len(data))
+        thread.join(10)
+        self.assertEqual(bytes(received), data)
+        self.assertGreater(self.port_out.write_calls, 1)
+        self.assertEqual(self.port_out.dropped_bytes, 0)
+
+    def test_write_timeout(self):
+        self.port_out._write_timeout = 0.01
+        data = bytes(300000)
+        written = self.port_out.write(data, len(data))
+        self.assertLess(written, len(data))
+        self.assertEqual(self.port_out.dropped_bytes, len(data) - written)
+
+    def test_midi(self):
+        midi_out = adafruit_midi.MIDI(midi_out=self.port_out, out_channel=3)
+        midi_in = adafruit_midi.MIDI(midi_in=self.port_in)
+        msgs = [NoteOn(60 + idx, 100) for idx in range(10)]
+        midi_out.send(msgs)
+        midi_out.send(SystemExclusive([0x7D], [1, 2, 3]))
+        for idx in range(10):
+            msg = midi_in.receive()
+            self.assertIsInstance(msg, NoteOn)
+            self.assertEqual(msg.note, 60 + idx)
+            self.assertEqual(msg.channel, 3)
+        self.assertIsInstance(midi_in.receive(), SystemExclusive)
+        self.assertIsNone(midi_in.receive())
+        # MIDI reads 30 bytes at most, all 36 were fetched by one system call
+        self.assertEqual(self.port_in.bytes_read, 36)
+        self.assertEqual(self.port_in.read_calls - self.port_in.empty_reads, 1)
+
+    def test_router(self):
+        # The port reads more than the router asks for, the rest must not
+        # wait for the selector to report the descriptor readable again
+        written = bytearray()
+        midi_out = adafruit_midi.MIDI(midi_out=self.port_out)
+        collector = adafruit_midi.MIDI(midi_out=collecting_port(written))
+        router = Router(read_size=64)
+        router.add_route(adafruit_midi.MIDI(midi_in=self.port_in), collector)
+        try:
+            midi_out.send([NoteOn(idx, 100) for idx in range(100)])
+            self.assertEqual(router.pump(1.0), 100)
+            self.assertEqual(len(written), 300)
+            self.assertEqual(self.port_in.in_waiting, 0)
+        finally:
+            router.close()
+
+
+@unittest.skipUnless(hasattr(os, "openpty"), "needs os.openpty")
+class Test_FdPort_pty(unittest.TestCase):
+    def test_pty(self):
+        import tty  # pylint: disable=import-outside-toplevel
+
+        (master, slave) = os.openpty()
+        tty.setraw(slave)
+        device = FdPort(master, master)
+        host = FdPort(slave, slave)
+        try:
+            midi_device = adafruit_midi.MIDI(midi_in=device, midi_out=device)
+            midi_host = adafruit_midi.MIDI(midi_in=host, midi_out=host)
+            midi_host.send(NoteOn(60, 100))
+            self.assertTrue(device.wait(1))
+            msg = midi_device.receive()
+            self.assertIsInstance(msg, NoteOn)
+            midi_device.send(NoteOn(61, 0x7F))
+            self.assertTrue(host.wait(1))
+            msg = midi_host.receive()
+            self.assertIsInstance(msg, NoteOn)
+            self.assertEqual(msg.note, 61)
+            self.assertEqual(msg.velocity, 0x7F)
+        finally:
+            device.close()
+            host.close()
+
+
+class Test_FdPort_constructor(unittest.TestCase):
+    def test_no_fd(self):
+        with self.assertRaises(ValueError):
+            FdPort()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
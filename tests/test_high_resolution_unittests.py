@@ -0,0 +1,137 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock, call
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.high_resolution import (
+    ControlChange14,
+    HighResolutionDecoder,
+    HighResolutionEncoder,
+    ParameterChange,
+)
+from adafruit_midi.note_on import NoteOn
+
+
+def feed_all(decoder, data):
+    buf = bytearray(data)
+    events = []
+    while buf:
+        (msg, endplusone, _) = adafruit_midi.MIDIMessage.from_message_bytes(
+            buf, tuple(range(16))
+        )
+        del buf[:endplusone]
+        events.append(decoder.feed(msg))
+    return events
+
+
+class Test_HighResolutionDecoder(unittest.TestCase):
+    def test_cc14(self):
+        decoder = HighResolutionDecoder()
+        note = NoteOn(60, channel=0)
+        self.assertIs(decoder.feed(note), note)
+        lsb_alone = ControlChange(33, 5, channel=0)
+        self.assertIs(decoder.feed(lsb_alone), lsb_alone)
+        events = feed_all(decoder, b"\xb2\x01\x40\xb2\x21\x05\xb2\x21\x06")
+        self.assertEqual([e.value for e in events], [0x2000, 0x2005, 0x2006])
+        self.assertEqual({e.control for e in events}, {1})
+        self.assertEqual({e.channel for e in events}, {2})
+        self.assertIsInstance(events[0], ControlChange14)
+
+        quiet = HighResolutionDecoder(emit_msb=False)
+        events = feed_all(quiet, b"\xb2\x07\x40\xb2\x27\x05")
+        self.assertIsNone(events[0])
+        self.assertEqual(events[1].value, 0x2005)
+
+    def test_rpn_nrpn(self):
+        decoder = HighResolutionDecoder(emit_msb=False)
+        # Pitch bend sensitivity (RPN 0) of 12 semitones
+        events = feed_all(decoder, b"\xb0\x65\x00\xb0\x64\x00\xb0\x06\x0c\xb0\x26\x00")
+        self.assertEqual(events[:3], [None, None, None])
+        self.assertIsInstance(events[3], ParameterChange)
+        self.assertTrue(events[3].registered)
+        self.assertEqual((events[3].parameter, events[3].value), (0, 12 << 7))
+        events = feed_all(decoder, b"\xb0\x60\x00\xb0\x61\x00\xb0\x61\x00")
+        self.assertEqual([e.value for e in events], [1537, 1536, 1535])
+
+        events = feed_all(decoder, b"\xb0\x63\x01\xb0\x62\x02\xb0\x26\x03")
+        self.assertFalse(events[2].registered)
+        self.assertEqual(events[2].parameter, 130)
+
+        # RPN null deselects so data entry is an ordinary control again
+        events = feed_all(decoder, b"\xb0\x65\x7f\xb0\x64\x7f\xb0\x06\x01")
+        self.assertIsNone(events[2])
+        events = feed_all(decoder, b"\xb0\x26\x02")
+        self.assertEqual(events[0].value, 0x82)
+
+
+class Test_HighResolutionEncoder(unittest.TestCase):
+    def test_minimal_selection(self):
+        port = Mock()
+        midi = adafruit_midi.MIDI(midi_out=port, out_channel=1)
+        enc = HighResolutionEncoder()
+        enc.send(midi, ParameterChange(0, 0x0C00))
+        enc.send(midi, ParameterChange(0, 0x0C01))
+        enc.send(midi, ParameterChange(1, 0x2000))
+        enc.send(midi, ParameterChange(1, 0x2000, registered=False))
+        self.assertEqual(
+            port.write.mock_calls,
+            [
+                call(b"\xb1\x65\x00\xb1\x64\x00\xb1\x06\x18\xb1\x26\x00", 12),
+                call(b"\xb1\x06\x18\xb1\x26\x01", 6),
+                call(b"\xb1\x64\x01\xb1\x06\x40\xb1\x26\x00", 9),
+                call(b"\xb1\x63\x00\xb1\x62\x01\xb1\x06\x40\xb1\x26\x00", 12),
+            ],
+        )
+        self.assertEqual(enc.suppressed_bytes, 9)
+
+        self.assertEqual(
+            enc.encode(ControlChange14(1, 0x2001), channel=0),
+            b"\xb0\x01\x40\xb0\x21\x01",
+        )
+        self.assertEqual(
+            enc.encode(ControlChange14(1, 0x2002), channel=0), b"\xb0\x21\x02"
+        )
+        enc.reset()
+        self.assertEqual(len(enc.encode(ControlChange14(1, 0x2002), channel=0)), 6)
+
+    def test_stateless_bytes_roundtrip(self):
+        decoder = HighResolutionDecoder(emit_msb=False)
+        events = feed_all(decoder, bytes(ParameterChange(300, 9000, channel=4)))
+        self.assertEqual((events[3].parameter, events[3].value), (300, 9000))
+        events = feed_all(decoder, bytes(ControlChange14(31, 16383, channel=15)))
+        self.assertEqual(events[1].value, 16383)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,199 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.midi_message import MIDIMessage
+from adafruit_midi.mtc import (
+    MTCDecoder,
+    MTCGenerator,
+    RATE_25,
+    RATE_29_97_DROP,
+    RATE_30,
+    frames_to_timecode,
+    full_frame,
+    timecode_to_frames,
+)
+from adafruit_midi.mtc_quarter_frame import MtcQuarterFrame
+from adafruit_midi.note_on import NoteOn
+from midi_test_helpers import FakeClock
+
+# 25 frames per second is 100 quarter frames per second
+QF_NS = 10000000
+
+
+def quarter_frames(timecode, rate):
+    (hours, minutes, seconds, frames) = timecode
+    values = (frames, seconds, minutes, hours | rate << 5)
+    return [
+        MtcQuarterFrame(piece, values[piece >> 1] >> (4 * (piece & 1)) & 0x0F)
+        for piece in range(8)
+    ]
+
+
+def parse_all(data):
+    buf = bytearray(data)
+    msgs = []
+    while buf:
+        (msg, end, _) = MIDIMessage.from_message_bytes(buf, tuple(range(16)))
+        del buf[:end]
+        msgs.append(msg)
+    return msgs
+
+
+class Test_timecode(unittest.TestCase):
+    def test_non_drop(self):
+        self.assertEqual(timecode_to_frames((1, 2, 3, 4), RATE_25), 93079)
+        self.assertEqual(frames_to_timecode(93079, RATE_25), (1, 2, 3, 4))
+        self.assertEqual(frames_to_timecode(-1, RATE_30), (23, 59, 59, 29))
+
+    def test_drop_frame(self):
+        self.assertEqual(frames_to_timecode(1799, RATE_29_97_DROP), (0, 0, 59, 29))
+        self.assertEqual(frames_to_timecode(1800, RATE_29_97_DROP), (0, 1, 0, 2))
+        self.assertEqual(frames_to_timecode(17982, RATE_29_97_DROP), (0, 10, 0, 0))
+        for count in (0, 1800, 17981, 17983, 100000, 2589407):
+            self.assertEqual(
+                timecode_to_frames(
+                    frames_to_timecode(count, RATE_29_97_DROP), RATE_29_97_DROP
+                ),
+                count,
+            )
+
+
+class Test_MTCDecoder(unittest.TestCase):
+    def test_forward(self):
+        decoder = MTCDecoder(clock=FakeClock(5))
+        qfs = quarter_frames((10, 20, 30, 23), RATE_25)
+        for msg in qfs[4:]:  # partial sequence
+            self.assertIsNone(decoder.feed(msg))
+        for msg in qfs[:7]:
+            self.assertIsNone(decoder.feed(msg))
+        self.assertEqual(decoder.feed(qfs[7]), (10, 20, 31, 0))
+        self.assertEqual(decoder.timecode, (10, 20, 31, 0))
+        self.assertEqual(decoder.rate, RATE_25)
+        self.assertEqual(decoder.direction, 1)
+        self.assertEqual(decoder.updated_ns, 5)
+
+    def test_backward(self):
+        decoder = MTCDecoder()
+        qfs = quarter_frames((0, 0, 1, 1), RATE_30)
+        results = [decoder.feed(msg, 7) for msg in reversed(qfs)]
+        self.assertEqual(results, [None] * 7 + [(0, 0, 0, 29)])
+        self.assertEqual(decoder.direction, -1)
+
+    def test_out_of_sequence(self):
+        decoder = MTCDecoder()
+        qfs = quarter_frames((0, 0, 0, 0), RATE_25)
+        for msg in qfs[:3] + qfs[4:]:
+            self.assertIsNone(decoder.feed(msg))
+        self.assertIsNone(decoder.timecode)
+
+    def test_full_frame(self):
+        decoder = MTCDecoder()
+        msg = parse_all(bytes(full_frame((1, 2, 3, 4), RATE_29_97_DROP)))[0]
+        self.assertEqual(bytes(msg), b"\xf0\x7f\x7f\x01\x01\x41\x02\x03\x04\xf7")
+        self.assertEqual(decoder.feed(msg, 3), (1, 2, 3, 4))
+        self.assertEqual(decoder.rate, RATE_29_97_DROP)
+        self.assertIsNone(decoder.feed(NoteOn(60)))
+        self.assertIsNone(decoder.feed(None))
+
+
+class Test_MTCGenerator(unittest.TestCase):
+    def setUp(self):
+        self.port = Mock()
+        self.midi = adafruit_midi.MIDI(midi_out=self.port)
+        self.clock = FakeClock(1000)
+
+    def written(self):
+        return b"".join(c[1][0][: c[1][1]] for c in self.port.write.mock_calls)
+
+    def test_round_trip(self):
+        gen = MTCGenerator(self.midi, RATE_25, clock=self.clock)
+        gen.locate((1, 0, 59, 20))
+        self.assertEqual(gen.poll(), 0)  # not running
+        gen.start()
+        decoder = MTCDecoder()
+        times = []
+        for _ in range(400):  # four seconds
+            gen.poll()
+            self.clock.now += QF_NS + 3
+        for msg in parse_all(self.written()):
+            result = decoder.feed(msg)
+            if result is not None:
+                times.append(result)
+        self.assertEqual(gen.quarter_frames, 400)
+        self.assertEqual(gen.dropped, 0)
+        self.assertEqual(times[0], (1, 0, 59, 20))  # the locate
+        self.assertEqual(times[1], (1, 0, 59, 22))
+        self.assertEqual(times[-1], (1, 1, 3, 20))
+        self.assertEqual(len(times), 1 + 50)
+        self.assertEqual(gen.timecode, (1, 1, 3, 20))
+        self.assertTrue(gen.jitter.max < 400 * 3 + 10)
+
+        gen.stop()
+        self.assertEqual(gen.timecode, (1, 1, 3, 20))
+        self.clock.now += 10 * QF_NS
+        self.assertEqual(gen.poll(), 0)
+
+    def test_catchup(self):
+        gen = MTCGenerator(self.midi, RATE_25, max_catchup=4, clock=self.clock)
+        gen.start()
+        self.assertEqual(gen.poll(), 1)
+        self.clock.now += 3 * QF_NS
+        self.assertEqual(gen.poll(), 3)
+        self.assertEqual(gen.time_to_next(), QF_NS)
+        self.clock.now += 10 * QF_NS + 1
+        self.assertEqual(gen.poll(), 4)
+        self.assertEqual(gen.dropped, 6)
+        self.assertEqual(gen.quarter_frames, 8)
+        self.assertEqual(self.written()[:4], b"\xf1\x00\xf1\x10")
+
+    def test_drop_frame_period(self):
+        gen = MTCGenerator(self.midi, RATE_29_97_DROP, clock=self.clock)
+        gen.start()
+        gen.poll()
+        # 120 quarter frames is 1.001 seconds at 29.97
+        self.clock.now += 1001000000 - 1
+        self.assertEqual(gen.poll(), 8)  # limited by max_catchup
+        gen.poll()
+        self.assertEqual(gen.quarter_frames + gen.dropped, 120)
+        self.clock.now += 1
+        self.assertEqual(gen.poll(), 1)
+
+    def test_bad_rate(self):
+        with self.assertRaises(ValueError):
+            MTCGenerator(self.midi, 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,89 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock, call
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_off import NoteOff
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.note_tracker import NoteTracker
+
+
+class Test_NoteTracker(unittest.TestCase):
+    def test_on_off(self):
+        nt = NoteTracker()
+        nt.update(NoteOn(60, channel=0))
+        nt.update([NoteOn(60, channel=0), NoteOn(64, channel=0), NoteOn(0, channel=9)])
+        nt.update(ControlChange(1, 2, channel=0))
+        nt.update(None)
+        self.assertTrue(nt.is_sounding(60, 0))
+        self.assertFalse(nt.is_sounding(60, 1))
+        self.assertEqual(nt.count(), 3)
+        self.assertEqual(nt.count(0), 2)
+        nt.update(NoteOn(60, 0, channel=0))
+        nt.update(NoteOff(127, channel=0))
+        self.assertFalse(nt.is_sounding(60, 0))
+        self.assertEqual(nt.count(), 2)
+        nt.update_bytes(b"\x89\x00\x00\x9f\x7f\x01\x9f\x7e\x00\xf8")
+        self.assertEqual(nt.count(), 2)
+        self.assertTrue(nt.is_sounding(127, 15))
+
+    def test_update_bytes_truncated_note(self):
+        nt = NoteTracker()
+        # Note Ons cut short by a status byte are not notes
+        nt.update_bytes(b"\x90\x90\x3c\x64\x91\x3d\xb1\x07\x64")
+        self.assertEqual(nt.count(), 1)
+        self.assertTrue(nt.is_sounding(60, 0))
+        self.assertEqual(nt.panic_bytes(), b"\x80\x3c\x00")
+
+    def test_send_and_panic(self):
+        port = Mock()
+        midi = adafruit_midi.MIDI(midi_out=port, out_channel=3)
+        nt = NoteTracker()
+        nt.send(midi, [NoteOn(62), NoteOn(61)])
+        nt.send(midi, NoteOn(10), channel=0)
+        self.assertEqual(nt.panic_bytes(), b"\x80\x0a\x00\x83\x3d\x00\x83\x3e\x00")
+        self.assertEqual(
+            nt.panic_bytes(running_status=True), b"\x80\x0a\x00\x83\x3d\x00\x3e\x00"
+        )
+        self.assertEqual(nt.panic(midi), 3)
+        self.assertEqual(
+            port.write.mock_calls[-1], call(b"\x80\x0a\x00\x83\x3d\x00\x83\x3e\x00", 9)
+        )
+        self.assertEqual(nt.count(), 0)
+        self.assertEqual(nt.panic(midi), 0)
+        self.assertEqual(len(port.write.mock_calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
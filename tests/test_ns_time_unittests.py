@@ -0,0 +1,57 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from adafruit_midi import ns_time
+
+
+class Test_ns_time(unittest.TestCase):
+    def test_clocks(self):
+        for clock in (
+            ns_time.monotonic_ns,
+            ns_time.perf_counter_ns,
+            ns_time._monotonic_ns_float,
+            ns_time._perf_counter_ns_float,
+        ):
+            first = clock()
+            self.assertIsInstance(first, int)
+            self.assertGreaterEqual(clock(), first)
+
+    def test_float_matches(self):
+        # The fallbacks use the same time base as the float clocks
+        self.assertAlmostEqual(
+            ns_time._monotonic_ns_float() / 1e9, ns_time.time.monotonic(), delta=0.1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
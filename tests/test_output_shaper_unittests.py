@@ -0,0 +1,105 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.output_shaper import OutputShaper
+from adafruit_midi.system_exclusive import SystemExclusive
+from adafruit_midi.timing_clock import TimingClock
+from midi_test_helpers import FakeClock, collecting_port
+
+BYTE_NS = 320000  # 3125 bytes per second
+
+
+class Test_OutputShaper(unittest.TestCase):
+    def setUp(self):
+        self.writes = []
+        self.port = collecting_port(self.writes)
+        self.midi = adafruit_midi.MIDI(midi_out=self.port)
+        self.clock = FakeClock()
+
+    def test_priority_order(self):
+        shaper = OutputShaper(self.midi, burst=6, clock=self.clock)
+        self.midi.send(ControlChange(1, 2))
+        self.midi.send([NoteOn(60), NoteOn(61)])
+        self.midi.send(TimingClock())
+        self.assertEqual(self.writes, [])
+        self.assertEqual(shaper.queued, 4)
+
+        # 6 byte bucket: the clock and one note fit
+        self.assertEqual(shaper.poll(), 4)
+        self.assertEqual(self.writes[-1], b"\xf8\x90\x3c\x7f")
+        self.assertEqual(shaper.poll(), 0)
+        # 2 bytes left in the bucket, one more needed for the next note
+        self.clock.now += BYTE_NS - 1
+        self.assertEqual(shaper.poll(), 0)
+        self.clock.now += 1
+        self.assertEqual(shaper.poll(), 3)
+        self.assertEqual(self.writes[-1], b"\x90\x3d\x7f")
+        self.clock.now += 3 * BYTE_NS - 1
+        self.assertEqual(shaper.poll(), 0)
+        self.clock.now += 1
+        self.assertEqual(shaper.poll(), 3)
+        self.assertEqual(self.writes[-1], b"\xb0\x01\x02")
+
+        stats = shaper.stats()
+        self.assertEqual(stats["note"]["sent"], 2)
+        self.assertEqual(stats["note"]["max_depth"], 2)
+        self.assertEqual(stats["note"]["wait_max_ns"], BYTE_NS)
+        self.assertEqual(stats["controller"]["wait_mean_ns"], 4 * BYTE_NS)
+        self.assertEqual(stats["realtime"]["wait_max_ns"], 0)
+
+    def test_bandwidth_and_large_sysex(self):
+        shaper = OutputShaper(self.midi, clock=self.clock)
+        self.midi.send(SystemExclusive([0x7D], bytes(100)))
+        self.midi.send([NoteOn(n % 128) for n in range(2000)])
+        total = 0
+        for _ in range(1000):
+            total += shaper.poll()
+            self.clock.now += 1000000  # 1ms
+        # Just under one second of bandwidth plus the initial bucket
+        self.assertEqual(total, 1051 * 3)
+        self.assertEqual(shaper.stats()["sysex"]["sent"], 0)
+        for _ in range(2000):
+            shaper.poll()
+            self.clock.now += 1000000
+        self.assertEqual(shaper.stats()["sysex"]["sent"], 1)
+        self.assertEqual(shaper.queued, 0)
+        shaper.remove()
+        self.midi.send(NoteOn(1))
+        self.assertEqual(self.writes[-1], b"\x90\x01\x7f")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
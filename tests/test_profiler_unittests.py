@@ -0,0 +1,121 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.profiler import LogHistogram, Profiler, PHASES
+from midi_test_helpers import FakeClock
+
+
+class Test_LogHistogram(unittest.TestCase):
+    def test_empty(self):
+        hist = LogHistogram()
+        self.assertIsNone(hist.mean)
+        self.assertIsNone(hist.percentile(50))
+        self.assertEqual(hist.summary()["count"], 0)
+
+    def test_buckets(self):
+        hist = LogHistogram(buckets=8)
+        for value in (0, 1, 2, 3, 4, 100, 1000, -5):
+            hist.record(value)
+        self.assertEqual(hist.buckets, [2, 1, 2, 1, 0, 0, 0, 2])
+        self.assertEqual(hist.count, 8)
+        self.assertEqual(hist.total, 1110)
+        self.assertEqual(hist.min, 0)
+        self.assertEqual(hist.max, 1000)
+        self.assertEqual(hist.percentile(25), 0)
+        self.assertEqual(hist.percentile(50), 3)
+        self.assertEqual(hist.percentile(75), 7)
+        self.assertEqual(hist.percentile(100), 1000)
+        hist.reset()
+        self.assertEqual(hist.buckets, [0] * 8)
+        self.assertIsNone(hist.max)
+
+    def test_percentile_limited_by_max(self):
+        hist = LogHistogram()
+        for _ in range(10):
+            hist.record(1000)
+        self.assertEqual(hist.percentile(50), 1000)
+        self.assertEqual(hist.mean, 1000)
+
+
+class Test_Profiler(unittest.TestCase):
+    def test_midi(self):
+        usb_data = bytearray()
+
+        def write(buffer, length):
+            usb_data.extend(buffer[0:length])
+
+        def read(length):
+            nonlocal usb_data
+            poppedbytes = usb_data[0:length]
+            usb_data = usb_data[len(poppedbytes) :]
+            return bytes(poppedbytes)
+
+        port = Mock()
+        port.read = read
+        port.write = write
+        profiler = Profiler(clock=FakeClock(step=100))
+        m = adafruit_midi.MIDI(midi_in=port, midi_out=port, profiler=profiler)
+        m.send(NoteOn(60, 100))
+        m.send([ControlChange(1, 2), ControlChange(3, 4)])
+        for _ in range(4):
+            m.receive()
+
+        self.assertEqual(profiler.encode.count, 2)
+        self.assertEqual(profiler.write.count, 2)
+        self.assertEqual(profiler.read.count, 4)
+        self.assertEqual(profiler.parse.count, 4)
+        self.assertEqual(profiler.construct.count, 3)
+        # Each clock call advances by 100, the construction time is
+        # excluded from parse but the two calls timing it are not
+        self.assertEqual(profiler.parse.min, 100)
+        self.assertEqual(profiler.parse.max, 200)
+        self.assertEqual(profiler.construct.max, 100)
+
+        summary = profiler.summary()
+        self.assertEqual(tuple(summary.keys()), PHASES)
+        self.assertEqual(summary["write"]["mean"], 100)
+        lines = profiler.format_summary()
+        self.assertEqual(len(lines), 1 + len(PHASES))
+        self.assertTrue(lines[1].startswith("read"))
+
+        profiler.reset()
+        self.assertEqual(profiler.summary()["parse"]["count"], 0)
+        self.assertEqual(len(profiler.format_summary()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
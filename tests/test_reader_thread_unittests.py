@@ -0,0 +1,91 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import os
+import time
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.reader_thread import ReaderThread, SPSCQueue
+
+
+class Test_SPSCQueue(unittest.TestCase):
+    def test_fifo_and_overflow(self):
+        q = SPSCQueue(3)
+        self.assertIsNone(q.get())
+        self.assertTrue(q.put(1))
+        self.assertTrue(q.put(2))
+        self.assertTrue(q.put(3))
+        self.assertFalse(q.put(4))
+        self.assertEqual(len(q), 3)
+        self.assertEqual(q.get(), 1)
+        self.assertTrue(q.put(5))
+        self.assertEqual([q.get() for _ in range(4)], [2, 3, 5, None])
+        self.assertEqual(q.overflows, 1)
+        self.assertEqual(q.high_water, 3)
+
+
+class Test_ReaderThread(unittest.TestCase):
+    def test_reads_and_parses(self):
+        data = b"".join(bytes(NoteOn(n, 1, channel=n % 2)) for n in range(100))
+        chunks = [data[i : i + 7] for i in range(0, len(data), 7)]
+
+        def read(length):
+            if chunks:
+                return chunks.pop(0)[:length]
+            time.sleep(0.001)
+            return b""
+
+        port = Mock()
+        port.read = read
+        midi = adafruit_midi.MIDI(midi_in=port, in_channel=1)
+        reader = ReaderThread(midi, queue_size=40, read_size=64)
+        reader.start()
+        deadline = time.monotonic() + 5
+        while chunks and time.monotonic() < deadline:
+            time.sleep(0.001)
+        reader.stop()
+
+        notes = []
+        msg = reader.receive()
+        while msg is not None:
+            notes.append(msg.note)
+            msg = reader.receive()
+        self.assertEqual(notes, list(range(1, 80, 2)))
+        self.assertEqual(reader.messages, 50)
+        self.assertEqual(reader.overflows, 10)
+        self.assertEqual(reader.high_water, 40)
+        self.assertEqual(reader.bytes_read, 300)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,145 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import io
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.capture import CaptureReader, CaptureWriter, TRACE_IN, TRACE_OUT
+from adafruit_midi.replay import Replay
+from midi_test_helpers import FakeClock
+
+MS = 1000000
+
+
+def make_capture(records):
+    stream = io.BytesIO()
+    writer = CaptureWriter(stream, chunk_size=8, base_ns=0)
+    for (timestamp, direction, data) in records:
+        writer.record(direction, data, len(data), timestamp)
+    writer.close()
+    return CaptureReader(stream.getvalue())
+
+
+RECORDS = [
+    (5 * MS, TRACE_IN, b"\x90\x3c\x40"),
+    (6 * MS, TRACE_OUT, b"\xf8"),
+    (15 * MS, TRACE_IN, b"\x80\x3c"),
+    (15 * MS, TRACE_IN, b"\x00"),
+    (105 * MS, TRACE_IN, b"\xfe"),
+]
+
+
+class Test_Replay(unittest.TestCase):
+    def setUp(self):
+        self.port = Mock()
+        self.midi = adafruit_midi.MIDI(midi_out=self.port)
+        self.clock = FakeClock(1000)
+
+    def writes(self):
+        return [c[1][0][: c[1][1]] for c in self.port.write.mock_calls]
+
+    def test_original_timing(self):
+        replay = Replay(make_capture(RECORDS), self.midi, clock=self.clock)
+        self.assertEqual(replay.time_to_next(), 0)
+        self.assertEqual(replay.poll(), 1)
+        self.assertEqual(replay.time_to_next(), 10 * MS)
+        self.clock.now += 10 * MS - 1
+        self.assertEqual(replay.poll(), 0)
+        self.clock.now += 3
+        # Both records due at 15ms are written separately
+        self.assertEqual(replay.poll(), 2)
+        self.assertEqual(replay.jitter.max, 2)
+        self.clock.now += 88 * MS
+        self.assertEqual(replay.poll(), 0)
+        self.assertFalse(replay.finished)
+        # A late poll does not move later deadlines
+        self.clock.now += 5 * MS
+        self.assertEqual(replay.poll(), 1)
+        self.assertTrue(replay.finished)
+        self.assertEqual(replay.poll(), 0)
+        self.assertEqual(
+            self.writes(), [b"\x90\x3c\x40", b"\x80\x3c", b"\x00", b"\xfe"]
+        )
+
+        report = replay.report()
+        self.assertEqual(report["records"], 4)
+        self.assertEqual(report["bytes"], 7)
+        self.assertAlmostEqual(report["elapsed"], 0.103 + 2e-9)
+        self.assertEqual(report["max_lateness_ns"], 3 * MS + 2)
+
+    def test_speed(self):
+        replay = Replay(
+            make_capture(RECORDS),
+            self.midi,
+            speed=4,
+            direction=TRACE_OUT,
+            clock=self.clock,
+        )
+        replay.poll()
+        self.assertTrue(replay.finished)
+        replay = Replay(make_capture(RECORDS), self.midi, speed=4, clock=self.clock)
+        replay.poll()
+        self.assertEqual(replay.time_to_next(), 10 * MS // 4)
+        self.clock.now += 100 * MS // 4
+        self.assertEqual(replay.poll(), 3)
+        self.assertEqual(replay.jitter.max, 25 * MS - 10 * MS // 4)
+        with self.assertRaises(ValueError):
+            Replay(make_capture(RECORDS), self.midi, speed=0)
+
+    def test_as_fast_as_possible(self):
+        records = [(idx * 1000 * MS, TRACE_IN, b"\xf8") for idx in range(1000)]
+        replay = Replay(make_capture(records), self.midi, speed=None)
+        report = replay.run()
+        self.assertTrue(replay.finished)
+        self.assertEqual(report["records"], 1000)
+        self.assertEqual(len(self.port.write.mock_calls), 1000)
+        self.assertGreater(report["records_per_second"], 0)
+        self.assertEqual(report["lateness_ns"][100], None)
+
+    def test_start_ns(self):
+        replay = Replay(
+            make_capture(RECORDS), self.midi, start_ns=10 * MS, clock=self.clock
+        )
+        self.assertEqual(replay.poll(), 2)
+        self.assertEqual(self.writes(), [b"\x80\x3c", b"\x00"])
+
+    def test_run(self):
+        records = [(idx * MS, TRACE_IN, b"\xf8") for idx in range(20)]
+        replay = Replay(make_capture(records), self.midi, speed=2)
+        report = replay.run()
+        self.assertEqual(report["records"], 20)
+        self.assertGreaterEqual(report["elapsed"], 0.0095)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,116 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.note_off import NoteOff
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.router import Router
+from adafruit_midi.timing_clock import TimingClock
+from midi_test_helpers import collecting_port
+
+
+class ListIn:
+    def __init__(self, data=b""):
+        self.data = bytearray(data)
+
+    def read(self, length):
+        chunk = bytes(self.data[:length])
+        del self.data[:length]
+        return chunk
+
+
+class PipeIn:
+    def __init__(self, fd):
+        self._fd = fd
+
+    def fileno(self):
+        return self._fd
+
+    def read(self, length):
+        return os.read(self._fd, length)
+
+
+def collecting_midi():
+    written = bytearray()
+    return adafruit_midi.MIDI(midi_out=collecting_port(written)), written
+
+
+class Test_Router(unittest.TestCase):
+    def test_filters_and_fanout(self):
+        notes = bytes(NoteOn(60, 1, channel=0)) + bytes(NoteOff(60, 0, channel=1))
+        cc = bytes(ControlChange(7, 100, channel=0))
+        port_in = ListIn(notes + cc + bytes(TimingClock()) + b"\x90\x3c")
+        in1 = adafruit_midi.MIDI(midi_in=port_in)
+        out1, written1 = collecting_midi()
+        out2, written2 = collecting_midi()
+        router = Router()
+        router.add_route(in1, out1, channels=0)
+        router.add_route(in1, out2, types=(NoteOn, NoteOff))
+        router.add_route(in1, out2, channels=(0, 1), types=(NoteOn,))
+
+        self.assertEqual(router.pump(), 4)
+        self.assertEqual(written1, bytes(NoteOn(60, 1, channel=0)) + cc + b"\xf8")
+        self.assertEqual(written2, notes)
+        self.assertEqual(router.messages_out, 5)
+
+        # Remainder of the partial NoteOn
+        port_in.data.extend(b"\x40")
+        del written1[:]
+        del written2[:]
+        router.remove_routes(midi_out=out2)
+        self.assertEqual(router.pump(), 1)
+        self.assertEqual(written1, b"\x90\x3c\x40")
+        self.assertEqual(written2, b"")
+
+    def test_selectable_inputs(self):
+        router = Router()
+        out, written = collecting_midi()
+        pipes = [os.pipe() for _ in range(3)]
+        try:
+            for fd_in, _ in pipes:
+                router.add_route(adafruit_midi.MIDI(midi_in=PipeIn(fd_in)), out)
+            self.assertEqual(router.pump(0), 0)
+            os.write(pipes[1][1], bytes(NoteOn(61, 2, channel=3)))
+            os.write(pipes[2][1], bytes(NoteOn(62, 2, channel=3)))
+            self.assertEqual(router.pump(1.0), 2)
+            self.assertEqual(sorted(written[1::3]), [61, 62])
+        finally:
+            router.close()
+            for fds in pipes:
+                for fd in fds:
+                    os.close(fd)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
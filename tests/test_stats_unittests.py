@@ -0,0 +1,136 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.control_change import ControlChange
+from adafruit_midi.midi_message import MIDIBadEvent
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.stats import MIDIStats
+from adafruit_midi.timing_clock import TimingClock
+from midi_test_helpers import collecting_port
+
+
+def MIDI_mocked_receive(data, in_buf_size=30):
+    usb_data = bytearray(data)
+
+    def read(length):
+        nonlocal usb_data
+        poppedbytes = usb_data[0:length]
+        usb_data = usb_data[len(poppedbytes) :]
+        return bytes(poppedbytes)
+
+    mockedPortIn = Mock()
+    mockedPortIn.read = read
+    return adafruit_midi.MIDI(midi_in=mockedPortIn, in_buf_size=in_buf_size, stats=True)
+
+
+class Test_MIDIStats(unittest.TestCase):
+    def test_disabled(self):
+        m = adafruit_midi.MIDI(midi_out=Mock())
+        self.assertIsNone(m.stats)
+        m.send(NoteOn(60))
+        self.assertEqual(m.skipped_bytes, 0)
+
+    def test_receive(self):
+        data = b"\x01\x02\x90\x3c\x40\xb0\x07\x64\xf8\xf4\xf8\x91\x3c\x00"
+        m = MIDI_mocked_receive(data, in_buf_size=8)
+        msgs = []
+        for _ in range(8):
+            msgs.append(m.receive())
+
+        stats = m.stats
+        self.assertEqual(stats.reads, 8)
+        self.assertEqual(stats.bytes_read, len(data))
+        self.assertEqual(stats.max_read, 8)
+        self.assertEqual(stats.in_buf_high_water, 8)
+        self.assertEqual(stats.skipped_bytes, 2)
+        self.assertEqual(m.skipped_bytes, 2)
+        self.assertEqual(stats.messages, 6)
+        self.assertEqual(stats.unknown_events, 1)
+        self.assertEqual(stats.bad_events, 0)
+        self.assertEqual(stats.message_count(NoteOn._STATUS), 2)
+        self.assertEqual(stats.message_count(0x91), 2)
+        self.assertEqual(stats.message_count(TimingClock._STATUS), 2)
+        self.assertEqual(stats.empty_reads, stats.reads - 3)
+
+        snap = stats.snapshot()
+        self.assertEqual(
+            snap["types"], {"note_on": 2, "control_change": 1, "timing_clock": 2}
+        )
+        self.assertEqual(snap["messages"], 6)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot()["types"], {})
+        self.assertEqual(stats.messages, 0)
+        self.assertEqual(stats.reads, 0)
+
+    def test_buffer_full(self):
+        # An incomplete Note On fills the tiny input buffer
+        m = MIDI_mocked_receive(b"\x90\x3c\x40", in_buf_size=2)
+        for _ in range(3):
+            self.assertIsNone(m.receive())
+        self.assertEqual(m.stats.in_buf_full, 2)
+        self.assertEqual(m.stats.reads, 1)
+
+    def test_send(self):
+        written = bytearray()
+        m = adafruit_midi.MIDI(midi_out=collecting_port(written), stats=True)
+        m.send(NoteOn(60))
+        m.send([ControlChange(1, 2), TimingClock()])
+        self.assertEqual(m.stats.writes, 2)
+        self.assertEqual(m.stats.bytes_written, 7)
+        self.assertEqual(m.stats.bytes_written, len(written))
+
+    def test_skipped_before_partial_message(self):
+        # Noise and the start of a message then the rest a byte at a time
+        reads = [b"\x01\x02\x03\x90", b"", b"\x3c", b"", b"\x40"]
+        port = Mock()
+        port.read = lambda length: reads.pop(0) if reads else b""
+        m = adafruit_midi.MIDI(midi_in=port, stats=True)
+        msgs = [m.receive() for _ in range(6)]
+        self.assertIsInstance(msgs[4], NoteOn)
+        self.assertEqual(m.skipped_bytes, 3)
+        self.assertEqual(m.stats.skipped_bytes, 3)
+
+    def test_bad_event(self):
+        stats = MIDIStats()
+        stats.record_message(MIDIBadEvent(b"\x90\x3c", ValueError()), 1)
+        stats.record_message(None, 3)
+        self.assertEqual(stats.bad_events, 1)
+        self.assertEqual(stats.messages, 1)
+        self.assertEqual(stats.skipped_bytes, 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,120 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import io
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.system_exclusive import SystemExclusive
+from adafruit_midi.trace import (
+    TraceRing,
+    TRACE_IN,
+    TRACE_OUT,
+    read_trace,
+    format_trace,
+)
+from midi_test_helpers import FakeClock
+
+
+class Test_TraceRing(unittest.TestCase):
+    def test_wrap(self):
+        trace = TraceRing(3, capture=2, clock=FakeClock(step=1000))
+        self.assertEqual(trace.records(), [])
+        for value in range(5):
+            trace.record(TRACE_IN, bytes([value, 1, 2]), 3 if value else 1)
+        self.assertEqual(len(trace), 3)
+        self.assertEqual(trace.total, 5)
+        self.assertEqual(
+            trace.records(),
+            [
+                (3000, TRACE_IN, 3, b"\x02\x01"),
+                (4000, TRACE_IN, 3, b"\x03\x01"),
+                (5000, TRACE_IN, 3, b"\x04\x01"),
+            ],
+        )
+        trace.clear()
+        self.assertEqual(len(trace), 0)
+
+    def test_midi(self):
+        usb_data = bytearray()
+
+        def write(buffer, length):
+            usb_data.extend(buffer[0:length])
+
+        def read(length):
+            nonlocal usb_data
+            poppedbytes = usb_data[0:length]
+            usb_data = usb_data[len(poppedbytes) :]
+            return bytes(poppedbytes)
+
+        port = Mock()
+        port.read = read
+        port.write = write
+        trace = TraceRing(8, clock=FakeClock(step=1000))
+        m = adafruit_midi.MIDI(midi_in=port, midi_out=port, trace=trace)
+        m.send(NoteOn(60, 100))
+        m.send(SystemExclusive([0x7D], [1, 2, 3, 4]))
+        self.assertIsInstance(m.receive(), NoteOn)
+        self.assertIsInstance(m.receive(), SystemExclusive)
+        self.assertIsNone(m.receive())  # empty reads are not recorded
+
+        records = trace.records()
+        self.assertEqual(
+            [r[1:] for r in records],
+            [
+                (TRACE_OUT, 3, b"\x90\x3c\x64"),
+                (TRACE_OUT, 7, b"\xf0\x7d\x01\x02"),
+                (TRACE_IN, 10, b"\x90\x3c\x64\xf0"),
+            ],
+        )
+
+        stream = io.BytesIO()
+        trace.save(stream)
+        stream.seek(0)
+        self.assertEqual(read_trace(stream), records)
+        self.assertEqual(
+            format_trace(records),
+            [
+                "    0.000000 OUT     3 90 3c 64",
+                "    0.000001 OUT     7 f0 7d 01 02+",
+                "    0.000002 IN     10 90 3c 64 f0+",
+            ],
+        )
+
+    def test_bad_file(self):
+        with self.assertRaises(ValueError):
+            read_trace(io.BytesIO(b"XXXX" + bytes(5)))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,139 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+from unittest.mock import Mock
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.transform import (
+    DROP,
+    ChannelRemap,
+    ControlRemap,
+    Pipeline,
+    Transform,
+    Transpose,
+    VelocityCurve,
+)
+
+
+class Test_Pipeline(unittest.TestCase):
+    def test_empty_pipeline_passthrough(self):
+        data = b"\x90\x3c\x40\xf8\xd1\x22\xf0\x7d\x01\x02\xf7\xe0\x00\x40\xf2\x01\x02"
+        self.assertEqual(Pipeline().process(data), data)
+
+    def test_transpose(self):
+        pipe = Pipeline(Transpose(12, channels=(0, 1)))
+        self.assertEqual(
+            pipe.process(b"\x90\x3c\x40\x81\x3c\x00\x92\x3c\x40\xa0\x10\x05"),
+            b"\x90\x48\x40\x81\x48\x00\x92\x3c\x40\xa0\x1c\x05",
+        )
+        # Out of range notes are dropped
+        self.assertEqual(pipe.process(b"\x90\x7a\x40\xb0\x7a\x40"), b"\xb0\x7a\x40")
+
+    def test_composition_order(self):
+        # Channel 2 is moved to 0 then transposed as channel 0
+        pipe = Pipeline(ChannelRemap({2: 0}), Transpose(-1, channels=0))
+        self.assertEqual(pipe.process(b"\x92\x3c\x40"), b"\x90\x3b\x40")
+        pipe = Pipeline(Transpose(-1, channels=0), ChannelRemap({2: 0}))
+        self.assertEqual(pipe.process(b"\x92\x3c\x40"), b"\x90\x3c\x40")
+        pipe = Pipeline(Transpose(100), Transpose(-100))
+        self.assertEqual(pipe.process(b"\x90\x20\x40\x90\x10\x40"), b"\x90\x10\x40")
+
+    def test_velocity_curve(self):
+        pipe = Pipeline(VelocityCurve(lambda v: v // 4))
+        self.assertEqual(
+            pipe.process(b"\x90\x3c\x7f\x90\x3c\x02\x90\x3c\x00\x80\x3c\x7f"),
+            b"\x90\x3c\x1f\x90\x3c\x01\x90\x3c\x00\x80\x3c\x7f",
+        )
+        with self.assertRaises(ValueError):
+            VelocityCurve([1, 2, 3])
+
+    def test_control_remap(self):
+        pipe = Pipeline(ControlRemap({1: 11, 64: None}))
+        self.assertEqual(
+            pipe.process(b"\xb3\x01\x20\xb3\x40\x7f\xb3\x07\x64"),
+            b"\xb3\x0b\x20\xb3\x07\x64",
+        )
+        for mapping in ({1: 128}, {1: 300}, {1: -1}, {128: 1}):
+            with self.assertRaises(ValueError):
+                ControlRemap(mapping)
+
+    def test_partial_messages_held(self):
+        pipe = Pipeline(Transpose(1))
+        self.assertEqual(pipe.process(b"\x90\x3c\x40\x90"), b"\x90\x3d\x40")
+        self.assertEqual(pipe.process(b"\x3e"), b"")
+        self.assertEqual(pipe.process(b"\x40\xf0\x01"), b"\x90\x3f\x40")
+        self.assertEqual(
+            pipe.process(b"\xf7\x90\x3c\x90\x3c\x01"), b"\xf0\x01\xf7\x90\x3d\x01"
+        )
+
+    def test_sysex_termination(self):
+        pipe = Pipeline(Transpose(1))
+        # Real-time messages may be inside a SysEx
+        self.assertEqual(
+            pipe.process(b"\xf0\x7d\xf8\x01\xf7\x90\x3c\x40"),
+            b"\xf0\x7d\xf8\x01\xf7\x90\x3d\x40",
+        )
+        # Any other status byte ends a SysEx, later messages are transformed
+        self.assertEqual(
+            pipe.process(b"\xf0\x7d\x01\x90\x3c\x40"), b"\xf0\x7d\x01\x90\x3d\x40"
+        )
+        self.assertEqual(pipe.process(b"\x90\x3e\x40\xf7"), b"\x90\x3f\x40\xf7")
+        # Held until the end is seen
+        self.assertEqual(pipe.process(b"\xf0\x7d\x01"), b"")
+        self.assertEqual(pipe.process(b"\x02\xb0"), b"\xf0\x7d\x01\x02")
+        self.assertEqual(pipe.process(b"\x01\x02"), b"\xb0\x01\x02")
+
+    def test_drop_in_second_data_table(self):
+        class DropSoft(Transform):
+            def tables(self, status):
+                if status & 0xF0 == 0x90:
+                    return (status, None, [DROP] * 10 + list(range(10, 128)))
+                return (status, None, None)
+
+        pipe = Pipeline(DropSoft())
+        self.assertEqual(
+            pipe.process(b"\x90\x3c\x05\x90\x3d\x40\x80\x3c\x05"),
+            b"\x90\x3d\x40\x80\x3c\x05",
+        )
+
+    def test_forward(self):
+        port_in = Mock()
+        port_in.read = Mock(return_value=b"\x90\x3c\x40")
+        port_out = Mock()
+        midi_in = adafruit_midi.MIDI(midi_in=port_in)
+        midi_out = adafruit_midi.MIDI(midi_out=port_out)
+        self.assertEqual(Pipeline(Transpose(2)).forward(midi_in, midi_out), 3)
+        port_out.write.assert_called_once_with(bytearray(b"\x90\x3e\x40"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
@@ -0,0 +1,133 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+import threading
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.system_exclusive import SystemExclusive
+from adafruit_midi.virtual_port import (
+    VirtualPort,
+    virtual_port_pair,
+    OVERFLOW_BLOCK,
+    OVERFLOW_ERROR,
+)
+
+
+class Test_VirtualPort(unittest.TestCase):
+    def test_wrap(self):
+        port = VirtualPort(8)
+        self.assertEqual(port.read(4), b"")
+        for value in range(20):
+            data = bytes([value, value + 1, value + 2])
+            self.assertEqual(port.write(data, 3), 3)
+            self.assertEqual(port.in_waiting, 3)
+            if value % 2:
+                self.assertEqual(port.read(10), data)
+            else:
+                buffer = bytearray(5)
+                self.assertEqual(port.readinto(buffer), 3)
+                self.assertEqual(buffer[:3], data)
+        self.assertEqual(port.high_water, 3)
+
+    def test_partial_read_and_num(self):
+        port = VirtualPort(8)
+        port.write(b"\x90\x3c\x40\xff", 3)
+        self.assertEqual(port.read(2), b"\x90\x3c")
+        self.assertEqual(port.read(2), b"\x40")
+
+    def test_drop(self):
+        port = VirtualPort(8)
+        self.assertEqual(port.write(b"\x01" * 6, 6), 6)
+        self.assertEqual(port.write(b"\x02\x02\x02", 3), 0)
+        self.assertEqual(port.overflows, 1)
+        self.assertEqual(port.dropped_bytes, 3)
+        self.assertEqual(port.write(b"\x03\x03", 2), 2)
+        self.assertEqual(port.read(16), b"\x01" * 6 + b"\x03\x03")
+        port.write(b"\x04", 1)
+        port.reset_input_buffer()
+        self.assertEqual(port.in_waiting, 0)
+
+    def test_error(self):
+        port = VirtualPort(4, overflow=OVERFLOW_ERROR)
+        port.write(b"\x01\x02\x03", 3)
+        with self.assertRaises(RuntimeError):
+            port.write(b"\x04\x05", 2)
+        self.assertEqual(port.read(8), b"\x01\x02\x03")
+        with self.assertRaises(ValueError):
+            VirtualPort(0)
+        with self.assertRaises(ValueError):
+            VirtualPort(8, overflow=99)
+
+    def test_block_timeout(self):
+        port = VirtualPort(4, overflow=OVERFLOW_BLOCK, timeout=0.01)
+        self.assertEqual(port.write(b"\x01\x02\x03\x04\x05\x06", 6), 4)
+        self.assertEqual(port.dropped_bytes, 2)
+        self.assertEqual(port.read(8), b"\x01\x02\x03\x04")
+
+    def test_threads(self):
+        # A blocked writer larger than the capacity against a slow reader
+        port = VirtualPort(16, overflow=OVERFLOW_BLOCK, poll_interval=0)
+        data = bytes(i & 0xFF for i in range(2000))
+        received = bytearray()
+
+        def reader():
+            buffer = bytearray(7)
+            while len(received) < len(data):
+                count = port.readinto(buffer)
+                received.extend(buffer[:count])
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for offset in range(0, len(data), 100):
+            port.write(data[offset : offset + 100], 100)
+        thread.join(10)
+        self.assertEqual(bytes(received), data)
+        self.assertEqual(port.overflows, 0)
+
+    def test_midi_pair(self):
+        (port_ab, port_ba) = virtual_port_pair(64)
+        midi_a = adafruit_midi.MIDI(midi_in=port_ba, midi_out=port_ab, out_channel=2)
+        midi_b = adafruit_midi.MIDI(midi_in=port_ab, midi_out=port_ba)
+        midi_a.send(NoteOn(60, 100))
+        msg = midi_b.receive()
+        self.assertIsInstance(msg, NoteOn)
+        self.assertEqual(msg.channel, 2)
+        midi_b.send(SystemExclusive([0x7D], [1, 2, 3]))
+        msg = midi_a.receive()
+        self.assertIsInstance(msg, SystemExclusive)
+        self.assertEqual(msg.data, b"\x01\x02\x03")
+        self.assertIsNone(midi_a.receive())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)
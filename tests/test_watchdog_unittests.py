@@ -0,0 +1,138 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2020 Kevin J. Walters
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import unittest
+
+import os
+
+verbose = int(os.getenv("TESTVERBOSE", "2"))
+
+import sys
+
+# Borrowing the dhalbert/tannewt technique from adafruit/Adafruit_CircuitPython_Motor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import adafruit_midi
+from adafruit_midi.active_sensing import ActiveSensing
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.note_tracker import NoteTracker
+from adafruit_midi.watchdog import ActiveSensingWatchdog
+from midi_test_helpers import FakeClock, collecting_port, feeding_port
+
+MS = 1000000
+
+
+class Test_ActiveSensingWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(1000)
+        self.in_data = bytearray()
+        self.out_data = bytearray()
+        self.port_in = feeding_port(self.in_data)
+        self.port_out = collecting_port(self.out_data)
+
+    def make_midi(self, **kwargs):
+        watchdog = ActiveSensingWatchdog(clock=self.clock, **kwargs)
+        midi = adafruit_midi.MIDI(
+            midi_in=self.port_in, midi_out=self.port_out, watchdog=watchdog
+        )
+        return (midi, watchdog)
+
+    def test_not_armed_without_active_sensing(self):
+        (midi, watchdog) = self.make_midi(send_interval=None)
+        self.in_data.extend(bytes(NoteOn(60, channel=0)))
+        self.assertIsInstance(midi.receive(), NoteOn)
+        self.clock.now += 1000 * MS
+        midi.receive()
+        self.assertFalse(watchdog.armed)
+        self.assertEqual(watchdog.timeouts, 0)
+        self.assertEqual(self.out_data, b"")
+
+    def test_timeout_releases_notes(self):
+        tracker = NoteTracker()
+        calls = []
+        (midi, watchdog) = self.make_midi(
+            send_interval=None, note_tracker=tracker, on_timeout=calls.append
+        )
+        tracker.send(midi, NoteOn(60, 100), 2)
+        self.out_data.clear()
+
+        self.in_data.extend(bytes(ActiveSensing()))
+        self.assertIsInstance(midi.receive(), ActiveSensing)
+        self.assertTrue(watchdog.armed)
+        # Any data keeps the link alive
+        for _ in range(5):
+            self.clock.now += 250 * MS
+            self.in_data.extend(bytes(NoteOn(61, 1, channel=0)))
+            midi.receive()
+        self.assertEqual(watchdog.timeouts, 0)
+
+        self.clock.now += 300 * MS
+        self.assertIsNone(midi.receive())
+        self.assertEqual(watchdog.timeouts, 0)
+        self.clock.now += 1
+        self.assertIsNone(midi.receive())
+        self.assertEqual(watchdog.timeouts, 1)
+        self.assertEqual(calls, [midi])
+        self.assertEqual(self.out_data, b"\x82\x3c\x00")
+        self.assertEqual(tracker.count(), 0)
+        self.assertFalse(watchdog.armed)
+
+        # Disarmed until Active Sensing is received again
+        self.clock.now += 1000 * MS
+        midi.receive()
+        self.assertEqual(watchdog.timeouts, 1)
+
+    def test_timeout_input_only(self):
+        tracker = NoteTracker()
+        tracker.update(NoteOn(60, 100, channel=2))
+        watchdog = ActiveSensingWatchdog(clock=self.clock, note_tracker=tracker)
+        midi = adafruit_midi.MIDI(midi_in=self.port_in, watchdog=watchdog)
+        self.in_data.extend(bytes(ActiveSensing()))
+        self.assertIsInstance(midi.receive(), ActiveSensing)
+        self.clock.now += 301 * MS
+        self.assertIsNone(midi.receive())
+        self.assertEqual(watchdog.timeouts, 1)
+        # There is no output for the Note Offs
+        self.assertEqual(tracker.count(), 1)
+
+    def test_send(self):
+        (midi, watchdog) = self.make_midi(send_interval=0.25)
+        midi.receive()
+        self.assertEqual(self.out_data, b"\xfe")
+        self.clock.now += 249 * MS
+        midi.receive()
+        self.assertEqual(watchdog.sent, 1)
+        self.clock.now += 1 * MS
+        midi.receive()
+        self.assertEqual(self.out_data, b"\xfe\xfe")
+
+    def test_output_only(self):
+        watchdog = ActiveSensingWatchdog(clock=self.clock)
+        midi = adafruit_midi.MIDI(midi_out=self.port_out)
+        watchdog.poll(midi)
+        self.clock.now += 250 * MS
+        watchdog.poll(midi)
+        self.assertEqual(self.out_data, b"\xfe\xfe")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=verbose)